@@ -0,0 +1,210 @@
+"""Non-interactive batch and one-shot query mode for MCP Client for Ollama.
+
+This module runs prompts through the same query pipeline as the interactive
+chat, reusing one Ollama client and one set of MCP sessions for the whole
+batch, and reports each result as a JSON object. Several conversations can run
+at once; tool calls still respect the per-server limits of the ToolExecutor.
+"""
+import asyncio
+import json
+import math
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, TextIO
+
+from .utils.conversation import ConversationBuffer
+
+
+def load_prompts(path: str) -> List[Dict[str, Any]]:
+    """Load prompts from a JSON Lines file
+
+    Each non-empty line is either a JSON string or an object with a "prompt"
+    key and an optional "id". Prompts without an id are numbered by line.
+
+    Args:
+        path: Path to the JSONL file
+
+    Returns:
+        List of {"id", "prompt"} dictionaries
+
+    Raises:
+        ValueError: If a line is not valid JSON or has no prompt
+    """
+    prompts = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Line {line_number}: invalid JSON ({e.msg})") from e
+
+            if isinstance(entry, str):
+                entry = {"prompt": entry}
+            if not isinstance(entry, dict) or not isinstance(entry.get("prompt"), str):
+                raise ValueError(f"Line {line_number}: expected a string or an object with a \"prompt\" string")
+            prompts.append({"id": entry.get("id", line_number), "prompt": entry["prompt"]})
+    return prompts
+
+
+def read_checkpoint(path: str) -> Set[Any]:
+    """Read the ids of prompts that already succeeded from a results file
+
+    Args:
+        path: Path to a JSONL results file written by a previous run
+
+    Returns:
+        Set of prompt ids whose result has no error; empty if the file does not exist
+    """
+    completed = set()
+    if not os.path.exists(path):
+        return completed
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                # A line cut short by an interrupted run is simply run again
+                continue
+            if isinstance(result, dict) and result.get("error") is None and "id" in result:
+                completed.add(result["id"])
+    return completed
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Get a percentile of a list of values using the nearest-rank method
+
+    Args:
+        values: Values to rank
+        fraction: Percentile as a fraction between 0 and 1
+
+    Returns:
+        float: The value at that percentile, or 0.0 for an empty list
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def summarize_results(results: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+    """Compute throughput and latency percentiles of a batch run
+
+    Args:
+        results: Result dictionaries from BatchRunner
+        elapsed: Wall-clock duration of the run in seconds
+
+    Returns:
+        Dict with counts, throughput and latency percentiles
+    """
+    latencies = [result["metrics"]["duration"] for result in results]
+    eval_tokens = sum(result["metrics"]["eval_count"] for result in results)
+    return {
+        "prompts": len(results),
+        "succeeded": sum(1 for result in results if result["error"] is None),
+        "failed": sum(1 for result in results if result["error"] is not None),
+        "elapsed": elapsed,
+        "prompts_per_second": len(results) / elapsed if elapsed > 0 else 0.0,
+        "eval_tokens_per_second": eval_tokens / elapsed if elapsed > 0 else 0.0,
+        "latency": {
+            "p50": percentile(latencies, 0.50),
+            "p90": percentile(latencies, 0.90),
+            "p99": percentile(latencies, 0.99),
+            "max": max(latencies, default=0.0),
+        },
+    }
+
+
+class BatchRunner:
+    """Runs prompts through an already connected MCPClient with a pool of workers
+
+    Every prompt gets its own conversation, so results do not depend on the
+    order or interleaving of the prompts. Each worker takes the next prompt only
+    when it is free, so at most `concurrency` conversations are in flight, and
+    their tool calls queue on the per-server limits of the client's ToolExecutor.
+    Tool calls are answered by the client's HIL policy.
+    """
+
+    def __init__(self, client, output: TextIO, concurrency: int = 1,
+                 completed_ids: Optional[Set[Any]] = None):
+        """Initialize the BatchRunner.
+
+        Args:
+            client: Connected MCPClient used for all prompts
+            output: Stream the JSON results are written to
+            concurrency: Number of conversations run at the same time
+            completed_ids: Ids of prompts to skip because a previous run finished them
+        """
+        self.client = client
+        self.output = output
+        self.concurrency = max(1, concurrency)
+        self.completed_ids = completed_ids or set()
+        self.skipped = 0  # Prompts skipped because they were in the checkpoint
+
+    async def run_prompt(self, prompt_id: Any, prompt: str) -> Dict[str, Any]:
+        """Run a single prompt and collect its result and metrics
+
+        Args:
+            prompt_id: Identifier reported with the result
+            prompt: The prompt text
+
+        Returns:
+            Dict with id, prompt, response, error and metrics keys
+        """
+        rounds = []
+        error: Optional[str] = None
+        response = None
+        start = time.perf_counter()
+        try:
+            response = await self.client.process_query(prompt, conversation=ConversationBuffer(), rounds=rounds)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+
+        return {
+            "id": prompt_id,
+            "prompt": prompt,
+            "response": response,
+            "error": error,
+            "metrics": {
+                "duration": round(time.perf_counter() - start, 3),
+                "rounds": len(rounds),
+                "tool_calls": sum(round_stats.get("tool_calls", 0) for round_stats in rounds),
+                "prompt_eval_count": sum(round_stats.get("prompt_eval_count") or 0 for round_stats in rounds),
+                "eval_count": sum(round_stats.get("eval_count") or 0 for round_stats in rounds),
+            },
+        }
+
+    def write_result(self, result: Dict[str, Any]) -> None:
+        """Write a result as one line of JSON, flushed so it survives an interrupted run
+
+        Args:
+            result: Result dictionary from run_prompt
+        """
+        self.output.write(json.dumps(result, ensure_ascii=False) + "\n")
+        self.output.flush()
+
+    async def run(self, prompts: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run all prompts, writing each result as soon as it is ready
+
+        Args:
+            prompts: {"id", "prompt"} dictionaries
+
+        Returns:
+            List of result dictionaries, in completion order
+        """
+        results = []
+        pending = iter(prompts)
+
+        async def worker():
+            # Workers share one iterator, so a prompt starts only when a worker is free
+            for entry in pending:
+                if entry["id"] in self.completed_ids:
+                    self.skipped += 1
+                    continue
+                result = await self.run_prompt(entry["id"], entry["prompt"])
+                self.write_result(result)
+                results.append(result)
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        return results
@@ -1,7 +1,10 @@
 #!/usr/bin/env python
 """Command-line interface for the MCP Client for Ollama."""
 
-from .client import app
+from .utils.startup_profile import startup_profiler
+
+with startup_profiler.phase("Import"):
+    from .client import app
 
 def run_cli():
     """Run the MCP Client for Ollama command-line interface."""
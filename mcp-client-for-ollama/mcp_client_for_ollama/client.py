@@ -1,67 +1,106 @@
 """MCP Client for Ollama - A TUI client for interacting with Ollama models and MCP servers"""
 import asyncio
+import json
 import os
-from contextlib import AsyncExitStack
+import sys
+import time
+from contextlib import AsyncExitStack, nullcontext
 from typing import List, Optional
 
 import typer
-from prompt_toolkit import PromptSession
-from prompt_toolkit.styles import Style
 from rich.console import Console
-from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.text import Text
-import ollama
 
 from . import __version__
+from .batch import BatchRunner, load_prompts, read_checkpoint, summarize_results
 from .config.manager import ConfigManager
-from .utils.version import check_for_updates
-from .utils.constants import DEFAULT_CLAUDE_CONFIG, DEFAULT_MODEL, DEFAULT_OLLAMA_HOST, DEFAULT_COMPLETION_STYLE
+from .utils.version import check_for_updates, is_update_check_due, refresh_update_cache
+from .utils.constants import (
+    DEFAULT_CLAUDE_CONFIG, DEFAULT_MODEL, DEFAULT_OLLAMA_HOST, DEFAULT_COMPLETION_STYLE,
+    DEFAULT_CONNECT_CONCURRENCY, DEFAULT_CONNECT_TIMEOUT, DEFAULT_MAX_TOOL_ROUNDS, DEFAULT_QUERY_TIME_BUDGET,
+    DEFAULT_CONTEXT_BUDGET_RATIO, STABLE_PREFIX_TRIM_RATIO, HIL_POLICIES, DEFAULT_BATCH_CONCURRENCY,
+    SERVER_COMMANDS, DEFAULT_SERVER_IDLE_TIMEOUT, DEFAULT_TOOL_ROUTER_TOP_K, TOOL_ROUTER_FALLBACK_TOOL,
+    DEFAULT_DESCRIPTION_TOKENS, DEFAULT_TOOL_CALL_TIMEOUT
+)
+from .server.catalog import ToolCatalogCache
 from .server.connector import ServerConnector
 from .models.manager import ModelManager
-from .models.config_manager import ModelConfigManager
 from .tools.manager import ToolManager
+from .tools.executor import ToolExecutor
+from .tools.router import ToolRouter
 from .utils.streaming import StreamingManager
+from .utils.conversation import ConversationBuffer
+from .utils.context_window import ContextWindowManager
+from .utils.prompt_prefix import PromptPrefixTracker
+from .utils.metrics import display_round_metrics
 from .utils.tool_display import ToolDisplayManager
 from .utils.hil_manager import HumanInTheLoopManager
-from .utils.fzf_style_completion import FZFStyleCompleter
+from .utils.interrupt import interrupt_handler
+from .utils.startup_profile import startup_profiler
 
 
 class MCPClient:
     """Main client class for interacting with Ollama and MCP servers"""
 
-    def __init__(self, model: str = DEFAULT_MODEL, host: str = DEFAULT_OLLAMA_HOST):
+    def __init__(self, model: str = DEFAULT_MODEL, host: str = DEFAULT_OLLAMA_HOST,
+                 connect_concurrency: int = DEFAULT_CONNECT_CONCURRENCY,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT, plain_output: bool = False,
+                 console: Optional[Console] = None, lazy_servers: bool = False,
+                 server_idle_timeout: float = DEFAULT_SERVER_IDLE_TIMEOUT,
+                 description_tokens: int = DEFAULT_DESCRIPTION_TOKENS):
+        # Heavy dependencies are imported here rather than at module level so
+        # that `--help` and `--version` start quickly
+        import ollama
+
         # Initialize session and client objects
         self.exit_stack = AsyncExitStack()
         self.ollama = ollama.AsyncClient(host=host)
-        self.console = Console()
+        self.console = console or Console()
         self.config_manager = ConfigManager(self.console)
         # Initialize the server connector
-        self.server_connector = ServerConnector(self.exit_stack, self.console)
+        self.server_connector = ServerConnector(
+            self.exit_stack, self.console,
+            max_concurrency=connect_concurrency,
+            connect_timeout=connect_timeout,
+            tool_catalog=ToolCatalogCache(),
+            lazy_servers=lazy_servers,
+            idle_timeout=server_idle_timeout,
+            description_tokens=description_tokens
+        )
         # Initialize the model manager
         self.model_manager = ModelManager(console=self.console, default_model=model, ollama=self.ollama)
-        # Initialize the model config manager
-        self.model_config_manager = ModelConfigManager(console=self.console)
+        # The model config manager is created on first use
+        self._model_config_manager = None
         # Initialize the tool manager with server connector reference
         self.tool_manager = ToolManager(console=self.console, server_connector=self.server_connector)
+        # Initialize the tool executor used to run tool calls in parallel
+        self.tool_executor = ToolExecutor(server_connector=self.server_connector)
+        # Initialize the tool router that picks the tools relevant to each query
+        self.tool_router = ToolRouter()
+        self.tool_routing = False  # Offer only the tools relevant to the query instead of all enabled tools
         # Initialize the streaming manager
-        self.streaming_manager = StreamingManager(console=self.console)
+        self.plain_output = plain_output  # Raw text output without Rich live rendering or panels
+        self.streaming_manager = StreamingManager(console=self.console, plain=plain_output)
         # Initialize the tool display manager
-        self.tool_display_manager = ToolDisplayManager(console=self.console)
+        self.tool_display_manager = ToolDisplayManager(console=self.console, plain=plain_output)
         # Initialize the HIL manager
         self.hil_manager = HumanInTheLoopManager(console=self.console)
         # Store server and tool data
         self.sessions = {}  # Dict to store multiple sessions
         # UI components
-        self.chat_history = []  # Add chat history list to store interactions
-        # Command completer for interactive prompts
-        self.prompt_session = PromptSession(
-            completer=FZFStyleCompleter(),
-            style=Style.from_dict(DEFAULT_COMPLETION_STYLE)
-        )
+        self.conversation = ConversationBuffer()  # Messages of all turns, appended to as the chat goes on
+        # Initialize the context window manager that keeps the prompt within budget
+        self.context_window = ContextWindowManager(ollama=self.ollama, console=self.console)
+        # Track prompt prefix changes that invalidate Ollama's KV cache
+        self.prefix_tracker = PromptPrefixTracker()
+        # Prompt session for interactive input, created on first use (never in batch mode)
+        self._prompt_session = None
         # Context retention settings
         self.retain_context = True  # By default, retain conversation context
         self.actual_token_count = 0  # Actual token count from Ollama metrics
+        self.tools_payload_size = 0  # Size in characters of the tool definitions sent with the last query
+        self.stable_prefix = True  # Keep tools and schemas in a canonical order so the prompt prefix stays cacheable
         # Thinking mode settings
         self.thinking_mode = True  # By default, thinking mode is enabled for models that support it
         self.show_thinking = False   # By default, thinking text is hidden after completion
@@ -69,6 +108,12 @@ class MCPClient:
         self.show_tool_execution = True  # By default, show tool execution displays
         # Metrics display settings
         self.show_metrics = False  # By default, don't show metrics after each query
+        self.stream_responses = True  # Stream model output to the console (off in batch mode)
+        self.update_check_task = None  # Background refresh of the cached update check
+        # Agent loop settings
+        self.max_tool_rounds = DEFAULT_MAX_TOOL_ROUNDS  # Maximum rounds of tool calls per query
+        self.query_time_budget = DEFAULT_QUERY_TIME_BUDGET  # Seconds after which tools are no longer offered
+        self.last_query_rounds = []  # Per-round latency and token counts of the last query
         self.default_configuration_status = False  # Track if default configuration was loaded successfully
 
         # Store server connection parameters for reloading
@@ -78,6 +123,27 @@ class MCPClient:
             'auto_discovery': False
         }
 
+    @property
+    def model_config_manager(self):
+        """Model config manager, imported and created on first use"""
+        if self._model_config_manager is None:
+            from .models.config_manager import ModelConfigManager
+            self._model_config_manager = ModelConfigManager(console=self.console)
+        return self._model_config_manager
+
+    @property
+    def prompt_session(self):
+        """Prompt session with the command completer, imported and created on first use"""
+        if self._prompt_session is None:
+            from prompt_toolkit import PromptSession
+            from prompt_toolkit.styles import Style
+            from .utils.fzf_style_completion import FZFStyleCompleter
+            self._prompt_session = PromptSession(
+                completer=FZFStyleCompleter(),
+                style=Style.from_dict(DEFAULT_COMPLETION_STYLE)
+            )
+        return self._prompt_session
+
     def display_current_model(self):
         """Display the currently selected model"""
         self.model_manager.display_current_model()
@@ -85,22 +151,14 @@ class MCPClient:
     async def supports_thinking_mode(self) -> bool:
         """Check if the current model supports thinking mode by checking its capabilities
 
+        Capabilities are cached per model and digest by the model manager, so
+        this only reaches Ollama the first time a model version is checked.
+
         Returns:
             bool: True if the current model supports thinking mode, False otherwise
         """
-        try:
-            current_model = self.model_manager.get_current_model()
-            # Query the model's capabilities using ollama.show()
-            model_info = await self.ollama.show(current_model)
-
-            # Check if the model has 'thinking' capability
-            if 'capabilities' in model_info and model_info['capabilities']:
-                return 'thinking' in model_info['capabilities']
-
-            return False
-        except Exception:
-            # If we can't determine capabilities, assume no thinking support
-            return False
+        # If we can't determine capabilities, the model manager reports no thinking support
+        return await self.model_manager.supports_capability('thinking')
 
     async def select_model(self):
         """Let the user select an Ollama model from the available ones"""
@@ -170,9 +228,16 @@ class MCPClient:
         self.display_current_model()
         self._display_chat_history()
 
+    @property
+    def chat_history(self) -> list:
+        """Completed turns of the conversation as {"query", "response"} entries"""
+        return self.conversation.history
+
     def _display_chat_history(self):
         """Display chat history when returning to the main chat interface"""
         if self.chat_history:
+            from rich.markdown import Markdown
+
             self.console.print(Panel("[bold]Chat History[/bold]", border_style="blue", expand=False))
 
             # Display the last few conversations (limit to keep the interface clean)
@@ -191,175 +256,361 @@ class MCPClient:
             if len(self.chat_history) > max_history:
                 self.console.print(f"[dim](Showing last {max_history} of {len(self.chat_history)} conversations)[/dim]")
 
-    async def process_query(self, query: str) -> str:
-        """Process a query using Ollama and available tools"""
-        # Create base message with current query
-        current_message = {
-            "role": "user",
-            "content": query
-        }
+    async def process_query(self, query: str, conversation: Optional[ConversationBuffer] = None,
+                            rounds: Optional[list] = None) -> str:
+        """Process a query using Ollama and available tools
 
-        # Build messages array based on context retention setting
-        if self.retain_context and self.chat_history:
-            # Include previous messages for context
-            messages = []
-            for entry in self.chat_history:
-                # Add user message
-                messages.append({
-                    "role": "user",
-                    "content": entry["query"]
-                })
-                # Add assistant response
-                messages.append({
-                    "role": "assistant",
-                    "content": entry["response"]
-                })
-            # Add the current query
-            messages.append(current_message)
-        else:
-            # No context retention - just use current query
-            messages = [current_message]
-
-        # Add system prompt if one is configured
-        system_prompt = self.model_config_manager.get_system_prompt()
-        if system_prompt:
-            messages.insert(0, {
-                "role": "system",
-                "content": system_prompt
-            })
+        The query, any tool calls and tool results, and the final answer are
+        appended to the conversation buffer. If the query fails, the partial
+        turn is discarded so the buffer only holds completed turns.
 
-        # Get enabled tools from the tool manager
-        enabled_tool_objects = self.tool_manager.get_enabled_tool_objects()
+        Args:
+            query: The user's query
+            conversation: Conversation to add the turn to (defaults to the interactive conversation)
+            rounds: List that receives the per-round statistics (defaults to last_query_rounds)
 
-        if not enabled_tool_objects:
-            self.console.print("[yellow]Warning: No tools are enabled. Model will respond without tool access.[/yellow]")
+        Returns:
+            str: The final response text of the model
+        """
+        if conversation is None:
+            conversation = self.conversation
+        if rounds is None:
+            rounds = self.last_query_rounds = []
 
-        available_tools = [{
-            "type": "function",
-            "function": {
-                "name": tool.name,
-                "description": tool.description,
-                "parameters": tool.inputSchema
-            }
-        } for tool in enabled_tool_objects]
+        # Keep the system prompt at the start of the conversation in sync
+        conversation.set_system_prompt(self.model_config_manager.get_system_prompt())
+        conversation.begin_turn(query)
 
-        # Get current model from the model manager
-        model = self.model_manager.get_current_model()
+        try:
+            response_text = await self._run_agent_loop(query, conversation, rounds)
+        except BaseException:
+            conversation.rollback_turn()
+            raise
 
-        # Get model options in Ollama format
-        model_options = self.model_config_manager.get_ollama_options()
+        if not response_text:
+            self.console.print("[red]No content response received.[/red]")
+            response_text = ""
 
-        # Prepare chat parameters
-        chat_params = {
-            "model": model,
-            "messages": messages,
-            "stream": True,
-            "tools": available_tools,
-            "options": model_options
-        }
+        # Record the final answer, completing the turn
+        conversation.end_turn(response_text)
 
-        # Add thinking parameter if thinking mode is enabled and model supports it
-        if await self.supports_thinking_mode():
-            chat_params["think"] = self.thinking_mode
+        return response_text
 
-        # Initial Ollama API call with the query and available tools
-        stream = await self.ollama.chat(**chat_params)
+    def _build_fallback_tool(self, hidden_count: int):
+        """Build the tool the model calls to be offered all enabled tools
 
-        # Process the streaming response with thinking mode support
-        response_text = ""
-        tool_calls = []
-        response_text, tool_calls, metrics = await self.streaming_manager.process_streaming_response(
-            stream,
-            thinking_mode=self.thinking_mode,
-            show_thinking=self.show_thinking,
-            show_metrics=self.show_metrics
-        )
+        Args:
+            hidden_count: Number of enabled tools left out by routing
 
-        # Update actual token count from metrics if available
-        if metrics and metrics.get('eval_count'):
-            self.actual_token_count += metrics['eval_count']
-        # Check if there are any tool calls in the response
-        if len(tool_calls) > 0 and self.tool_manager.get_enabled_tool_objects():
-            for tool in tool_calls:
-                tool_name = tool.function.name
-                tool_args = tool.function.arguments
+        Returns:
+            ollama.Tool: Definition of the fallback tool
+        """
+        import ollama
 
-                # Parse server name and actual tool name from the qualified name
-                server_name, actual_tool_name = tool_name.split('.', 1) if '.' in tool_name else (None, tool_name)
+        return ollama.Tool.model_validate({
+            "type": "function",
+            "function": {
+                "name": TOOL_ROUTER_FALLBACK_TOOL,
+                "description": (
+                    f"Only the tools most relevant to the request are offered; {hidden_count} more are available. "
+                    "Call this if none of the offered tools can do what is needed, then choose from the full list."
+                ),
+                "parameters": {"type": "object", "properties": {}}
+            }
+        })
 
-                if not server_name or server_name not in self.sessions:
-                    self.console.print(f"[red]Error: Unknown server for tool {tool_name}[/red]")
-                    continue
+    async def _run_agent_loop(self, query: str, conversation: ConversationBuffer, rounds: list) -> str:
+        """Run the model and tool rounds of the current turn
 
-                # Execute tool call
-                self.tool_display_manager.display_tool_execution(tool_name, tool_args, show=self.show_tool_execution)
+        Args:
+            query: The user's query, used to pick the tools offered when routing is enabled
+            conversation: Conversation holding the turn in progress
+            rounds: List that receives the statistics of each round
 
-                # Request HIL confirmation if enabled
-                should_execute = await self.hil_manager.request_tool_confirmation(
-                    tool_name, tool_args
+        Returns:
+            str: The final response text of the model
+        """
+        # Get enabled tools from the tool manager
+        enabled_tool_objects = self.tool_manager.get_enabled_tool_objects()
+
+        if not enabled_tool_objects:
+            self.console.print("[yellow]Warning: No tools are enabled. Model will respond without tool access.[/yellow]")
+
+        # With tool routing, only the tools relevant to the query are offered,
+        # plus a fallback tool the model calls to be offered all of them
+        offered_tool_objects = enabled_tool_objects
+        if self.tool_routing and enabled_tool_objects:
+            offered_tool_objects = self.tool_router.select(
+                query, enabled_tool_objects, version=self.tool_manager.version
+            )
+        routed = len(offered_tool_objects) < len(enabled_tool_objects)
+
+        # The tool payload is compiled once per change of the enabled tools; in
+        # prefix-stability mode tools are sorted by name with sorted schema keys
+        # so the serialized tool block is byte-identical between requests
+        available_tools, tools_json = self.tool_manager.get_tool_payload(
+            canonical=self.stable_prefix, tools=offered_tool_objects if routed else None
+        )
+        if routed:
+            available_tools = available_tools + [
+                self._build_fallback_tool(len(enabled_tool_objects) - len(offered_tool_objects))
+            ]
+            tools_json = json.dumps([tool.model_dump(exclude_none=True) for tool in available_tools], default=str)
+            if self.show_tool_execution:
+                self.console.print(
+                    f"[dim]Offering {len(offered_tool_objects)} of {len(enabled_tool_objects)} tools relevant to the query[/dim]"
                 )
+        # Batch queries run concurrently with their own conversations, so the
+        # size is kept locally and only published for the interactive one,
+        # whose context usage is displayed
+        tools_payload_size = len(tools_json)
+        if conversation is self.conversation:
+            self.tools_payload_size = tools_payload_size
 
-                if not should_execute:
-                    tool_response = "Tool call was skipped by user"
-                    self.tool_display_manager.display_tool_response(tool_name, tool_args, tool_response, show=self.show_tool_execution)
-                    messages.append({
-                        "role": "tool",
-                        "content": tool_response,
-                        "name": tool_name
-                    })
-                    continue
+        # Get current model from the model manager
+        model = self.model_manager.get_current_model()
 
-                # Call the tool on the specified server
-                result = None
-                with self.console.status(f"[cyan]⏳ Running {tool_name}...[/cyan]"):
-                    result = await self.sessions[server_name]["session"].call_tool(actual_tool_name, tool_args)
+        # Get model options in Ollama format
+        model_options = self.model_config_manager.get_ollama_options()
 
-                tool_response = f"{result.content[0].text}"
+        # Check thinking support once, it does not change between rounds
+        supports_thinking = await self.supports_thinking_mode()
 
-                # Display the tool response
-                self.tool_display_manager.display_tool_response(tool_name, tool_args, tool_response, show=self.show_tool_execution)
+        # Token budget for the prompt, derived from the context size
+        budget = await self.get_context_budget()
 
-                messages.append({
-                    "role": "tool",
-                    "content": tool_response,
-                    "name": tool_name
-                })
+        # Agent loop: keep offering tools until the model answers without tool
+        # calls, the round limit is reached or the time budget is spent
+        deadline = time.monotonic() + self.query_time_budget
+        tool_rounds = 0
+        response_text = ""
+
+        while True:
+            tools_allowed = (
+                bool(available_tools)
+                and tool_rounds < self.max_tool_rounds
+                and time.monotonic() < deadline
+            )
 
-            # Get stream response from Ollama with the tool results
-            chat_params_followup = {
+            # Prepare chat parameters; when retaining context this is the
+            # buffer itself, so no per-turn copy of the history is made
+            chat_params = {
                 "model": model,
-                "messages": messages,
+                "messages": conversation.get_request_messages(self.retain_context),
                 "stream": True,
                 "options": model_options
             }
+            if tools_allowed:
+                chat_params["tools"] = available_tools
+
+            # Trim the oldest turns if the conversation outgrew the budget
+            if self.retain_context:
+                trimmed = await self.context_window.fit(
+                    conversation, tools_payload_size if tools_allowed else 0, budget, model=model,
+                    target=int(budget * STABLE_PREFIX_TRIM_RATIO) if self.stable_prefix else None
+                )
+                if trimmed:
+                    action = "Summarized" if conversation.summary else "Dropped"
+                    self.console.print(f"[dim]{action} {trimmed} earlier turn(s) to stay within the context budget[/dim]")
+            prompt_size = conversation.get_request_size(self.retain_context)
+            if tools_allowed:
+                prompt_size += tools_payload_size
+
+            # Report requests of the interactive conversation that cannot reuse
+            # the prompt prefix cached by Ollama
+            prefix_change = None
+            if conversation is self.conversation:
+                prefix_change = self.prefix_tracker.observe(
+                    model, model_options, tools_json if tools_allowed else "", chat_params["messages"]
+                )
+            if prefix_change and self.show_metrics:
+                self.console.print(
+                    f"[yellow]⚠ Prompt prefix changed ({prefix_change['reason']}); "
+                    f"Ollama re-evaluates the prompt after message {prefix_change['reused_messages']}[/yellow]"
+                )
 
             # Add thinking parameter if thinking mode is enabled and model supports it
-            if await self.supports_thinking_mode():
-                chat_params_followup["think"] = self.thinking_mode
+            if supports_thinking:
+                chat_params["think"] = self.thinking_mode
 
-            stream = await self.ollama.chat(**chat_params_followup)
+            round_start = time.perf_counter()
+            stream = await self.ollama.chat(**chat_params)
 
             # Process the streaming response with thinking mode support
-            response_text, _, followup_metrics = await self.streaming_manager.process_streaming_response(
+            response_text, tool_calls, metrics = await self.streaming_manager.process_streaming_response(
                 stream,
+                print_response=self.stream_responses,
                 thinking_mode=self.thinking_mode,
                 show_thinking=self.show_thinking,
                 show_metrics=self.show_metrics
             )
 
-            # Update actual token count from followup metrics if available
-            if followup_metrics and followup_metrics.get('eval_count'):
-                self.actual_token_count += followup_metrics['eval_count']
+            # Update actual token count from metrics if available
+            if metrics and metrics.get('eval_count'):
+                self.actual_token_count += metrics['eval_count']
 
-        if not response_text:
-            self.console.print("[red]No content response received.[/red]")
-            response_text = ""
+            # Calibrate token estimates against what Ollama actually evaluated
+            self.context_window.calibrate(prompt_size, (metrics or {}).get('prompt_eval_count'))
+
+            round_stats = {
+                "round": len(rounds) + 1,
+                "tool_calls": len(tool_calls) if tools_allowed else 0,
+                "prompt_eval_count": (metrics or {}).get('prompt_eval_count'),
+                "eval_count": (metrics or {}).get('eval_count'),
+            }
+            rounds.append(round_stats)
+
+            if not tool_calls or not tools_allowed:
+                round_stats["duration"] = time.perf_counter() - round_start
+                break
+
+            # Keep the assistant's tool calls in the conversation so the
+            # model can relate the tool results of this round to them
+            conversation.append({
+                "role": "assistant",
+                "content": response_text,
+                "tool_calls": [
+                    {"function": {"name": tool.function.name, "arguments": tool.function.arguments}}
+                    for tool in tool_calls
+                ]
+            })
+
+            # The model asked for the full tool set: answer the fallback call and
+            # offer all enabled tools from the next round on
+            fallback_calls = [tool for tool in tool_calls if tool.function.name == TOOL_ROUTER_FALLBACK_TOOL]
+            if routed and fallback_calls:
+                tool_calls = [tool for tool in tool_calls if tool.function.name != TOOL_ROUTER_FALLBACK_TOOL]
+                available_tools, tools_json = self.tool_manager.get_tool_payload(canonical=self.stable_prefix)
+                tools_payload_size = len(tools_json)
+                if conversation is self.conversation:
+                    self.tools_payload_size = tools_payload_size
+                routed = False
+                if self.show_tool_execution:
+                    self.console.print(f"[dim]Model requested all {len(enabled_tool_objects)} enabled tools[/dim]")
+                conversation.extend([{
+                    "role": "tool",
+                    "content": f"All {len(enabled_tool_objects)} enabled tools are now available.",
+                    "name": TOOL_ROUTER_FALLBACK_TOOL
+                } for _ in fallback_calls])
+
+            conversation.extend(await self._execute_tool_calls(tool_calls, deadline))
+            round_stats["duration"] = time.perf_counter() - round_start
+            tool_rounds += 1
 
-        # Append query and response to chat history
-        self.chat_history.append({"query": query, "response": response_text})
+        if self.show_metrics and len(rounds) > 1:
+            display_round_metrics(self.console, rounds, plain=self.plain_output)
 
         return response_text
 
+    async def get_context_budget(self) -> int:
+        """Get the token budget for prompts to the current model
+
+        Returns:
+            int: Maximum number of prompt tokens before old turns are trimmed
+        """
+        context_length = await self.model_manager.get_context_length()
+        return self.context_window.get_budget(self.model_config_manager.num_ctx, context_length)
+
+    async def _execute_tool_calls(self, tool_calls: list, deadline: Optional[float] = None) -> list:
+        """Execute the tool calls of a model turn
+
+        Calls to unknown tools or with arguments that do not match the tool's
+        schema are answered with an error without reaching a server. All HIL
+        confirmations are requested up front, then the approved calls are
+        dispatched together so calls to different servers run in parallel.
+        While they run, Ctrl-C cancels them instead of exiting; cancelled and
+        timed out calls are answered with an error the model can act on.
+
+        Args:
+            tool_calls: Tool calls returned by the model
+            deadline: time.monotonic() value by which the query's tool calls must finish
+
+        Returns:
+            list: Tool result messages, in the order the model issued the calls
+        """
+        tool_messages = []
+        planned_calls = []
+        for tool in tool_calls:
+            tool_name = tool.function.name
+            tool_args = tool.function.arguments
+
+            # Look up the server and actual tool name of the qualified name
+            route = self.server_connector.get_tool_route(tool_name)
+            if route is None:
+                self.console.print(f"[red]Error: Unknown server for tool {tool_name}[/red]")
+                error = f"Error: Unknown tool {tool_name}"
+            else:
+                error = self.server_connector.validate_tool_arguments(tool_name, tool_args)
+                if error is not None:
+                    self.console.print(f"[red]Error: Invalid arguments for {tool_name}: {error}[/red]")
+                    error = f"Error: Invalid arguments: {error}"
+
+            if error is None:
+                self.tool_display_manager.display_tool_execution(tool_name, tool_args, show=self.show_tool_execution)
+
+                # Request HIL confirmation if enabled
+                should_execute = await self.hil_manager.request_tool_confirmation(
+                    tool_name, tool_args
+                )
+            else:
+                should_execute = False
+
+            planned_calls.append({
+                "tool_name": tool_name,
+                "tool_args": tool_args,
+                "server_name": route["server_name"] if route else None,
+                "actual_tool_name": route["tool_name"] if route else tool_name,
+                "should_execute": should_execute,
+                "error": error
+            })
+
+        # Call all approved tools on their servers at once
+        approved_calls = [call for call in planned_calls if call["should_execute"]]
+        results = []
+        if approved_calls:
+            running = approved_calls[0]["tool_name"] if len(approved_calls) == 1 else f"{len(approved_calls)} tools"
+            # Rich allows one live display at a time, so there is no spinner when
+            # output is plain or queries run concurrently in batch mode
+            show_status = self.stream_responses and not self.plain_output
+            status = (self.console.status(f"[cyan]⏳ Running {running}... (Ctrl-C to cancel)[/cyan]")
+                      if show_status else nullcontext())
+            # In batch mode Ctrl-C stops the whole run, as before
+            interrupt = interrupt_handler(self._cancel_tool_calls) if self.stream_responses else nullcontext()
+            with status, interrupt:
+                results = await self.tool_executor.execute([
+                    (call["server_name"], call["actual_tool_name"], call["tool_args"])
+                    for call in approved_calls
+                ], deadline)
+
+        result_iter = iter(results)
+        for call in planned_calls:
+            if call["should_execute"]:
+                result = next(result_iter)
+                tool_response = f"{result.content[0].text}"
+            elif call["error"] is not None:
+                tool_response = call["error"]
+            else:
+                tool_response = "Tool call was skipped by user"
+
+            # Display the tool response
+            self.tool_display_manager.display_tool_response(
+                call["tool_name"], call["tool_args"], tool_response, show=self.show_tool_execution
+            )
+
+            tool_messages.append({
+                "role": "tool",
+                "content": tool_response,
+                "name": call["tool_name"]
+            })
+
+        return tool_messages
+
+    def _cancel_tool_calls(self) -> None:
+        """Cancel the running tool calls when the user presses Ctrl-C"""
+        cancelled = self.tool_executor.cancel_calls()
+        if cancelled:
+            self.console.print(f"[yellow]Cancelling {cancelled} tool call{'s' if cancelled != 1 else ''}...[/yellow]")
+
     async def get_user_input(self, prompt_text: str = None) -> str:
         """Get user input with full keyboard navigation support"""
         try:
@@ -388,8 +639,11 @@ class MCPClient:
             return "quit"
 
     async def display_check_for_updates(self):
-        # Check for updates
+        # Check for updates using the cached result, and refresh an expired cache in
+        # the background so startup never waits on the network
         try:
+            if is_update_check_due():
+                self.update_check_task = asyncio.create_task(refresh_update_cache())
             update_available, current_version, latest_version = check_for_updates()
             if update_available:
                 self.console.print(Panel(
@@ -403,15 +657,24 @@ class MCPClient:
             # Silently fail - version check should not block program usage
             pass
 
-    async def chat_loop(self):
-        """Run an interactive chat loop"""
-        self.clear_console()
-        self.console.print(Panel(Text.from_markup("[bold green]Welcome to the MCP Client for Ollama 🦙[/bold green]", justify="center"), expand=True, border_style="green"))
-        self.display_available_tools()
-        self.display_current_model()
-        self.print_help()
-        self.print_auto_load_default_config_status()
-        await self.display_check_for_updates()
+    async def chat_loop(self, show_startup_profile: bool = False):
+        """Run an interactive chat loop
+
+        Args:
+            show_startup_profile: Whether to print the startup timing report before the first prompt
+        """
+        import ollama
+
+        with startup_profiler.phase("Welcome screen"):
+            self.clear_console()
+            self.console.print(Panel(Text.from_markup("[bold green]Welcome to the MCP Client for Ollama 🦙[/bold green]", justify="center"), expand=True, border_style="green"))
+            self.display_available_tools()
+            self.display_current_model()
+            self.print_help()
+            self.print_auto_load_default_config_status()
+            await self.display_check_for_updates()
+        if show_startup_profile:
+            startup_profiler.display(self.console)
 
         while True:
             try:
@@ -502,10 +765,23 @@ class MCPClient:
                     await self.reload_servers()
                     continue
 
+                if query.lower() in ['servers', 'sv']:
+                    self.display_server_status()
+                    continue
+
+                command, _, server_name = query.strip().partition(" ")
+                if command.lower() in SERVER_COMMANDS:
+                    await self.manage_server(SERVER_COMMANDS[command.lower()], server_name.strip() or None)
+                    continue
+
                 if query.lower() in ['human-in-the-loop', 'hil']:
                     self.hil_manager.toggle()
                     continue
 
+                if query.lower() in ['tool-routing', 'tr']:
+                    self.toggle_tool_routing()
+                    continue
+
                 # Check if query is too short and not a special command
                 if len(query.strip()) < 5:
                     self.console.print("[yellow]Query must be at least 5 characters long.[/yellow]")
@@ -561,7 +837,12 @@ class MCPClient:
             "• Type [bold]tools[/bold] or [bold]t[/bold] to configure tools\n"
             "• Type [bold]show-tool-execution[/bold] or [bold]ste[/bold] to toggle tool execution display\n"
             "• Type [bold]human-in-the-loop[/bold] or [bold]hil[/bold] to toggle Human-in-the-Loop confirmations\n"
-            "• Type [bold]reload-servers[/bold] or [bold]rs[/bold] to reload MCP servers\n\n"
+            "• Type [bold]tool-routing[/bold] or [bold]tr[/bold] to toggle offering only the tools relevant to each query\n"
+            "• Type [bold]reload-servers[/bold] or [bold]rs[/bold] to reload MCP servers\n"
+            "• Type [bold]servers[/bold] or [bold]sv[/bold] to show the status of each server\n"
+            "• Type [bold]connect-server[/bold] or [bold]cns[/bold] [dim]<name>[/dim] to connect a disconnected server\n"
+            "• Type [bold]disconnect-server[/bold] or [bold]dcs[/bold] [dim]<name>[/dim] to disconnect a server\n"
+            "• Type [bold]restart-server[/bold] or [bold]rss[/bold] [dim]<name>[/dim] to restart a single server\n\n"
 
             "[bold cyan]Context:[/bold cyan]\n"
             "• Type [bold]context[/bold] or [bold]c[/bold] to toggle context retention\n"
@@ -583,6 +864,7 @@ class MCPClient:
     def toggle_context_retention(self):
         """Toggle whether to retain previous conversation context when sending queries"""
         self.retain_context = not self.retain_context
+        self.prefix_tracker.reset()
         status = "enabled" if self.retain_context else "disabled"
         self.console.print(f"[green]Context retention {status}![/green]")
         # Display current context stats
@@ -663,17 +945,56 @@ class MCPClient:
         else:
             self.console.print("[cyan]🔇 Performance metrics will be hidden for a cleaner output.[/cyan]")
 
+    def toggle_tool_routing(self):
+        """Toggle whether only the tools relevant to each query are offered to the model"""
+        self.tool_routing = not self.tool_routing
+        status = "enabled" if self.tool_routing else "disabled"
+        self.console.print(f"[green]Tool routing {status}![/green]")
+
+        if self.tool_routing:
+            self.console.print(
+                f"[cyan]🧭 Up to {self.tool_router.top_k} tools matching each query will be offered, "
+                "the model can still ask for all of them.[/cyan]"
+            )
+        else:
+            self.console.print("[cyan]🧰 All enabled tools will be offered with every query.[/cyan]")
+
     def clear_context(self):
         """Clear conversation history and token count"""
-        original_history_length = len(self.chat_history)
-        self.chat_history = []
+        original_history_length = self.conversation.clear()
         self.actual_token_count = 0
+        self.context_window.trimmed_turns = 0
+        self.prefix_tracker.reset()
         self.console.print(f"[green]Context cleared! Removed {original_history_length} conversation entries.[/green]")
 
     def display_context_stats(self):
         """Display information about the current context window usage"""
         history_count = len(self.chat_history)
 
+        # Budget usage is estimated from message sizes, calibrated by Ollama's prompt token counts
+        cached_model = self.model_manager.capabilities.get_cached(self.model_manager.get_current_model())
+        budget = self.context_window.get_budget(
+            self.model_config_manager.num_ctx, cached_model["context_length"] if cached_model else None
+        )
+        usage = self.context_window.get_usage(self.conversation, self.tools_payload_size, budget)
+        usage_color = "green" if usage["ratio"] < 0.75 else "yellow" if usage["ratio"] <= 1 else "red"
+        budget_status = (
+            f"Context budget: [{usage_color}]~{usage['estimated_tokens']:,} / {usage['budget']:,} tokens "
+            f"({usage['ratio']:.0%})[/{usage_color}]\n"
+        )
+        if self.context_window.last_prompt_tokens:
+            budget_status += f"Last prompt size (Ollama): {self.context_window.last_prompt_tokens:,} tokens\n"
+        budget_status += f"Trimmed turns: {self.context_window.trimmed_turns} ({self.context_window.strategy})\n"
+        budget_status += (
+            f"Prefix stability: [{'green' if self.stable_prefix else 'red'}]{'Enabled' if self.stable_prefix else 'Disabled'}"
+            f"[/{'green' if self.stable_prefix else 'red'}] ({self.prefix_tracker.cache_busts} cache-busting changes)\n"
+        )
+        cache_stats = self.tool_executor.result_cache.get_stats()
+        budget_status += (
+            f"Tool result cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+            f"({cache_stats['hit_rate']:.0%} hit rate), {cache_stats['entries']} entries\n"
+        )
+
         # For thinking status, show a simplified message. The user can check model capabilities by trying to enable thinking mode
         thinking_status = ""
         if self.thinking_mode:
@@ -688,7 +1009,12 @@ class MCPClient:
             f"Tool execution display: [{'green' if self.show_tool_execution else 'red'}]{'Enabled' if self.show_tool_execution else 'Disabled'}[/{'green' if self.show_tool_execution else 'red'}]\n"
             f"Performance metrics: [{'green' if self.show_metrics else 'red'}]{'Enabled' if self.show_metrics else 'Disabled'}[/{'green' if self.show_metrics else 'red'}]\n"
             f"Human-in-the-Loop confirmations: [{'green' if self.hil_manager.is_enabled() else 'red'}]{'Enabled' if self.hil_manager.is_enabled() else 'Disabled'}[/{'green' if self.hil_manager.is_enabled() else 'red'}]\n"
+            f"Tool rounds per query: {self.max_tool_rounds} (budget {self.query_time_budget:g}s)\n"
+            f"Tool call timeout: {f'{self.tool_executor.call_timeout:g}s' if self.tool_executor.call_timeout else 'Disabled'}\n"
+            f"Tool routing: [{'green' if self.tool_routing else 'red'}]{'Enabled' if self.tool_routing else 'Disabled'}"
+            f"[/{'green' if self.tool_routing else 'red'}] (top {self.tool_router.top_k})\n"
             f"Conversation entries: {history_count}\n"
+            f"{budget_status}"
             f"Total tokens generated: {self.actual_token_count:,}",
             title="Context Info", border_style="cyan", expand=False
         ))
@@ -716,7 +1042,10 @@ class MCPClient:
             "model": self.model_manager.get_current_model(),
             "enabledTools": self.tool_manager.get_enabled_tools(),
             "contextSettings": {
-                "retainContext": self.retain_context
+                "retainContext": self.retain_context,
+                "tokenBudgetRatio": self.context_window.budget_ratio,
+                "overflowStrategy": self.context_window.strategy,
+                "stablePrefix": self.stable_prefix
             },
             "modelSettings": {
                 "thinkingMode": self.thinking_mode,
@@ -729,6 +1058,16 @@ class MCPClient:
             },
             "hilSettings": {
                 "enabled": self.hil_manager.is_enabled()
+            },
+            "agentSettings": {
+                "maxToolRounds": self.max_tool_rounds,
+                "queryTimeBudget": self.query_time_budget,
+                "toolTimeout": self.tool_executor.call_timeout
+            },
+            "toolRouting": {
+                "enabled": self.tool_routing,
+                "topK": self.tool_router.top_k,
+                "alwaysInclude": self.tool_router.always_include
             }
         }
 
@@ -771,6 +1110,12 @@ class MCPClient:
         if "contextSettings" in config_data:
             if "retainContext" in config_data["contextSettings"]:
                 self.retain_context = config_data["contextSettings"]["retainContext"]
+            if "tokenBudgetRatio" in config_data["contextSettings"]:
+                self.context_window.budget_ratio = config_data["contextSettings"]["tokenBudgetRatio"]
+            if "overflowStrategy" in config_data["contextSettings"]:
+                self.context_window.strategy = config_data["contextSettings"]["overflowStrategy"]
+            if "stablePrefix" in config_data["contextSettings"]:
+                self.stable_prefix = config_data["contextSettings"]["stablePrefix"]
 
         # Load model settings if specified
         if "modelSettings" in config_data:
@@ -795,6 +1140,24 @@ class MCPClient:
             if "enabled" in config_data["hilSettings"]:
                 self.hil_manager.set_enabled(config_data["hilSettings"]["enabled"])
 
+        # Load agent loop settings if specified
+        if "agentSettings" in config_data:
+            if "maxToolRounds" in config_data["agentSettings"]:
+                self.max_tool_rounds = config_data["agentSettings"]["maxToolRounds"]
+            if "queryTimeBudget" in config_data["agentSettings"]:
+                self.query_time_budget = config_data["agentSettings"]["queryTimeBudget"]
+            if "toolTimeout" in config_data["agentSettings"]:
+                self.tool_executor.call_timeout = config_data["agentSettings"]["toolTimeout"]
+
+        # Load tool routing settings if specified
+        if "toolRouting" in config_data:
+            if "enabled" in config_data["toolRouting"]:
+                self.tool_routing = config_data["toolRouting"]["enabled"]
+            if "topK" in config_data["toolRouting"]:
+                self.tool_router.top_k = config_data["toolRouting"]["topK"]
+            if "alwaysInclude" in config_data["toolRouting"]:
+                self.tool_router.always_include = list(config_data["toolRouting"]["alwaysInclude"])
+
         return True
 
     def reset_configuration(self):
@@ -811,6 +1174,9 @@ class MCPClient:
         if "contextSettings" in config_data:
             if "retainContext" in config_data["contextSettings"]:
                 self.retain_context = config_data["contextSettings"]["retainContext"]
+            self.context_window.budget_ratio = config_data["contextSettings"].get("tokenBudgetRatio", DEFAULT_CONTEXT_BUDGET_RATIO)
+            self.context_window.strategy = config_data["contextSettings"].get("overflowStrategy", "drop")
+            self.stable_prefix = config_data["contextSettings"].get("stablePrefix", True)
 
         # Reset model settings from the default configuration
         if "modelSettings" in config_data:
@@ -846,14 +1212,97 @@ class MCPClient:
                 # Default HIL to True if not specified
                 self.hil_manager.set_enabled(True)
 
+        # Reset agent loop settings from the default configuration
+        if "agentSettings" in config_data:
+            self.max_tool_rounds = config_data["agentSettings"].get("maxToolRounds", DEFAULT_MAX_TOOL_ROUNDS)
+            self.query_time_budget = config_data["agentSettings"].get("queryTimeBudget", DEFAULT_QUERY_TIME_BUDGET)
+            self.tool_executor.call_timeout = config_data["agentSettings"].get("toolTimeout", DEFAULT_TOOL_CALL_TIMEOUT)
+
+        # Reset tool routing settings from the default configuration
+        if "toolRouting" in config_data:
+            self.tool_routing = config_data["toolRouting"].get("enabled", False)
+            self.tool_router.top_k = config_data["toolRouting"].get("topK", DEFAULT_TOOL_ROUTER_TOP_K)
+            self.tool_router.always_include = list(config_data["toolRouting"].get("alwaysInclude", []))
+
         return True
 
     async def cleanup(self):
         """Clean up resources"""
+        if self.update_check_task is not None and not self.update_check_task.done():
+            self.update_check_task.cancel()
+            await asyncio.gather(self.update_check_task, return_exceptions=True)
         await self.exit_stack.aclose()
 
+    def display_server_status(self):
+        """Display each configured server with its connection status, tool count and reconnects"""
+        connector = self.server_connector
+        if not connector.configured_servers:
+            self.console.print("[yellow]No servers configured.[/yellow]")
+            return
+
+        lines = []
+        for name in connector.configured_servers:
+            if connector.is_connecting(name):
+                tool_count = len(connector.sessions[name]["tools"])
+                line = f"[yellow]◐[/yellow] [bold]{name}[/bold] - connecting, {tool_count} cached tools"
+            elif connector.is_idle(name):
+                tool_count = len(connector.sessions[name]["tools"])
+                line = f"[cyan]◌[/cyan] [bold]{name}[/bold] - idle, starts on first use, {tool_count} tools"
+            elif name in connector.sessions:
+                tool_count = len(connector.sessions[name]["tools"])
+                line = f"[green]●[/green] [bold]{name}[/bold] - connected, {tool_count} tools"
+            else:
+                line = f"[red]○[/red] [bold]{name}[/bold] - [dim]disconnected[/dim]"
+
+            stats = connector.reconnect_stats.get(name)
+            if stats:
+                line += (f" [dim](reconnected {stats['reconnects']}x, {stats['failed_reconnects']} failed, "
+                         f"{stats['downtime']:.1f}s down)[/dim]")
+            lines.append(line)
+        self.console.print(Panel("\n".join(lines), title="MCP Servers", border_style="cyan", expand=False))
+
+    async def manage_server(self, action: str, server_name: Optional[str] = None):
+        """Connect, disconnect or restart a single MCP server without touching the others
+
+        Args:
+            action: 'connect', 'disconnect' or 'restart'
+            server_name: Name of the server, asked for interactively if not given
+        """
+        if not server_name:
+            self.display_server_status()
+            if not self.server_connector.configured_servers:
+                return
+            server_name = (await self.get_user_input(f"Server to {action}")).strip()
+            if not server_name or server_name.lower() in ['quit', 'q', 'exit', 'bye']:
+                return
+
+        start = time.perf_counter()
+        if action == "connect":
+            success = await self.server_connector.connect_server(server_name)
+        elif action == "disconnect":
+            success = await self.server_connector.disconnect_server(server_name)
+            if not success:
+                self.console.print(f"[yellow]Server {server_name} is not connected[/yellow]")
+        else:
+            success = await self.server_connector.restart_server(server_name)
+        elapsed = time.perf_counter() - start
+
+        # The connector updates its sessions and tools in place
+        self.tool_executor.reset([server_name])
+        self.sessions = self.server_connector.sessions
+        self.tool_manager.set_available_tools(self.server_connector.get_available_tools())
+        self.tool_manager.set_enabled_tools(self.server_connector.get_enabled_tools())
+
+        if success:
+            past_tense = {"connect": "Connected", "disconnect": "Disconnected", "restart": "Restarted"}[action]
+            self.console.print(f"[green]{past_tense} {server_name} in {elapsed:.2f}s[/green]")
+
     async def reload_servers(self):
-        """Reload all MCP servers with the same connection parameters"""
+        """Reload MCP servers with the same connection parameters
+
+        Only servers that were added, removed or whose configuration changed
+        are restarted; the others keep their session and tool selection.
+        """
         if not any(self.server_connection_params.values()):
             self.console.print("[yellow]No server connection parameters stored. Cannot reload.[/yellow]")
             return
@@ -861,31 +1310,23 @@ class MCPClient:
         self.console.print("[cyan]🔄 Reloading MCP servers...[/cyan]")
 
         try:
-            # Store current tool enabled states
-            current_enabled_tools = self.tool_manager.get_enabled_tools().copy()
-
-            # Disconnect from all current servers
-            await self.server_connector.disconnect_all_servers()
-
-            # Update our exit_stack reference to the new one created by ServerConnector
-            self.exit_stack = self.server_connector.exit_stack
-
-            # Reconnect using stored parameters
-            await self.connect_to_servers(
+            changes = await self.server_connector.reload_servers(
                 server_paths=self.server_connection_params['server_paths'],
                 server_urls=self.server_connection_params['server_urls'],
                 config_path=self.server_connection_params['config_path'],
                 auto_discovery=self.server_connection_params['auto_discovery']
             )
+            self.tool_executor.reset(changes["removed"] + changes["restarted"])
 
-            # Restore enabled tool states for tools that still exist
-            available_tool_names = {tool.name for tool in self.tool_manager.get_available_tools()}
-            for tool_name, enabled in current_enabled_tools.items():
-                if tool_name in available_tool_names:
-                    self.tool_manager.set_tool_status(tool_name, enabled)
-                    self.server_connector.set_tool_status(tool_name, enabled)
+            # The connector updates its sessions and tools in place
+            self.sessions = self.server_connector.sessions
+            self.tool_manager.set_available_tools(self.server_connector.get_available_tools())
+            self.tool_manager.set_enabled_tools(self.server_connector.get_enabled_tools())
 
-            self.console.print("[green]✅ MCP servers reloaded successfully![/green]")
+            summary = ", ".join(
+                f"{len(changes[key])} {key}" for key in ("added", "removed", "restarted", "unchanged")
+            )
+            self.console.print(f"[green]✅ MCP servers reloaded successfully! ({summary})[/green]")
 
             # Display updated status
             self.display_available_tools()
@@ -922,6 +1363,31 @@ def main(
         help=f"Auto-discover servers from Claude's config at {DEFAULT_CLAUDE_CONFIG} - If no other options are provided, this will be enabled by default",
         rich_help_panel="MCP Server Configuration"
     ),
+    connect_concurrency: int = typer.Option(
+        DEFAULT_CONNECT_CONCURRENCY, "--connect-concurrency",
+        help="Maximum number of MCP servers to connect to at the same time (1 connects one by one)",
+        rich_help_panel="MCP Server Configuration"
+    ),
+    connect_timeout: float = typer.Option(
+        DEFAULT_CONNECT_TIMEOUT, "--connect-timeout",
+        help="Seconds allowed for each MCP server to start, initialize and list its tools",
+        rich_help_panel="MCP Server Configuration"
+    ),
+    lazy_servers: bool = typer.Option(
+        False, "--lazy-servers",
+        help="Start stdio servers with cached tools only when one of their tools is first called",
+        rich_help_panel="MCP Server Configuration"
+    ),
+    server_idle_timeout: float = typer.Option(
+        DEFAULT_SERVER_IDLE_TIMEOUT, "--server-idle-timeout",
+        help="Seconds a lazy server may stay unused before it is stopped (0 keeps it running)",
+        rich_help_panel="MCP Server Configuration"
+    ),
+    description_tokens: int = typer.Option(
+        DEFAULT_DESCRIPTION_TOKENS, "--description-tokens",
+        help="Tokens each tool or parameter description may use before it is shortened (0 keeps them whole)",
+        rich_help_panel="MCP Server Configuration"
+    ),
 
     # Ollama Configuration
     model: str = typer.Option(
@@ -935,7 +1401,47 @@ def main(
         rich_help_panel="Ollama Configuration"
     ),
 
+    # Batch Mode
+    prompt: Optional[str] = typer.Option(
+        None, "--prompt", "-p",
+        help="Run a single prompt without the interactive chat and print the result as JSON",
+        rich_help_panel="Batch Mode"
+    ),
+    prompts_file: Optional[str] = typer.Option(
+        None, "--prompts-file",
+        help="Run every prompt of a JSONL file (strings or {\"id\", \"prompt\"} objects) and print JSON Lines results",
+        rich_help_panel="Batch Mode"
+    ),
+    output: Optional[str] = typer.Option(
+        None, "--output", "-o",
+        help="Write batch results to this file instead of stdout",
+        rich_help_panel="Batch Mode"
+    ),
+    hil_policy: str = typer.Option(
+        "approve", "--hil-policy",
+        help="How tool calls are confirmed in batch mode: approve or deny",
+        rich_help_panel="Batch Mode"
+    ),
+    concurrency: int = typer.Option(
+        DEFAULT_BATCH_CONCURRENCY, "--concurrency",
+        help="Number of batch prompts run at the same time over the shared MCP sessions",
+        rich_help_panel="Batch Mode"
+    ),
+    resume: bool = typer.Option(
+        False, "--resume",
+        help="Skip prompts that already succeeded in the --output file and append new results to it",
+        rich_help_panel="Batch Mode"
+    ),
+
     # General Options
+    profile_startup: bool = typer.Option(
+        False, "--profile-startup",
+        help="Show how long each startup phase took before the first prompt",
+    ),
+    plain: Optional[bool] = typer.Option(
+        None, "--plain/--rich",
+        help="Stream raw text instead of Rich formatted output (default: plain when output is not a terminal)",
+    ),
     version: Optional[bool] = typer.Option(
         None, "--version", "-v",
         help="Show version and exit",
@@ -951,24 +1457,68 @@ def main(
     if not (mcp_server or mcp_server_url or servers_json or auto_discovery):
         auto_discovery = True
 
-    # Run the async main function
-    asyncio.run(async_main(mcp_server, mcp_server_url, servers_json, auto_discovery, model, host))
-
-async def async_main(mcp_server, mcp_server_url, servers_json, auto_discovery, model, host):
-    """Asynchronous main function to run the MCP Client for Ollama"""
+    if prompt is not None and prompts_file:
+        raise typer.BadParameter("Use either --prompt or --prompts-file, not both")
+    if hil_policy not in HIL_POLICIES:
+        raise typer.BadParameter(f"--hil-policy must be one of: {', '.join(HIL_POLICIES)}")
+    if resume and not output:
+        raise typer.BadParameter("--resume needs the --output file to continue from")
+
+    # Use plain output when piped unless a mode was chosen explicitly
+    if plain is None:
+        plain = not sys.stdout.isatty()
+
+    batch = None
+    if prompt is not None or prompts_file:
+        batch = {"output": output, "hil_policy": hil_policy, "concurrency": concurrency, "resume": resume}
+        if prompts_file:
+            batch["prompts_file"] = prompts_file
+        else:
+            batch["prompts"] = [{"id": 1, "prompt": prompt}]
 
-    console = Console()
+    # Run the async main function
+    exit_code = asyncio.run(async_main(mcp_server, mcp_server_url, servers_json, auto_discovery, model, host,
+                                       connect_concurrency, connect_timeout, plain, batch, profile_startup,
+                                       lazy_servers, server_idle_timeout, description_tokens))
+    if exit_code:
+        raise typer.Exit(code=exit_code)
+
+async def async_main(mcp_server, mcp_server_url, servers_json, auto_discovery, model, host,
+                     connect_concurrency=DEFAULT_CONNECT_CONCURRENCY, connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                     plain=False, batch=None, profile_startup=False, lazy_servers=False,
+                     server_idle_timeout=DEFAULT_SERVER_IDLE_TIMEOUT, description_tokens=DEFAULT_DESCRIPTION_TOKENS):
+    """Asynchronous main function to run the MCP Client for Ollama
+
+    Returns:
+        int: Exit code, non-zero if the client could not start or a batch prompt failed
+    """
+
+    # In batch mode stdout carries the JSON results, so messages go to stderr
+    console = Console(stderr=batch is not None)
+
+    if batch is not None and "prompts_file" in batch:
+        try:
+            batch["prompts"] = load_prompts(batch["prompts_file"])
+        except (OSError, ValueError) as e:
+            console.print(f"[bold red]Error: Could not read prompts file {batch['prompts_file']}: {str(e)}[/bold red]")
+            return 1
 
     # Create a temporary client to check if Ollama is running
-    client = MCPClient(model=model, host=host)
-    if not await client.model_manager.check_ollama_running():
+    with startup_profiler.phase("Client init"):
+        client = MCPClient(model=model, host=host, connect_concurrency=connect_concurrency,
+                           connect_timeout=connect_timeout, plain_output=plain, console=console,
+                           lazy_servers=lazy_servers, server_idle_timeout=server_idle_timeout,
+                           description_tokens=description_tokens)
+    with startup_profiler.phase("Ollama probe"):
+        ollama_running = await client.model_manager.check_ollama_running()
+    if not ollama_running:
         console.print(Panel(
             "[bold red]Error: Ollama is not running![/bold red]\n\n"
             "This client requires Ollama to be running to process queries.\n"
             "Please start Ollama by running the 'ollama serve' command in a terminal.",
             title="Ollama Not Running", border_style="red", expand=False
         ))
-        return
+        return 1
 
     # Handle server configuration options - only use one source to prevent duplicates
     config_path = None
@@ -980,7 +1530,7 @@ async def async_main(mcp_server, mcp_server_url, servers_json, auto_discovery, m
             config_path = servers_json
         else:
             console.print(f"[bold red]Error: Specified JSON config file not found: {servers_json}[/bold red]")
-            return
+            return 1
     elif auto_discovery:
         # If --auto-discovery is provided, use that and set config_path to None
         auto_discovery_final = True
@@ -1002,13 +1552,71 @@ async def async_main(mcp_server, mcp_server_url, servers_json, auto_discovery, m
         for server_path in mcp_server:
             if not os.path.exists(server_path):
                 console.print(f"[bold red]Error: Server script not found: {server_path}[/bold red]")
-                return
+                return 1
     try:
-        await client.connect_to_servers(mcp_server, mcp_server_url, config_path, auto_discovery_final)
-        client.auto_load_default_config()
-        await client.chat_loop()
+        with startup_profiler.phase("Server connect"):
+            await client.connect_to_servers(mcp_server, mcp_server_url, config_path, auto_discovery_final)
+        with startup_profiler.phase("Config load"):
+            client.auto_load_default_config()
+        if batch is None:
+            await client.chat_loop(show_startup_profile=profile_startup)
+            return 0
+        if profile_startup:
+            startup_profiler.display(console)
+        return await run_batch(client, batch)
     finally:
         await client.cleanup()
 
+async def run_batch(client, batch):
+    """Run batch prompts on a connected client and write their JSON results
+
+    Args:
+        client: Connected MCPClient
+        batch: Dict with 'prompts', 'output', 'hil_policy', 'concurrency' and 'resume' keys
+
+    Returns:
+        int: 0 if every prompt succeeded, 1 otherwise
+    """
+    # Nothing is rendered for the user in batch mode and tool calls follow the policy
+    client.stream_responses = False
+    client.show_tool_execution = False
+    client.show_metrics = False
+    client.hil_manager.set_policy(batch["hil_policy"])
+
+    completed_ids = set()
+    if batch["resume"]:
+        completed_ids = read_checkpoint(batch["output"])
+        # Start on a new line if the previous run was cut off mid-line
+        if os.path.exists(batch["output"]) and os.path.getsize(batch["output"]) > 0:
+            with open(batch["output"], "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    with open(batch["output"], "a", encoding="utf-8") as out:
+                        out.write("\n")
+
+    mode = "a" if batch["resume"] else "w"
+    output_file = open(batch["output"], mode, encoding="utf-8") if batch["output"] else sys.stdout
+    runner = BatchRunner(client, output_file, concurrency=batch["concurrency"], completed_ids=completed_ids)
+    start = time.perf_counter()
+    try:
+        results = await runner.run(batch["prompts"])
+    finally:
+        if output_file is not sys.stdout:
+            output_file.close()
+
+    summary = summarize_results(results, time.perf_counter() - start)
+    latency = summary["latency"]
+    skipped = f", {runner.skipped} skipped from checkpoint" if runner.skipped else ""
+    client.console.print(Panel(
+        f"Prompts: {summary['prompts']} ([green]{summary['succeeded']} succeeded[/green], "
+        f"[{'red' if summary['failed'] else 'green'}]{summary['failed']} failed[/{'red' if summary['failed'] else 'green'}]{skipped})\n"
+        f"Elapsed: {summary['elapsed']:.2f}s with {runner.concurrency} concurrent prompt(s)\n"
+        f"Throughput: {summary['prompts_per_second']:.2f} prompts/s, {summary['eval_tokens_per_second']:.1f} eval tokens/s\n"
+        f"Latency: p50 {latency['p50']:.2f}s, p90 {latency['p90']:.2f}s, p99 {latency['p99']:.2f}s, max {latency['max']:.2f}s",
+        title="Batch Summary", border_style="cyan", expand=False
+    ))
+
+    return 1 if summary["failed"] else 0
+
 if __name__ == "__main__":
     app()
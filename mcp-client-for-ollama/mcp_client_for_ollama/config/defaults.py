@@ -4,7 +4,10 @@ This module provides default settings and paths used throughout the application.
 """
 
 import os
-from ..utils.constants import DEFAULT_MODEL, DEFAULT_CONFIG_FILE, DEFAULT_CONFIG_DIR
+from ..utils.constants import (
+    DEFAULT_MODEL, DEFAULT_CONFIG_FILE, DEFAULT_CONFIG_DIR, DEFAULT_MAX_TOOL_ROUNDS, DEFAULT_QUERY_TIME_BUDGET,
+    DEFAULT_CONTEXT_BUDGET_RATIO, DEFAULT_TOOL_ROUTER_TOP_K, DEFAULT_TOOL_CALL_TIMEOUT
+)
 
 def default_config() -> dict:
     """Get default configuration settings.
@@ -17,7 +20,10 @@ def default_config() -> dict:
         "model": DEFAULT_MODEL,
         "enabledTools": {},  # Will be populated with available tools
         "contextSettings": {
-            "retainContext": True
+            "retainContext": True,
+            "tokenBudgetRatio": DEFAULT_CONTEXT_BUDGET_RATIO,
+            "overflowStrategy": "drop",
+            "stablePrefix": True
         },
         "modelSettings": {
             "thinkingMode": True,
@@ -46,6 +52,16 @@ def default_config() -> dict:
         },
         "hilSettings": {
             "enabled": True
+        },
+        "agentSettings": {
+            "maxToolRounds": DEFAULT_MAX_TOOL_ROUNDS,
+            "queryTimeBudget": DEFAULT_QUERY_TIME_BUDGET,
+            "toolTimeout": DEFAULT_TOOL_CALL_TIMEOUT
+        },
+        "toolRouting": {
+            "enabled": False,
+            "topK": DEFAULT_TOOL_ROUTER_TOP_K,
+            "alwaysInclude": []
         }
     }
 
@@ -9,7 +9,7 @@ import os
 from typing import Dict, Any, Optional
 from rich.console import Console
 from rich.panel import Panel
-from ..utils.constants import DEFAULT_CONFIG_DIR, DEFAULT_CONFIG_FILE
+from ..utils.constants import DEFAULT_CONFIG_DIR, DEFAULT_CONFIG_FILE, CONTEXT_OVERFLOW_STRATEGIES
 from .defaults import default_config
 
 class ConfigManager:
@@ -204,6 +204,13 @@ class ConfigManager:
         if "contextSettings" in config_data and isinstance(config_data["contextSettings"], dict):
             if "retainContext" in config_data["contextSettings"]:
                 validated["contextSettings"]["retainContext"] = bool(config_data["contextSettings"]["retainContext"])
+            budget_ratio = config_data["contextSettings"].get("tokenBudgetRatio")
+            if isinstance(budget_ratio, (int, float)) and 0 < budget_ratio <= 1:
+                validated["contextSettings"]["tokenBudgetRatio"] = float(budget_ratio)
+            if config_data["contextSettings"].get("overflowStrategy") in CONTEXT_OVERFLOW_STRATEGIES:
+                validated["contextSettings"]["overflowStrategy"] = config_data["contextSettings"]["overflowStrategy"]
+            if "stablePrefix" in config_data["contextSettings"]:
+                validated["contextSettings"]["stablePrefix"] = bool(config_data["contextSettings"]["stablePrefix"])
 
         if "modelSettings" in config_data and isinstance(config_data["modelSettings"], dict):
             if "thinkingMode" in config_data["modelSettings"]:
@@ -254,4 +261,23 @@ class ConfigManager:
             if "enabled" in config_data["hilSettings"]:
                 validated["hilSettings"]["enabled"] = bool(config_data["hilSettings"]["enabled"])
 
+        if "agentSettings" in config_data and isinstance(config_data["agentSettings"], dict):
+            agent_settings = config_data["agentSettings"]
+            if isinstance(agent_settings.get("maxToolRounds"), int) and agent_settings["maxToolRounds"] >= 0:
+                validated["agentSettings"]["maxToolRounds"] = agent_settings["maxToolRounds"]
+            if isinstance(agent_settings.get("queryTimeBudget"), (int, float)) and agent_settings["queryTimeBudget"] > 0:
+                validated["agentSettings"]["queryTimeBudget"] = float(agent_settings["queryTimeBudget"])
+            # No timeout (null or 0) keeps the default of None
+            if isinstance(agent_settings.get("toolTimeout"), (int, float)) and agent_settings["toolTimeout"] > 0:
+                validated["agentSettings"]["toolTimeout"] = float(agent_settings["toolTimeout"])
+
+        if "toolRouting" in config_data and isinstance(config_data["toolRouting"], dict):
+            tool_routing = config_data["toolRouting"]
+            if "enabled" in tool_routing:
+                validated["toolRouting"]["enabled"] = bool(tool_routing["enabled"])
+            if isinstance(tool_routing.get("topK"), int) and tool_routing["topK"] > 0:
+                validated["toolRouting"]["topK"] = tool_routing["topK"]
+            if isinstance(tool_routing.get("alwaysInclude"), list):
+                validated["toolRouting"]["alwaysInclude"] = [str(name) for name in tool_routing["alwaysInclude"]]
+
         return validated
@@ -0,0 +1,145 @@
+"""Model capability caching for MCP Client for Ollama.
+
+This module caches what ollama.show() reports about a model, such as its
+capabilities and context length, so it is fetched once per model version
+instead of on every prompt.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class ModelCapabilityCache:
+    """Caches model capabilities and context length keyed by model name and digest.
+
+    An entry stays valid until the digest reported by ollama.list() for that
+    model changes (e.g. after `ollama pull`) or it is invalidated explicitly.
+    """
+
+    def __init__(self, ollama: Optional[Any] = None):
+        """Initialize the ModelCapabilityCache.
+
+        Args:
+            ollama: Ollama async client used to query model information
+        """
+        self.ollama = ollama
+        self._entries: Dict[str, Dict[str, Any]] = {}  # Model name -> cached model information
+        self._digests: Dict[str, str] = {}  # Model name -> digest last reported by ollama.list()
+
+    @staticmethod
+    def _normalize_name(model: str) -> str:
+        """Normalize a model name so 'llama3' and 'llama3:latest' share an entry.
+
+        Args:
+            model: Model name
+
+        Returns:
+            str: Model name including its tag
+        """
+        return model if ":" in model else f"{model}:latest"
+
+    @staticmethod
+    def _extract_context_length(model_info: Dict[str, Any]) -> Optional[int]:
+        """Find the context length in the model_info section of ollama.show().
+
+        Args:
+            model_info: Mapping of model metadata keys to values
+
+        Returns:
+            Optional[int]: Context length in tokens, or None if not reported
+        """
+        if not model_info:
+            return None
+
+        architecture = model_info.get("general.architecture")
+        if architecture and f"{architecture}.context_length" in model_info:
+            return model_info[f"{architecture}.context_length"]
+
+        for key, value in model_info.items():
+            if key.endswith(".context_length"):
+                return value
+        return None
+
+    async def get(self, model: str) -> Dict[str, Any]:
+        """Get the cached information for a model, fetching it if needed.
+
+        Args:
+            model: Model name
+
+        Returns:
+            Dict with 'capabilities', 'context_length' and 'digest' keys
+
+        Raises:
+            Exception: If Ollama cannot be reached or does not know the model
+        """
+        name = self._normalize_name(model)
+        entry = self._entries.get(name)
+        if entry is not None and entry["digest"] == self._digests.get(name):
+            return entry
+
+        model_info = await self.ollama.show(model)
+        entry = {
+            "digest": self._digests.get(name),
+            "capabilities": list(model_info.get("capabilities") or []),
+            "context_length": self._extract_context_length(model_info.get("modelinfo") or {}),
+        }
+        self._entries[name] = entry
+        return entry
+
+    def update_digests(self, models: Iterable[Any]) -> None:
+        """Record the digests reported by ollama.list(), dropping stale entries.
+
+        Args:
+            models: Model objects or dicts as returned in ollama.list()["models"]
+        """
+        for model in models:
+            name = model.get("model") or model.get("name")
+            if not name:
+                continue
+            name = self._normalize_name(name)
+            digest = model.get("digest")
+            if self._digests.get(name) != digest:
+                self._digests[name] = digest
+                self._entries.pop(name, None)
+
+    def invalidate(self, model: Optional[str] = None) -> None:
+        """Drop the cached information of one model, or of all models.
+
+        Args:
+            model: Model name, or None to clear the whole cache
+        """
+        if model is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(self._normalize_name(model), None)
+
+    def get_cached(self, model: str) -> Optional[Dict[str, Any]]:
+        """Get the cached information for a model without querying Ollama.
+
+        Args:
+            model: Model name
+
+        Returns:
+            The cached entry, or None if the model has not been looked up yet
+        """
+        return self._entries.get(self._normalize_name(model))
+
+    async def get_capabilities(self, model: str) -> List[str]:
+        """Get the capabilities of a model (e.g. 'tools', 'thinking').
+
+        Args:
+            model: Model name
+
+        Returns:
+            List[str]: Capabilities reported by Ollama
+        """
+        return (await self.get(model))["capabilities"]
+
+    async def get_context_length(self, model: str) -> Optional[int]:
+        """Get the maximum context length a model was trained for.
+
+        Args:
+            model: Model name
+
+        Returns:
+            Optional[int]: Context length in tokens, or None if not reported
+        """
+        return (await self.get(model))["context_length"]
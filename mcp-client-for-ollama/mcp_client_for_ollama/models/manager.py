@@ -8,6 +8,7 @@ from rich.panel import Panel
 from rich.text import Text
 from rich.prompt import Prompt
 from ..utils.constants import DEFAULT_MODEL
+from .capabilities import ModelCapabilityCache
 
 class ModelManager:
     """Manages Ollama models.
@@ -22,10 +23,12 @@ class ModelManager:
         Args:
             console: Rich console for output (optional)
             default_model: Default model to use if none is specified
+            ollama: Ollama async client (optional)
         """
         self.console = console or Console()
         self.model = default_model
         self.ollama = ollama
+        self.capabilities = ModelCapabilityCache(ollama)
 
     async def check_ollama_running(self) -> bool:
         """Check if Ollama is running by making a request to its API.
@@ -36,6 +39,7 @@ class ModelManager:
         try:
             result = await self.ollama.list()
             if result:
+                self.capabilities.update_digests(result.get("models", []))
                 return True
         except Exception:
             return False
@@ -50,6 +54,7 @@ class ModelManager:
             result = await self.ollama.list()
             if result:
                 models = result.get("models", [])
+                self.capabilities.update_digests(models)
                 return models
         except Exception as e:
             self.console.print(f"[red]Error getting models from Ollama: {str(e)}[/red]")
@@ -69,8 +74,52 @@ class ModelManager:
         Args:
             model_name: Name of the model to set as current
         """
+        if model_name != self.model:
+            # Refresh the capabilities of the newly selected model on next use
+            self.capabilities.invalidate(model_name)
         self.model = model_name
 
+    async def get_model_capabilities(self, model: Optional[str] = None) -> List[str]:
+        """Get the capabilities of a model, using the capability cache.
+
+        Args:
+            model: Model name (defaults to the current model)
+
+        Returns:
+            List[str]: Capabilities such as 'completion', 'tools' or 'thinking',
+            or an empty list if they cannot be determined
+        """
+        try:
+            return await self.capabilities.get_capabilities(model or self.model)
+        except Exception:
+            return []
+
+    async def supports_capability(self, capability: str, model: Optional[str] = None) -> bool:
+        """Check whether a model has a capability, using the capability cache.
+
+        Args:
+            capability: Capability name, e.g. 'thinking' or 'tools'
+            model: Model name (defaults to the current model)
+
+        Returns:
+            bool: True if the model reports the capability
+        """
+        return capability in await self.get_model_capabilities(model)
+
+    async def get_context_length(self, model: Optional[str] = None) -> Optional[int]:
+        """Get the maximum context length of a model, using the capability cache.
+
+        Args:
+            model: Model name (defaults to the current model)
+
+        Returns:
+            Optional[int]: Context length in tokens, or None if unknown
+        """
+        try:
+            return await self.capabilities.get_context_length(model or self.model)
+        except Exception:
+            return None
+
     def display_current_model(self) -> None:
         """Display the currently selected model in the console."""
         self.console.print(Panel(f"[bold blue]🧠 Current model:[/bold blue] [bold green]{self.model}[/bold green]",
@@ -188,7 +237,7 @@ class ModelManager:
 
             if selection in ['s', 'save']:
                 # Save the selected model as current model
-                self.model = selected_model
+                self.set_model(selected_model)
                 if clear_console_func:
                     clear_console_func()
                 return self.model
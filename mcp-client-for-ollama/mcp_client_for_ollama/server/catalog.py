@@ -0,0 +1,130 @@
+"""On-disk cache of the tools provided by MCP servers.
+
+Listing the tools of every server at startup is slow for servers with large
+schemas, although the result rarely changes between runs. The tool lists are
+therefore stored on disk, keyed by a hash of the server configuration and the
+server version reported by `initialize`, so a later run can offer the tools
+before the servers have finished connecting.
+
+Classes:
+    ToolCatalogCache: Reads and writes the cached tool list of each server.
+"""
+import hashlib
+import json
+import os
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from ..utils.constants import TOOL_CATALOG_CACHE_FILE
+
+if TYPE_CHECKING:
+    from mcp import Tool
+
+
+class ToolCatalogCache:
+    """Tool lists of MCP servers persisted in a JSON file
+
+    Entries are only used while the server configuration hash matches; the
+    server version is checked once the server has initialized. Entries of
+    servers whose tool list changes at runtime are marked dynamic, so their
+    tools are offered at startup but always listed again.
+    """
+
+    def __init__(self, path: str = TOOL_CATALOG_CACHE_FILE):
+        """Initialize the ToolCatalogCache.
+
+        Args:
+            path: Path of the cache file
+        """
+        self.path = path
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None  # Loaded on first use
+
+    @staticmethod
+    def config_hash(fingerprint: Any) -> str:
+        """Hash a server configuration fingerprint
+
+        Args:
+            fingerprint: JSON-serializable fingerprint of the server configuration
+
+        Returns:
+            str: Hex digest identifying the configuration
+        """
+        return hashlib.sha256(json.dumps(fingerprint, default=str).encode("utf-8")).hexdigest()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Read the cache file once
+
+        Returns:
+            Dict mapping server names to their cache entries
+        """
+        if self._entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    entries = json.load(f)
+            except (OSError, ValueError):
+                entries = {}
+            self._entries = entries if isinstance(entries, dict) else {}
+        return self._entries
+
+    def get(self, server_name: str, config_hash: str) -> Optional[Dict[str, Any]]:
+        """Get the cached tools of a server
+
+        Args:
+            server_name: Name of the server
+            config_hash: Hash of the server's current configuration
+
+        Returns:
+            Dict with 'server_version', 'dynamic' and 'tools' (Tool objects), or None if nothing valid is cached
+        """
+        entry = self._load().get(server_name)
+        if not isinstance(entry, dict) or entry.get("config_hash") != config_hash:
+            return None
+
+        from mcp import Tool
+
+        try:
+            tools = [Tool.model_validate(tool) for tool in entry.get("tools", [])]
+        except ValueError:
+            return None
+        return {"server_version": entry.get("server_version"), "dynamic": bool(entry.get("dynamic")), "tools": tools}
+
+    def put(self, server_name: str, config_hash: str, server_version: Optional[str], tools: List["Tool"],
+            dynamic: bool = False) -> None:
+        """Store the tools of a server; call save() to write them to disk
+
+        Args:
+            server_name: Name of the server
+            config_hash: Hash of the server's configuration
+            server_version: Name and version the server reported, if any
+            tools: Tools as reported by the server (without server prefix)
+            dynamic: Whether the server's tool list changes while it runs
+        """
+        self._load()[server_name] = {
+            "config_hash": config_hash,
+            "server_version": server_version,
+            "dynamic": dynamic,
+            "cached_at": time.time(),
+            "tools": [tool.model_dump(mode="json", exclude_none=True) for tool in tools],
+        }
+
+    def remove(self, server_name: str) -> None:
+        """Forget the tools of a server; call save() to write the change to disk
+
+        Args:
+            server_name: Name of the server
+        """
+        self._load().pop(server_name, None)
+
+    def save(self) -> None:
+        """Write the cache file, replacing it atomically"""
+        if self._entries is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(temp_path, self.path)
+        except OSError:
+            # The cache only speeds up startup, so failing to write it is not an error
+            pass
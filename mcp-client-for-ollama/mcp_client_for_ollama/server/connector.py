@@ -4,20 +4,33 @@ This module handles connections to one or more MCP servers, including setup,
 initialization, and communication.
 """
 
+import asyncio
+import json
 import os
 import shutil
-from contextlib import AsyncExitStack
-from typing import Dict, List, Any, Optional, Tuple
+import time
+from contextlib import AsyncExitStack, nullcontext
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, List, Any, Optional, Tuple
 from rich.console import Console
 from rich.panel import Panel
-from mcp import ClientSession, Tool
-from mcp.client.stdio import stdio_client, StdioServerParameters
-from mcp.client.sse import sse_client
-from mcp.client.streamable_http import streamablehttp_client
 
+# The MCP SDK and its transports are imported when a server is connected, so
+# startup without servers (or --help) does not pay for importing them
+if TYPE_CHECKING:
+    from mcp import ClientSession, Tool
+    from mcp.client.stdio import StdioServerParameters
+
+from .catalog import ToolCatalogCache
+from .lifecycle import ServerLifecycle, is_session_lost
 from .discovery import process_server_paths, process_server_urls, parse_server_configs, auto_discover_servers
-from ..utils.constants import MCP_PROTOCOL_VERSION
-from ..utils.connection import check_url_connectivity
+from ..utils.constants import (
+    MCP_PROTOCOL_VERSION, DEFAULT_CONNECT_CONCURRENCY, DEFAULT_CONNECT_TIMEOUT, DEFAULT_PROBE_TIMEOUT,
+    RECONNECT_MAX_ATTEMPTS, RECONNECT_INITIAL_DELAY, RECONNECT_MAX_DELAY, SESSION_STOP_TIMEOUT,
+    DEFAULT_SERVER_IDLE_TIMEOUT, SERVER_IDLE_CHECK_INTERVAL, DEFAULT_DESCRIPTION_TOKENS,
+    CANCEL_NOTIFICATION_TIMEOUT
+)
+from ..utils.connection import probe_urls, get_probe_result
+from ..tools.schema import compact_schema, truncate_description
 
 class ServerConnector:
     """Manages connections to one or more MCP servers.
@@ -27,19 +40,56 @@ class ServerConnector:
     tools provided by those servers.
     """
 
-    def __init__(self, exit_stack: AsyncExitStack, console: Optional[Console] = None):
+    def __init__(self, exit_stack: AsyncExitStack, console: Optional[Console] = None,
+                 max_concurrency: int = DEFAULT_CONNECT_CONCURRENCY,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 tool_catalog: Optional[ToolCatalogCache] = None, lazy_servers: bool = False,
+                 idle_timeout: float = DEFAULT_SERVER_IDLE_TIMEOUT,
+                 description_tokens: int = DEFAULT_DESCRIPTION_TOKENS):
         """Initialize the ServerConnector.
 
         Args:
             exit_stack: AsyncExitStack to manage server connections
             console: Rich console for output (optional)
+            max_concurrency: Maximum number of servers to connect to at the same time
+            connect_timeout: Seconds allowed for each server to connect and list its tools
+            tool_catalog: On-disk cache of server tool lists, or None to always list tools at startup
+            lazy_servers: Whether stdio servers with cached tools start only when a tool is first called
+            idle_timeout: Seconds a lazy server may stay unused before it is stopped (0 keeps it running)
+            description_tokens: Tokens each description in a tool schema may use (0 keeps them whole)
         """
         self.exit_stack = exit_stack
         self.console = console or Console()
+        self.max_concurrency = max_concurrency
+        self.connect_timeout = connect_timeout
+        self.tool_catalog = tool_catalog
+        self.lazy_servers = lazy_servers
+        self.idle_timeout = idle_timeout
+        self.description_tokens = description_tokens
         self.sessions = {}  # Dict to store multiple sessions
         self.available_tools = []  # List to store all available tools
         self.enabled_tools = {}  # Dict to store tool enabled status
+        self.tools_version = 0  # Incremented whenever available_tools or enabled_tools change
+        self.tool_routes = {}  # Dict mapping qualified tool names to their server, tool as reported and validator
         self.session_ids = {}  # Dict to store session IDs for HTTP connections
+        self.connect_latencies = {}  # Dict to store per-server connect latency in seconds
+        self.probe_latencies = {}  # Dict to store per-server URL probe latency in seconds
+        self.server_configs = {}  # Dict to store the configuration of each connected server
+        self.lifecycles = {}  # Dict mapping server names to the ServerLifecycle owning their connection
+        self.configured_servers = {}  # Dict of all servers found in the configured sources, connected or not
+        self._server_fingerprints = {}  # Dict mapping server names to the fingerprint they were started with
+        self.reconnect_stats = {}  # Dict mapping server names to reconnect counts and downtime in seconds
+        self._reconnect_tasks = {}  # Dict mapping server names to the reconnect in progress
+        self._session_id_getters = {}  # Dict mapping server names to their transport's session ID getter
+        self._resume_session_ids = {}  # Dict mapping server names to an HTTP session ID to resume on connect
+        self._pending_connections = {}  # Dict mapping server names to their background connection task
+        self._refresh_tasks = {}  # Dict mapping server names to a tool list refresh in progress
+        self._warned_no_request_id = False  # Whether the user was told abandoned calls cannot be cancelled
+        self._last_used = {}  # Dict mapping server names to time.monotonic() of their last connect or tool call
+        self._active_calls = {}  # Dict mapping server names to the number of tool calls in progress
+        self._idle_reaper = None  # Task stopping idle lazy servers, started with the first lazy server
+        # Closing the exit stack stops the connections of all servers
+        self.exit_stack.push_async_callback(self._stop_all_servers)
 
     async def connect_to_servers(self, server_paths=None, server_urls=None, config_path=None, auto_discovery=False) -> Tuple[dict, list, dict]:
         """Connect to one or more MCP servers
@@ -53,6 +103,107 @@ class ServerConnector:
         Returns:
             Tuple of (sessions, available_tools, enabled_tools)
         """
+        all_servers = self._collect_servers(server_paths, server_urls, config_path, auto_discovery)
+        self.configured_servers = {server["name"]: server for server in all_servers}
+
+        if not all_servers:
+            self.console.print(Panel(
+                "[yellow]No servers specified or all servers were invalid.[/yellow]\n"
+                "The client will continue without tool support.",
+                title="Warning", border_style="yellow", expand=False
+            ))
+            return self.sessions, self.available_tools, self.enabled_tools
+
+        # Servers with cached tools offer them right away and connect in the background
+        cached_servers = []
+        if self.tool_catalog is not None:
+            for server in all_servers:
+                catalog = self.tool_catalog.get(server["name"], self._catalog_hash(server))
+                if catalog is not None:
+                    cached_servers.append((server, catalog))
+
+        # Lazy servers are only started by their first tool call
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+        for server, catalog in cached_servers:
+            self._register_server(server, None, catalog["tools"])
+            if not self._is_lazy(server):
+                self._pending_connections[server["name"]] = asyncio.create_task(
+                    self._connect_in_background(server, catalog, semaphore)
+                )
+
+        cached_names = {server["name"] for server, _ in cached_servers}
+        await self._connect_and_register([server for server in all_servers if server["name"] not in cached_names])
+        self._sort_tools()
+
+        if not self.sessions:
+            self.console.print(Panel(
+                "[bold red]Could not connect to any MCP servers![/bold red]\n"
+                "Check that server paths exist and are accessible.",
+                title="Error", border_style="red", expand=False
+            ))
+
+        return self.sessions, self.available_tools, self.enabled_tools
+
+    async def reload_servers(self, server_paths=None, server_urls=None, config_path=None, auto_discovery=False) -> Dict[str, List[str]]:
+        """Reload servers, restarting only those whose configuration changed
+
+        Servers are matched by name. Removed servers are disconnected, added
+        servers (including ones that failed to connect before) are connected,
+        and servers whose configuration or script files changed are restarted.
+        The others keep their session and tool selection.
+
+        Args:
+            server_paths: List of paths to server scripts (.py or .js)
+            server_urls: List of URLs for SSE or Streamable HTTP servers
+            config_path: Path to JSON config file with server configurations
+            auto_discovery: Whether to automatically discover servers
+
+        Returns:
+            Dict with the names of the 'added', 'removed', 'restarted' and 'unchanged' servers
+
+        Raises:
+            Exception: If the server configuration file cannot be parsed; running servers are left untouched
+        """
+        new_servers = self._collect_servers(server_paths, server_urls, config_path, auto_discovery, raise_errors=True)
+        new_by_name = {server["name"]: server for server in new_servers}
+
+        removed = [name for name in self.server_configs if name not in new_by_name]
+        added = [name for name in new_by_name if name not in self.server_configs]
+        restarted = [
+            name for name in new_by_name
+            if name in self.server_configs and self._server_fingerprint(new_by_name[name]) != self._server_fingerprints.get(name)
+        ]
+        unchanged = [name for name in new_by_name if name in self.server_configs and name not in restarted]
+
+        # Keep the tool selection of restarted servers for tools they still provide
+        previous_enabled = self._get_server_tool_states(restarted)
+
+        for name in removed + restarted:
+            await self.disconnect_server(name)
+
+        self.configured_servers = new_by_name
+        await self._connect_and_register([new_by_name[name] for name in new_by_name if name not in unchanged])
+        self._restore_tool_states(previous_enabled)
+
+        # List tools in configuration order, as a fresh connection would
+        self._sort_tools()
+
+        return {"added": added, "removed": removed, "restarted": restarted, "unchanged": unchanged}
+
+    def _collect_servers(self, server_paths=None, server_urls=None, config_path=None, auto_discovery=False,
+                         raise_errors: bool = False) -> List[Dict[str, Any]]:
+        """Gather server configurations from all configured sources
+
+        Args:
+            server_paths: List of paths to server scripts (.py or .js)
+            server_urls: List of URLs for SSE or Streamable HTTP servers
+            config_path: Path to JSON config file with server configurations
+            auto_discovery: Whether to automatically discover servers
+            raise_errors: Whether to raise config file errors instead of skipping the file
+
+        Returns:
+            List of server configuration dictionaries
+        """
         all_servers = []
 
         # Process server paths
@@ -72,11 +223,13 @@ class ServerConnector:
         # Process config file
         if config_path:
             try:
-                config_servers = parse_server_configs(config_path)
+                config_servers = parse_server_configs(config_path, raise_errors=raise_errors)
                 for server in config_servers:
                     self.console.print(f"[cyan]Found server in config: {server['name']}[/cyan]")
                 all_servers.extend(config_servers)
             except Exception as e:
+                if raise_errors:
+                    raise
                 self.console.print(f"[red]Error loading server configurations: {str(e)}[/red]")
 
         # Auto-discover servers if enabled
@@ -86,24 +239,32 @@ class ServerConnector:
                 self.console.print(f"[cyan]Auto-discovered server: {server['name']}[/cyan]")
             all_servers.extend(discovered_servers)
 
-        if not all_servers:
-            self.console.print(Panel(
-                "[yellow]No servers specified or all servers were invalid.[/yellow]\n"
-                "The client will continue without tool support.",
-                title="Warning", border_style="yellow", expand=False
-            ))
-            return self.sessions, self.available_tools, self.enabled_tools
+        return all_servers
+
+    async def _connect_and_register(self, servers: List[Dict[str, Any]]) -> None:
+        """Connect to reachable servers and register their tools
 
-        # Check all servers url connectivity
-        servers_to_connect = []
+        Args:
+            servers: List of server configuration dictionaries
+        """
+        # Check the connectivity of all HTTP-based servers at once, within a shared budget
+        http_servers = [
+            server for server in servers
+            if server.get("type") in ["sse", "streamable_http"] and self._get_url_from_server(server)
+        ]
+        probes = await probe_urls(
+            [self._get_url_from_server(server) for server in http_servers],
+            timeout=DEFAULT_PROBE_TIMEOUT,
+            headers={self._get_url_from_server(server): self._get_headers_from_server(server) for server in http_servers},
+        )
         skipped_servers = []
-        for server in all_servers:
-            if server.get("type") in ["sse", "streamable_http"]:
-                if not check_url_connectivity(server.get("url")):
-                    skipped_servers.append(server.get("name"))
-                    continue
-            servers_to_connect.append(server)
-        all_servers = servers_to_connect
+        for server in http_servers:
+            probe = probes[self._get_url_from_server(server)]
+            if probe["reachable"]:
+                self.probe_latencies[server["name"]] = probe["latency"]
+            else:
+                skipped_servers.append(server.get("name"))
+        servers = [server for server in servers if server.get("name") not in skipped_servers]
 
         if skipped_servers:
             self.console.print(
@@ -113,134 +274,995 @@ class ServerConnector:
             "[yellow]Servers must support HTTP or HTTPS protocols.[/yellow]"
             )
 
-        # Connect to each server
-        for server in all_servers:
-            await self._connect_to_server(server)
+        # Connect to all servers concurrently, then register their tools in
+        # the original order so tool listings are stable across runs
+        results = await self._connect_concurrently(servers)
+        for server, result in zip(servers, results):
+            if result is not None:
+                session, tools = result
+                self._register_server(server, session, tools)
+        self._save_catalog()
+
+    async def _connect_in_background(self, server: Dict[str, Any], catalog: Dict[str, Any],
+                                     semaphore: Optional[asyncio.Semaphore] = None) -> None:
+        """Connect a server whose cached tools are already registered
+
+        The server's tools are listed again once it is connected, and replace
+        the cached ones when they differ. Even when the cached tools were used,
+        this is what fills the session's cache of tool output schemas, which
+        it would otherwise list the tools for on the first call. If the server
+        cannot be connected, its tools are removed.
 
-        if not self.sessions:
-            self.console.print(Panel(
-                "[bold red]Could not connect to any MCP servers![/bold red]\n"
-                "Check that server paths exist and are accessible.",
-                title="Error", border_style="red", expand=False
-            ))
+        Args:
+            server: Server configuration dictionary
+            catalog: Dict with the cached 'server_version' and 'tools'
+            semaphore: Semaphore bounding the number of servers connecting at once, if any
+        """
+        server_name = server["name"]
+        # The task stays pending until the tools are settled, so disconnecting
+        # or reloading the server meanwhile cancels it
+        try:
+            async with semaphore or nullcontext():
+                result = await self._connect_to_server(server, cached_catalog=catalog, quiet=True)
+
+            if result is None:
+                # Disconnecting the server would otherwise cancel this task
+                self._forget_pending_connection(server_name)
+                await self.disconnect_server(server_name)
+                self.console.print(f"[red]Removed the cached tools of {server_name} because it could not be connected[/red]")
+                return
+
+            session, tools = result
+            lifecycle = self.lifecycles[server_name]
+            if lifecycle.used_cached_tools:
+                try:
+                    tools = (await session.list_tools()).tools
+                except Exception:
+                    # The cached tools stay valid; the session lists them itself when needed
+                    tools = None
+                if server_name not in self.sessions:
+                    return
+                if tools is None or [tool.model_dump() for tool in tools] == [tool.model_dump() for tool in catalog["tools"]]:
+                    self.sessions[server_name]["session"] = session
+                    return
+                lifecycle.used_cached_tools = False
+
+            # The tools were listed again; only replace them if they differ from the cached ones
+            if [tool.model_dump() for tool in tools] == [tool.model_dump() for tool in catalog["tools"]]:
+                self.sessions[server_name]["session"] = session
+                self.tool_catalog.put(server_name, self._catalog_hash(server), lifecycle.server_version, tools,
+                                      dynamic=lifecycle.dynamic_tools)
+            else:
+                self._replace_server_tools(server, session, tools)
+                self.console.print(f"[yellow]The tools of {server_name} changed since the last run and were updated[/yellow]")
+            self._save_catalog()
+        finally:
+            self._forget_pending_connection(server_name)
 
-        return self.sessions, self.available_tools, self.enabled_tools
+    def _forget_pending_connection(self, server_name: str) -> None:
+        """Remove the current task from the pending background connections
 
-    async def _connect_to_server(self, server: Dict[str, Any]) -> bool:
-        """Connect to a single MCP server
+        A task started later for the same server, e.g. after a reload, is kept.
+
+        Args:
+            server_name: Name of the server
+        """
+        if self._pending_connections.get(server_name) is asyncio.current_task():
+            del self._pending_connections[server_name]
+
+    def is_connecting(self, server_name: str) -> bool:
+        """Check whether a server with cached tools is still connecting in the background
+
+        Args:
+            server_name: Name of the server
+
+        Returns:
+            bool: True if the server's connection is not ready yet
+        """
+        return server_name in self._pending_connections
+
+    async def _wait_for_connection(self, server_name: str) -> None:
+        """Wait until a server connecting in the background is ready
+
+        Args:
+            server_name: Name of the server
+
+        Raises:
+            ConnectionError: If the server could not be connected
+        """
+        if self.is_idle(server_name):
+            self._start_lazy_server(server_name)
+
+        pending = self._pending_connections.get(server_name)
+        if pending is not None:
+            await asyncio.shield(pending)
+        if server_name not in self.sessions:
+            raise ConnectionError(f"Server {server_name} is not connected")
+
+    def is_idle(self, server_name: str) -> bool:
+        """Check whether a lazy server offers its tools but is not running
+
+        Args:
+            server_name: Name of the server
+
+        Returns:
+            bool: True if the server will be started by its next tool call
+        """
+        return (server_name in self.sessions and self.sessions[server_name]["session"] is None
+                and server_name not in self._pending_connections)
+
+    def _is_lazy(self, server: Dict[str, Any]) -> bool:
+        """Check whether a server is started on demand and stopped when idle
+
+        Only stdio servers qualify, as they are local processes that are cheap
+        to start again. The "lazy" setting of a server overrides the default.
 
         Args:
             server: Server configuration dictionary
 
         Returns:
-            bool: True if connection was successful, False otherwise
+            bool: True if the server is lazy
+        """
+        if server.get("type", "script") not in ["script", "config"]:
+            return False
+        return bool(server.get("config", {}).get("lazy", self.lazy_servers))
+
+    def _get_idle_timeout(self, server: Dict[str, Any]) -> float:
+        """Get the seconds a lazy server may stay unused before it is stopped
+
+        Args:
+            server: Server configuration dictionary
+
+        Returns:
+            float: Idle timeout, 0 to keep the server running
+        """
+        return float(server.get("config", {}).get("idleTimeout", self.idle_timeout))
+
+    def _start_lazy_server(self, server_name: str) -> None:
+        """Start an idle lazy server in the background
+
+        Args:
+            server_name: Name of the server
+        """
+        server = self.server_configs[server_name]
+        catalog = self.tool_catalog.get(server_name, self._catalog_hash(server)) if self.tool_catalog else None
+        if catalog is None:
+            # Without a cache entry the tools are listed again and replace the registered ones
+            catalog = {"server_version": None, "dynamic": True, "tools": []}
+        self._pending_connections[server_name] = asyncio.create_task(self._connect_in_background(server, catalog))
+
+    def _ensure_idle_reaper(self) -> None:
+        """Start the task stopping idle lazy servers, if it is not running"""
+        if self._idle_reaper is None or self._idle_reaper.done():
+            self._idle_reaper = asyncio.create_task(self._reap_idle_servers())
+
+    async def _reap_idle_servers(self) -> None:
+        """Periodically stop lazy servers that have been idle too long"""
+        while True:
+            await asyncio.sleep(SERVER_IDLE_CHECK_INTERVAL)
+            await self.stop_idle_servers()
+
+    async def stop_idle_servers(self) -> List[str]:
+        """Stop lazy servers whose idle timeout has passed, keeping their tools
+
+        Returns:
+            List of the names of the servers that were stopped
+        """
+        now = time.monotonic()
+        stopped = []
+        for server_name in list(self.lifecycles):
+            server = self.server_configs.get(server_name)
+            if (server is None or not self._is_lazy(server) or self._active_calls.get(server_name)
+                    or server_name in self._pending_connections or server_name in self._reconnect_tasks):
+                continue
+            idle_timeout = self._get_idle_timeout(server)
+            if idle_timeout > 0 and now - self._last_used.get(server_name, now) >= idle_timeout:
+                lifecycle = self.lifecycles.pop(server_name)
+                await lifecycle.stop(timeout=SESSION_STOP_TIMEOUT)
+                if server_name in self.sessions:
+                    self.sessions[server_name]["session"] = None
+                stopped.append(server_name)
+        return stopped
+
+    def _replace_server_tools(self, server: Dict[str, Any], session: "ClientSession", tools: List["Tool"]) -> None:
+        """Replace the tools registered for a server, keeping the enabled state of tools it still provides
+
+        Args:
+            server: Server configuration dictionary
+            session: Session of the server
+            tools: Tools reported by the server
         """
         server_name = server["name"]
-        self.console.print(f"[cyan]Connecting to server: {server_name}[/cyan]")
+        previous_enabled = self._get_server_tool_states([server_name])
+        old_names = {tool.name for tool in self.sessions.get(server_name, {}).get("tools", [])}
+        self.available_tools[:] = [tool for tool in self.available_tools if tool.name not in old_names]
+        for tool_name in old_names:
+            self.enabled_tools.pop(tool_name, None)
+            self.tool_routes.pop(tool_name, None)
+
+        self._register_server(server, session, tools)
+        self._restore_tool_states(previous_enabled)
+        self._sort_tools()
+
+    async def refresh_server_tools(self, server_name: str) -> None:
+        """List the tools of a connected server again, e.g. after it announced a change
+
+        Args:
+            server_name: Name of the server
+        """
+        session = self.sessions.get(server_name, {}).get("session")
+        lifecycle = self.lifecycles.get(server_name)
+        if session is None or lifecycle is None:
+            return
 
         try:
-            server_type = server.get("type", "script")
-            session = None
-
-            # Connect based on server type
-            if server_type == "sse":
-                # Connect to SSE server
-                url = self._get_url_from_server(server)
-                if not url:
-                    self.console.print(f"[red]Error: SSE server {server_name} missing URL[/red]")
-                    return False
-
-                headers = self._get_headers_from_server(server)
-
-                # Connect using SSE transport
-                sse_transport = await self.exit_stack.enter_async_context(sse_client(url, headers=headers))
-                read_stream, write_stream = sse_transport
-                session = await self.exit_stack.enter_async_context(ClientSession(read_stream, write_stream))
-
-            elif server_type == "streamable_http":
-                # Connect to Streamable HTTP server
-                url = self._get_url_from_server(server)
-                if not url:
-                    self.console.print(f"[red]Error: HTTP server {server_name} missing URL[/red]")
-                    return False
-
-                headers = self._get_headers_from_server(server)
-
-                # Use the streamablehttp_client for Streamable HTTP connections
-                transport = await self.exit_stack.enter_async_context(
-                    streamablehttp_client(url, headers=headers)
-                )
-                read_stream, write_stream, session_info = transport
-                session = await self.exit_stack.enter_async_context(ClientSession(read_stream, write_stream))
+            response = await session.list_tools()
+        except Exception as e:
+            self.console.print(f"[red]Error refreshing the tools of {server_name}: {str(e)}[/red]")
+            return
 
-                # Store session ID if provided
-                if hasattr(session_info, 'session_id') and session_info.session_id:
-                    self.session_ids[server_name] = session_info.session_id
+        # A server that announces changes has a dynamic tool list, which is never trusted from the cache
+        lifecycle.used_cached_tools = False
+        lifecycle.dynamic_tools = True
+        self._replace_server_tools(self.server_configs[server_name], session, response.tools)
+        self._save_catalog()
+        self.console.print(f"[cyan]The tools of {server_name} changed: {len(response.tools)} tools available[/cyan]")
 
-            elif server_type == "script":
-                # Connect to script-based server using STDIO
-                server_params = self._create_script_params(server)
-                if server_params is None:
-                    return False
+    def _make_message_handler(self, server_name: str) -> Callable[[Any], Awaitable[None]]:
+        """Create the handler for messages a server sends outside of requests
 
-                stdio_transport = await self.exit_stack.enter_async_context(stdio_client(server_params))
-                read_stream, write_stream = stdio_transport
-                session = await self.exit_stack.enter_async_context(ClientSession(read_stream, write_stream))
+        Args:
+            server_name: Name of the server
 
-            else:
-                # Connect to config-based server using STDIO
-                server_params = self._create_config_params(server)
-                if server_params is None:
-                    return False
-
-                stdio_transport = await self.exit_stack.enter_async_context(stdio_client(server_params))
-                read_stream, write_stream = stdio_transport
-                session = await self.exit_stack.enter_async_context(ClientSession(read_stream, write_stream))
-
-            # Initialize the session
-            await session.initialize()
-
-            # Store the session
-            self.sessions[server_name] = {
-                "session": session,
-                "tools": []
-            }
+        Returns:
+            Coroutine function refreshing the server's tools when it announces a change
+        """
+        async def handle_message(message: Any) -> None:
+            from mcp import types
 
-            # Get tools from this server
-            response = await session.list_tools()
+            if isinstance(message, types.ServerNotification) and isinstance(message.root, types.ToolListChangedNotification):
+                # The session is busy receiving, so list the tools from a separate task
+                if server_name not in self._refresh_tasks:
+                    task = asyncio.create_task(self.refresh_server_tools(server_name))
+                    self._refresh_tasks[server_name] = task
+                    task.add_done_callback(lambda _: self._refresh_tasks.pop(server_name, None))
 
-            # Store and merge tools, prepending server name to avoid conflicts
-            server_tools = []
-            for tool in response.tools:
-                # Create a qualified name for the tool that includes the server
-                qualified_name = f"{server_name}.{tool.name}"
-                # Clone the tool but update the name
-                tool_copy = Tool(
-                    name=qualified_name,
-                    description=f"[{server_name}] {tool.description}" if hasattr(tool, 'description') else f"Tool from {server_name}",
-                    inputSchema=tool.inputSchema,
-                    outputSchema=tool.outputSchema if hasattr(tool, 'outputSchema') else None
-                )
-                server_tools.append(tool_copy)
-                self.enabled_tools[qualified_name] = True
+        return handle_message
 
-            self.sessions[server_name]["tools"] = server_tools
-            self.available_tools.extend(server_tools)
+    def _catalog_hash(self, server: Dict[str, Any]) -> str:
+        """Get the hash identifying a server's configuration in the tool catalog
 
-            self.console.print(f"[green]Successfully connected to {server_name} with {len(server_tools)} tools[/green]")
-            return True
+        Args:
+            server: Server configuration dictionary
+
+        Returns:
+            str: Hash of the server's fingerprint
+        """
+        return ToolCatalogCache.config_hash(self._server_fingerprint(server))
+
+    def _save_catalog(self) -> None:
+        """Write the tool catalog to disk, if enabled"""
+        if self.tool_catalog is not None:
+            self.tool_catalog.save()
+
+    async def _connect_concurrently(self, servers: List[Dict[str, Any]]) -> List[Optional[Tuple["ClientSession", List["Tool"]]]]:
+        """Connect to several servers at once, bounded by the concurrency cap
+
+        Args:
+            servers: List of server configuration dictionaries
 
+        Returns:
+            List with a (session, tools) tuple or None for each server, in input order
+        """
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+
+        async def connect_with_limit(server: Dict[str, Any]):
+            async with semaphore:
+                return await self._connect_to_server(server)
+
+        return await asyncio.gather(*(connect_with_limit(server) for server in servers))
+
+    async def _connect_to_server(self, server: Dict[str, Any], cached_catalog: Optional[Dict[str, Any]] = None,
+                                 quiet: bool = False) -> Optional[Tuple["ClientSession", List["Tool"]]]:
+        """Connect to a single MCP server
+
+        Args:
+            server: Server configuration dictionary
+            cached_catalog: Cached 'server_version' and 'tools' to use if the server version matches
+            quiet: Whether to only print errors, e.g. when connecting in the background
+
+        Returns:
+            Tuple of (session, tools) if connection was successful, None otherwise
+        """
+        server_name = server["name"]
+        if not quiet:
+            self.console.print(f"[cyan]Connecting to server: {server_name}[/cyan]")
+
+        start_time = time.perf_counter()
+        lifecycle = ServerLifecycle(server, self._open_session, cached_catalog=cached_catalog)
+
+        try:
+            result = await lifecycle.start(self.connect_timeout)
+        except asyncio.TimeoutError:
+            self.console.print(f"[red]Error connecting to {server_name}: Timed out after {self.connect_timeout:g}s[/red]")
+            return None
         except FileNotFoundError as e:
             self.console.print(f"[red]Error connecting to {server_name}: File not found - {str(e)}[/red]")
-            return False
+            return None
         except PermissionError:
             self.console.print(f"[red]Error connecting to {server_name}: Permission denied[/red]")
-            return False
+            return None
         except Exception as e:
             self.console.print(f"[red]Error connecting to {server_name}: {str(e)}[/red]")
+            return None
+
+        if result is None:
+            return None
+
+        latency = time.perf_counter() - start_time
+        self.connect_latencies[server_name] = latency
+        self.lifecycles[server_name] = lifecycle
+        self._last_used[server_name] = time.monotonic()
+        if self._is_lazy(server) and self._get_idle_timeout(server) > 0:
+            self._ensure_idle_reaper()
+
+        # Streamable HTTP servers assign a session ID during initialization
+        get_session_id = self._session_id_getters.pop(server_name, None)
+        if get_session_id is not None and get_session_id():
+            self.session_ids[server_name] = get_session_id()
+
+        session, tools = result
+        if not quiet:
+            self.console.print(f"[green]Successfully connected to {server_name} with {len(tools)} tools in {latency:.2f}s[/green]")
+        return result
+
+    async def call_tool(self, server_name: str, tool_name: str, tool_args: Dict[str, Any]) -> Any:
+        """Call a tool on a server, reconnecting if its session was lost
+
+        When the session turns out to be gone, the server is reconnected with
+        backoff. The call is then retried once if the tool is idempotent;
+        otherwise it may already have had an effect, so the error is raised.
+
+        Args:
+            server_name: Name of the server providing the tool
+            tool_name: Name of the tool on that server (without server prefix)
+            tool_args: Arguments for the tool
+
+        Returns:
+            The CallToolResult returned by the server
+
+        Raises:
+            ConnectionError: If the session was lost and the call could not be completed
+        """
+        await self._wait_for_connection(server_name)
+        self._active_calls[server_name] = self._active_calls.get(server_name, 0) + 1
+        try:
+            return await self._call_tool_with_reconnect(server_name, tool_name, tool_args)
+        finally:
+            self._active_calls[server_name] -= 1
+            self._last_used[server_name] = time.monotonic()
+
+    async def _call_tool_with_reconnect(self, server_name: str, tool_name: str, tool_args: Dict[str, Any]) -> Any:
+        """Call a tool on a connected server, reconnecting if its session was lost
+
+        Args:
+            server_name: Name of the server providing the tool
+            tool_name: Name of the tool on that server (without server prefix)
+            tool_args: Arguments for the tool
+
+        Returns:
+            The CallToolResult returned by the server
+
+        Raises:
+            ConnectionError: If the session was lost and the call could not be completed
+        """
+        session = self.sessions[server_name]["session"]
+        lifecycle = self.lifecycles.get(server_name)
+        if lifecycle is not None and not lifecycle.running:
+            # The connection ended on its own; nothing was sent yet, so reconnect first
+            if not await self.reconnect_server(server_name, session):
+                raise ConnectionError(f"Lost the connection to server {server_name} and could not reconnect")
+            session = self.sessions[server_name]["session"]
+
+        try:
+            return await self._call_session_tool(server_name, session, tool_name, tool_args)
+        except Exception as e:
+            if not is_session_lost(e) or server_name not in self.sessions:
+                raise
+            if not await self.reconnect_server(server_name, session):
+                raise ConnectionError(f"Lost the connection to server {server_name} and could not reconnect") from e
+            if not self.is_idempotent(server_name, tool_name):
+                raise ConnectionError(
+                    f"Lost the connection to server {server_name} during the call. The server was reconnected, "
+                    f"but {tool_name} was not retried because it is not marked idempotent"
+                ) from e
+
+        return await self._call_session_tool(server_name, self.sessions[server_name]["session"], tool_name, tool_args)
+
+    async def _call_session_tool(self, server_name: str, session: "ClientSession", tool_name: str,
+                                 tool_args: Dict[str, Any]) -> Any:
+        """Call a tool on a session, failing if the server's connection ends during the call
+
+        A transport that fails (for example an HTTP server that went away) ends
+        the connection task without answering pending requests, so the call is
+        raced against the end of that task. When the call is cancelled (it timed
+        out or the user interrupted it), the server is told to stop the request;
+        the session stays usable.
+
+        Args:
+            server_name: Name of the server
+            session: Session to call the tool on
+            tool_name: Name of the tool on that server (without server prefix)
+            tool_args: Arguments for the tool
+
+        Returns:
+            The CallToolResult returned by the server
+
+        Raises:
+            ConnectionError: If the connection ended before the call completed
+        """
+        request_ids = []
+
+        async def send_call() -> Any:
+            # The session numbers the request before it first waits, so the id
+            # read here is the id of this call
+            request_ids.append(self._next_request_id(session))
+            return await session.call_tool(tool_name, tool_args)
+
+        lifecycle = self.lifecycles.get(server_name)
+        call = asyncio.ensure_future(send_call())
+        closed = asyncio.ensure_future(lifecycle.wait_closed()) if lifecycle is not None else None
+        try:
+            await asyncio.wait({call, closed} if closed else {call}, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            if not call.done() and request_ids and request_ids[0] is not None:
+                call.cancel()
+                await self._notify_cancelled(session, request_ids[0])
+            raise
+        finally:
+            if closed is not None:
+                closed.cancel()
+            if not call.done():
+                call.cancel()
+        if call.done() and not call.cancelled():
+            return call.result()
+        raise ConnectionError(f"The connection to server {server_name} closed during the call")
+
+    def _next_request_id(self, session: "ClientSession") -> Optional[int]:
+        """Get the id the session will give its next request
+
+        The MCP SDK neither exposes the id of a request nor tells the server
+        when a request is abandoned, so the id is read from the session's
+        request counter (ClientSession._request_id in mcp 1.12).
+
+        Args:
+            session: Session about to send a request
+
+        Returns:
+            The request id, or None if the SDK no longer has the counter
+        """
+        request_id = getattr(session, "_request_id", None)
+        if isinstance(request_id, int):
+            return request_id
+        if not self._warned_no_request_id:
+            self._warned_no_request_id = True
+            self.console.print("[yellow]Warning: This MCP SDK version does not expose request ids, so servers "
+                               "are not told to stop tool calls that time out or are cancelled[/yellow]")
+        return None
+
+    @staticmethod
+    async def _notify_cancelled(session: "ClientSession", request_id: int) -> None:
+        """Tell a server that the client no longer waits for a request
+
+        Args:
+            session: Session the request was sent on
+            request_id: Id of the abandoned request
+        """
+        from mcp import types
+
+        notification = types.ClientNotification(types.CancelledNotification(
+            method="notifications/cancelled",
+            params=types.CancelledNotificationParams(requestId=request_id, reason="Cancelled by the client")
+        ))
+        try:
+            await asyncio.wait_for(session.send_notification(notification), CANCEL_NOTIFICATION_TIMEOUT)
+        except Exception:
+            # The server may be gone or stuck; the request is abandoned either way
+            pass
+
+    def is_idempotent(self, server_name: str, tool_name: str) -> bool:
+        """Check whether a tool can safely be called again after a lost connection
+
+        The server's "idempotentTools" setting takes precedence; otherwise tools
+        annotated as idempotent or read-only qualify.
+
+        Args:
+            server_name: Name of the server providing the tool
+            tool_name: Name of the tool on that server (without server prefix)
+
+        Returns:
+            bool: True if the call may be retried
+        """
+        configured = self.get_server_setting(server_name, "idempotentTools")
+        if configured is not None:
+            return tool_name in configured
+
+        annotations = self.get_tool_annotations(server_name, tool_name)
+        return bool(annotations and (annotations.idempotentHint or annotations.readOnlyHint))
+
+    def is_read_only(self, server_name: str, tool_name: str) -> bool:
+        """Check whether a tool is annotated as not modifying its environment
+
+        Args:
+            server_name: Name of the server providing the tool
+            tool_name: Name of the tool on that server (without server prefix)
+
+        Returns:
+            bool: True if the tool has a readOnlyHint annotation
+        """
+        annotations = self.get_tool_annotations(server_name, tool_name)
+        return bool(annotations and annotations.readOnlyHint)
+
+    def get_tool_annotations(self, server_name: str, tool_name: str) -> Any:
+        """Get the MCP annotations a server reported for one of its tools
+
+        Args:
+            server_name: Name of the server providing the tool
+            tool_name: Name of the tool on that server (without server prefix)
+
+        Returns:
+            The tool's ToolAnnotations, or None if it has none or is unknown
+        """
+        route = self.tool_routes.get(f"{server_name}.{tool_name}")
+        return getattr(route["tool"], "annotations", None) if route else None
+
+    def get_tool_route(self, qualified_name: str) -> Optional[Dict[str, Any]]:
+        """Look up the server providing a tool
+
+        Server names may contain dots, so qualified names are looked up
+        rather than split.
+
+        Args:
+            qualified_name: Tool name with server prefix, as offered to the model
+
+        Returns:
+            Dict with 'server_name', 'tool_name' (without prefix), 'tool' (as reported by the server)
+            and 'validator', or None if no connected server provides the tool
+        """
+        return self.tool_routes.get(qualified_name)
+
+    @staticmethod
+    def _compile_validator(schema: Any) -> Any:
+        """Create the validator checking tool arguments against a tool's input schema
+
+        The schema itself is not checked against its meta-schema, which would
+        slow down connecting to servers with many tools; a schema the validator
+        cannot handle disables validation for the tool on first use.
+
+        Args:
+            schema: The tool's input schema as reported by the server
+
+        Returns:
+            A jsonschema validator, or None if there is no schema
+        """
+        from jsonschema import validators
+
+        if not isinstance(schema, dict):
+            return None
+        validator_class = validators.validator_for(schema, default=validators.Draft202012Validator)
+        return validator_class(schema)
+
+    def validate_tool_arguments(self, qualified_name: str, tool_args: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Check tool arguments against the tool's input schema before calling it
+
+        Args:
+            qualified_name: Tool name with server prefix
+            tool_args: Arguments the model passed
+
+        Returns:
+            Description of the first problem found, or None if the arguments are valid
+        """
+        from jsonschema.exceptions import best_match
+
+        route = self.tool_routes.get(qualified_name)
+        if route is None or route["validator"] is None:
+            return None
+        try:
+            error = best_match(route["validator"].iter_errors(tool_args or {}))
+        except Exception:
+            # Invalid schema or unresolvable reference: leave validation to the server
+            route["validator"] = None
+            return None
+        if error is None:
+            return None
+        location = "/".join(str(part) for part in error.absolute_path)
+        return f"{error.message} (at '{location}')" if location else error.message
+
+    async def reconnect_server(self, server_name: str, failed_session: Any = None) -> bool:
+        """Reconnect a server whose session was lost
+
+        Concurrent callers share one reconnect. If the session that failed has
+        already been replaced, nothing is done.
+
+        Args:
+            server_name: Name of the server
+            failed_session: The session that was found to be lost, if known
+
+        Returns:
+            bool: True if the server is connected afterwards
+        """
+        current = self.sessions.get(server_name, {}).get("session")
+        if failed_session is not None and current is not failed_session:
+            return current is not None
+
+        task = self._reconnect_tasks.get(server_name)
+        if task is None:
+            task = asyncio.create_task(self._reconnect_with_backoff(server_name))
+            self._reconnect_tasks[server_name] = task
+            task.add_done_callback(lambda _: self._reconnect_tasks.pop(server_name, None))
+        return await asyncio.shield(task)
+
+    async def _reconnect_with_backoff(self, server_name: str) -> bool:
+        """Replace a lost session, retrying with exponential backoff
+
+        Streamable HTTP servers are first asked to resume their previous
+        session. If every attempt fails, the server is disconnected and its
+        tools are removed.
+
+        Args:
+            server_name: Name of the server
+
+        Returns:
+            bool: True if the server was reconnected
+        """
+        server = self.server_configs[server_name]
+        stats = self.reconnect_stats.setdefault(
+            server_name, {"reconnects": 0, "failed_reconnects": 0, "downtime": 0.0, "last_error": None}
+        )
+        down_since = time.monotonic()
+        self.console.print(f"[yellow]Lost the connection to server {server_name}, reconnecting...[/yellow]")
+
+        # Mark the HTTP session for resumption first, so stopping the old connection keeps it
+        session_id = self.session_ids.get(server_name)
+        if session_id:
+            self._resume_session_ids[server_name] = session_id
+
+        lifecycle = self.lifecycles.pop(server_name, None)
+        if lifecycle is not None:
+            await lifecycle.stop(timeout=SESSION_STOP_TIMEOUT)
+
+        result = None
+        if session_id:
+            result = await self._connect_to_server(server)
+            self._resume_session_ids.pop(server_name, None)
+
+        delay = RECONNECT_INITIAL_DELAY
+        for attempt in range(RECONNECT_MAX_ATTEMPTS):
+            if result is not None:
+                break
+            if attempt:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+            result = await self._connect_to_server(server)
+
+        stats["downtime"] += time.monotonic() - down_since
+        if result is None:
+            stats["failed_reconnects"] += 1
+            stats["last_error"] = f"Could not reconnect after {RECONNECT_MAX_ATTEMPTS} attempts"
+            await self.disconnect_server(server_name)
+            self.console.print(
+                f"[red]Could not reconnect to {server_name}; its tools were removed. "
+                f"Use connect-server {server_name} to try again.[/red]"
+            )
             return False
 
-    def _create_script_params(self, server: Dict[str, Any]) -> Optional[StdioServerParameters]:
+        self.sessions[server_name]["session"] = result[0]
+        stats["reconnects"] += 1
+        return True
+
+    async def _terminate_http_session(self, server_name: str, url: str, headers: Dict[str, str],
+                                      get_session_id: Callable[[], Optional[str]]) -> None:
+        """Ask a Streamable HTTP server to end a session, unless it is kept for a reconnect
+
+        Args:
+            server_name: Name of the server
+            url: URL of the server
+            headers: Headers used for the connection
+            get_session_id: Getter for the session ID assigned by the server
+        """
+        session_id = get_session_id()
+        if not session_id or server_name in self._resume_session_ids:
+            return
+
+        import httpx
+        try:
+            async with httpx.AsyncClient(timeout=DEFAULT_PROBE_TIMEOUT) as client:
+                await client.delete(url, headers={**headers, "mcp-session-id": session_id})
+        except Exception:
+            # The server is gone or does not support ending sessions
+            pass
+
+    async def _stop_all_servers(self) -> None:
+        """Stop the connections of all servers"""
+        for task in list(self._reconnect_tasks.values()):
+            task.cancel()
+        # Cancelled background connections close what they had opened
+        background_tasks = list(self._pending_connections.values()) + list(self._refresh_tasks.values())
+        if self._idle_reaper is not None:
+            background_tasks.append(self._idle_reaper)
+            self._idle_reaper = None
+        for task in background_tasks:
+            task.cancel()
+        await asyncio.gather(*background_tasks, return_exceptions=True)
+        lifecycles = list(self.lifecycles.values())
+        self.lifecycles.clear()
+        await asyncio.gather(*(lifecycle.stop() for lifecycle in lifecycles))
+
+    async def connect_server(self, server_name: str) -> bool:
+        """Connect a configured server that is not currently connected
+
+        Args:
+            server_name: Name of the server, as found in the configured sources
+
+        Returns:
+            bool: True if the server is connected afterwards
+        """
+        if server_name in self.sessions:
+            self.console.print(f"[yellow]Server {server_name} is already connected[/yellow]")
+            return True
+        server = self.configured_servers.get(server_name)
+        if server is None:
+            self.console.print(f"[red]Unknown server: {server_name}[/red]")
+            return False
+
+        await self._connect_and_register([server])
+        self._sort_tools()
+        return server_name in self.sessions
+
+    async def disconnect_server(self, server_name: str) -> bool:
+        """Disconnect a single server and remove its session and tools
+
+        The server stays configured, so it can be connected again later.
+
+        Args:
+            server_name: Name of the server to disconnect
+
+        Returns:
+            bool: True if the server was connected
+        """
+        pending = self._pending_connections.pop(server_name, None)
+        if pending is not None:
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+
+        lifecycle = self.lifecycles.pop(server_name, None)
+        if lifecycle is not None:
+            await lifecycle.stop()
+
+        connected = server_name in self.sessions
+        server_tools = self.sessions.pop(server_name, {}).get("tools", [])
+        tool_names = {tool.name for tool in server_tools}
+        self.available_tools[:] = [tool for tool in self.available_tools if tool.name not in tool_names]
+        for tool_name in tool_names:
+            self.enabled_tools.pop(tool_name, None)
+            self.tool_routes.pop(tool_name, None)
+        self.tools_version += 1
+        for state in (self.session_ids, self.connect_latencies, self.probe_latencies, self.server_configs,
+                      self._server_fingerprints, self._last_used):
+            state.pop(server_name, None)
+        return connected
+
+    async def restart_server(self, server_name: str) -> bool:
+        """Restart a single server, keeping the enabled state of its tools
+
+        Args:
+            server_name: Name of the server to restart
+
+        Returns:
+            bool: True if the server is connected afterwards
+        """
+        if server_name not in self.configured_servers:
+            self.console.print(f"[red]Unknown server: {server_name}[/red]")
+            return False
+
+        previous_enabled = self._get_server_tool_states([server_name])
+        await self.disconnect_server(server_name)
+        connected = await self.connect_server(server_name)
+        self._restore_tool_states(previous_enabled)
+        return connected
+
+    def _get_server_tool_states(self, server_names: List[str]) -> Dict[str, bool]:
+        """Get the enabled state of the tools of some servers
+
+        Args:
+            server_names: Names of the servers
+
+        Returns:
+            Dict mapping qualified tool names to enabled status
+        """
+        return {
+            tool_name: enabled for tool_name, enabled in self.enabled_tools.items()
+            if tool_name in self.tool_routes and self.tool_routes[tool_name]["server_name"] in server_names
+        }
+
+    def _restore_tool_states(self, tool_states: Dict[str, bool]) -> None:
+        """Restore enabled states for tools that still exist
+
+        Args:
+            tool_states: Dict mapping qualified tool names to enabled status
+        """
+        for tool_name, enabled in tool_states.items():
+            if tool_name in self.enabled_tools:
+                self.enabled_tools[tool_name] = enabled
+        self.tools_version += 1
+
+    def _sort_tools(self) -> None:
+        """Order the available tools by the configuration order of their servers"""
+        order = {name: index for index, name in enumerate(self.configured_servers)}
+        self.available_tools.sort(key=lambda tool: order.get(self.tool_routes[tool.name]["server_name"], len(order)))
+        self.tools_version += 1
+
+    async def _open_session(self, server: Dict[str, Any], exit_stack: AsyncExitStack) -> Optional["ClientSession"]:
+        """Open the transport for a server and create its client session
+
+        Args:
+            server: Server configuration dictionary
+            exit_stack: Exit stack that will own the transport and session
+
+        Returns:
+            ClientSession, or None if the server configuration is invalid
+        """
+        from mcp import ClientSession
+
+        server_name = server["name"]
+        server_type = server.get("type", "script")
+        message_handler = self._make_message_handler(server_name)
+
+        # Connect based on server type, importing only the transport it needs
+        if server_type == "sse":
+            # Connect to SSE server
+            url = self._get_url_from_server(server)
+            if not url:
+                self.console.print(f"[red]Error: SSE server {server_name} missing URL[/red]")
+                return None
+
+            headers = self._get_headers_from_server(server)
+            self._check_probe(url)
+
+            # Connect using SSE transport
+            from mcp.client.sse import sse_client
+            sse_transport = await exit_stack.enter_async_context(sse_client(url, headers=headers))
+            read_stream, write_stream = sse_transport
+            return await exit_stack.enter_async_context(
+                ClientSession(read_stream, write_stream, message_handler=message_handler)
+            )
+
+        elif server_type == "streamable_http":
+            # Connect to Streamable HTTP server
+            url = self._get_url_from_server(server)
+            if not url:
+                self.console.print(f"[red]Error: HTTP server {server_name} missing URL[/red]")
+                return None
+
+            headers = self._get_headers_from_server(server)
+            self._check_probe(url)
+
+            # Resume the previous session when reconnecting, if the server still knows it
+            resume_session_id = self._resume_session_ids.pop(server_name, None)
+            if resume_session_id:
+                headers["mcp-session-id"] = resume_session_id
+
+            # Use the streamablehttp_client for Streamable HTTP connections
+            from mcp.client.streamable_http import streamablehttp_client
+            transport = await exit_stack.enter_async_context(
+                streamablehttp_client(url, headers=headers, terminate_on_close=False)
+            )
+            read_stream, write_stream, get_session_id = transport
+            # Terminate the session on close ourselves, so it can be kept when reconnecting
+            exit_stack.push_async_callback(self._terminate_http_session, server_name, url, headers, get_session_id)
+            session = await exit_stack.enter_async_context(
+                ClientSession(read_stream, write_stream, message_handler=message_handler)
+            )
+
+            # The session ID is only known once the session is initialized
+            self._session_id_getters[server_name] = get_session_id
+
+            return session
+
+        elif server_type == "script":
+            # Connect to script-based server using STDIO
+            server_params = self._create_script_params(server)
+        else:
+            # Connect to config-based server using STDIO
+            server_params = self._create_config_params(server)
+
+        if server_params is None:
+            return None
+
+        from mcp.client.stdio import stdio_client
+        stdio_transport = await exit_stack.enter_async_context(stdio_client(server_params))
+        read_stream, write_stream = stdio_transport
+        return await exit_stack.enter_async_context(
+            ClientSession(read_stream, write_stream, message_handler=message_handler)
+        )
+
+    def _register_server(self, server: Dict[str, Any], session: "ClientSession", tools: List["Tool"]) -> None:
+        """Store a connected session and merge its tools into the available tools
+
+        Args:
+            server: Server configuration dictionary
+            session: Initialized client session for the server, or None while it connects in the background
+            tools: Tools reported by the server
+        """
+        from mcp import Tool
+
+        server_name = server["name"]
+        self.server_configs[server_name] = server
+        self._server_fingerprints[server_name] = self._server_fingerprint(server)
+
+        # Schemas are compacted before they are offered to the model, unless the server opts out
+        compact = bool(self.get_server_setting(server_name, "compactSchemas", True))
+        description_tokens = int(self.get_server_setting(server_name, "descriptionTokens", self.description_tokens))
+
+        # Store and merge tools, prepending server name to avoid conflicts
+        server_tools = []
+        for tool in tools:
+            # Create a qualified name for the tool that includes the server
+            qualified_name = f"{server_name}.{tool.name}"
+            description = getattr(tool, 'description', None)
+            if compact:
+                description = truncate_description(description, description_tokens)
+            # Clone the tool but update the name
+            tool_copy = Tool(
+                name=qualified_name,
+                description=f"[{server_name}] {description}" if hasattr(tool, 'description') else f"Tool from {server_name}",
+                inputSchema=compact_schema(tool.inputSchema, description_tokens) if compact else tool.inputSchema,
+                outputSchema=tool.outputSchema if hasattr(tool, 'outputSchema') else None,
+                annotations=getattr(tool, 'annotations', None)
+            )
+            server_tools.append(tool_copy)
+            self.tool_routes[qualified_name] = {
+                "server_name": server_name,
+                "tool_name": tool.name,
+                "tool": tool,
+                "validator": self._compile_validator(tool.inputSchema),
+            }
+            self.enabled_tools[qualified_name] = True
+
+        # Store the session
+        self.sessions[server_name] = {
+            "session": session,
+            "tools": server_tools
+        }
+        self.available_tools.extend(server_tools)
+        self.tools_version += 1
+
+        # Remember freshly listed tools for the next startup
+        lifecycle = self.lifecycles.get(server_name)
+        if self.tool_catalog is not None and lifecycle is not None and not lifecycle.used_cached_tools:
+            self.tool_catalog.put(server_name, self._catalog_hash(server), lifecycle.server_version, tools,
+                                  dynamic=lifecycle.dynamic_tools)
+
+    def _server_fingerprint(self, server: Dict[str, Any]) -> Tuple[str, Tuple[float, ...]]:
+        """Identify a server's configuration and the version of its script files
+
+        Modification times of the script path and of arguments that name existing
+        files are included, so editing a server's code also counts as a change.
+
+        Args:
+            server: Server configuration dictionary
+
+        Returns:
+            Tuple of the serialized configuration and the file modification times
+        """
+        paths = [server.get("path")] + list(server.get("config", {}).get("args", []))
+        mtimes = []
+        for path in paths:
+            if isinstance(path, str) and os.path.isfile(path):
+                mtimes.append(os.path.getmtime(path))
+        return json.dumps(server, sort_keys=True, default=str), tuple(mtimes)
+
+    def _create_script_params(self, server: Dict[str, Any]) -> Optional["StdioServerParameters"]:
         """Create server parameters for a script-type server
 
         Args:
@@ -264,13 +1286,14 @@ class ServerConnector:
             self.console.print(f"[yellow]Warning: Command '{command}' not found in PATH. Skipping server {server['name']}.[/yellow]")
             return None
 
+        from mcp.client.stdio import StdioServerParameters
         return StdioServerParameters(
             command=command,
             args=[path],
             env=None
         )
 
-    def _create_config_params(self, server: Dict[str, Any]) -> Optional[StdioServerParameters]:
+    def _create_config_params(self, server: Dict[str, Any]) -> Optional["StdioServerParameters"]:
         """Create server parameters for a config-type server
 
         Args:
@@ -298,6 +1321,7 @@ class ServerConnector:
             self.console.print(f"[yellow]Skipping server '{server['name']}'[/yellow]")
             return None
 
+        from mcp.client.stdio import StdioServerParameters
         return StdioServerParameters(
             command=command,
             args=fixed_args,
@@ -346,7 +1370,21 @@ class ServerConnector:
         """
         return self.sessions
 
-    def get_available_tools(self) -> List[Tool]:
+    def get_server_setting(self, server_name: str, key: str, default: Any = None) -> Any:
+        """Get an optional per-server setting from the server's JSON configuration
+
+        Args:
+            server_name: Name of the server
+            key: Setting name as written in the servers JSON (e.g. "maxConcurrentCalls")
+            default: Value returned when the server does not define the setting
+
+        Returns:
+            The configured value or the default
+        """
+        server = self.server_configs.get(server_name, {})
+        return server.get("config", {}).get(key, default)
+
+    def get_available_tools(self) -> List["Tool"]:
         """Get the available tools from all connected servers
 
         Returns:
@@ -371,16 +1409,32 @@ class ServerConnector:
         """
         if tool_name in self.enabled_tools:
             self.enabled_tools[tool_name] = enabled
+            self.tools_version += 1
 
     def enable_all_tools(self):
         """Enable all available tools"""
         for tool_name in self.enabled_tools:
             self.enabled_tools[tool_name] = True
+        self.tools_version += 1
 
     def disable_all_tools(self):
         """Disable all available tools"""
         for tool_name in self.enabled_tools:
             self.enabled_tools[tool_name] = False
+        self.tools_version += 1
+
+    def _check_probe(self, url: str) -> None:
+        """Fail fast if a recent probe found a URL unreachable
+
+        Args:
+            url: Server URL about to be connected to
+
+        Raises:
+            ConnectionError: If the URL was unreachable when last probed
+        """
+        probe = get_probe_result(url)
+        if probe is not None and not probe["reachable"]:
+            raise ConnectionError(f"{url} was unreachable when probed")
 
     def _get_url_from_server(self, server: Dict[str, Any]) -> Optional[str]:
         """Extract URL from server configuration.
@@ -410,11 +1464,11 @@ class ServerConnector:
             Dictionary of headers
         """
         # Try to get headers directly from server dict
-        headers = server.get("headers", {})
+        headers = dict(server.get("headers", {}))
 
         # If not there, try the config subdict
         if not headers and "config" in server:
-            headers = server["config"].get("headers", {})
+            headers = dict(server["config"].get("headers", {}))
 
         # Always add MCP Protocol Version header for HTTP connections
         server_type = server.get("type", "script")
@@ -430,9 +1484,16 @@ class ServerConnector:
 
         # Create a new exit stack for future connections
         self.exit_stack = AsyncExitStack()
+        self.exit_stack.push_async_callback(self._stop_all_servers)
 
         # Clear all state
         self.sessions.clear()
         self.available_tools.clear()
         self.enabled_tools.clear()
+        self.tool_routes.clear()
+        self.tools_version += 1
         self.session_ids.clear()
+        self.connect_latencies.clear()
+        self.probe_latencies.clear()
+        self.server_configs.clear()
+        self._server_fingerprints.clear()
@@ -86,11 +86,12 @@ def process_server_urls(server_urls) -> List[Dict[str, Any]]:
 
     return all_servers
 
-def parse_server_configs(config_path: str) -> List[Dict[str, Any]]:
+def parse_server_configs(config_path: str, raise_errors: bool = False) -> List[Dict[str, Any]]:
     """Parse and validate server configurations from a file.
 
     Args:
         config_path: Path to JSON config file
+        raise_errors: Whether to raise errors reading the file instead of returning no servers
 
     Returns:
         List of valid server configurations ready to be connected to
@@ -139,6 +140,8 @@ def parse_server_configs(config_path: str) -> List[Dict[str, Any]]:
         return all_servers
 
     except Exception as e:
+        if raise_errors:
+            raise
         # Return empty list on error
         return []
 
@@ -0,0 +1,174 @@
+"""Lifecycle of a single MCP server connection.
+
+The MCP transports are built on anyio task groups, which must be entered and
+exited from the same task. Each server therefore runs in its own task holding
+its own exit stack, so it can be connected, stopped and restarted without
+touching the other servers.
+
+Classes:
+    ServerLifecycle: Owns the transport and session of one server.
+
+Functions:
+    is_session_lost: Tells whether an error means the connection to a server is gone.
+"""
+import asyncio
+import time
+from contextlib import AsyncExitStack
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from mcp import ClientSession, Tool
+
+# JSON-RPC error codes the MCP client reports for a closed connection or an
+# HTTP session the server no longer knows (CONNECTION_CLOSED and the streamable
+# HTTP "Session terminated" error)
+SESSION_LOST_ERROR_CODES = {-32000, 32600}
+
+
+def is_session_lost(error: BaseException) -> bool:
+    """Check whether an error means the session with a server is gone
+
+    Args:
+        error: Exception raised by a session call
+
+    Returns:
+        bool: True for closed streams, broken connections and terminated sessions
+    """
+    import anyio
+    from mcp.shared.exceptions import McpError
+
+    if isinstance(error, (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream, ConnectionError)):
+        return True
+    if isinstance(error, McpError):
+        return error.error.code in SESSION_LOST_ERROR_CODES
+    return False
+
+
+class ServerLifecycle:
+    """Runs the connection of one server in a dedicated task
+
+    The task opens the transport and session in its own exit stack, reports
+    the session and tools once they are ready, and keeps the connection open
+    until stop() is called. When cached tools are given, the server reports the
+    version they were cached for and its tool list is not dynamic, they are
+    used instead of listing the tools again.
+    """
+
+    def __init__(self, server: Dict[str, Any],
+                 open_session: Callable[[Dict[str, Any], AsyncExitStack], Awaitable[Optional["ClientSession"]]],
+                 cached_catalog: Optional[Dict[str, Any]] = None):
+        """Initialize the ServerLifecycle.
+
+        Args:
+            server: Server configuration dictionary
+            open_session: Coroutine function opening the transport and session in an exit stack
+            cached_catalog: Dict with the 'server_version' and 'tools' cached from a previous run
+        """
+        self.server = server
+        self.name = server["name"]
+        self.open_session = open_session
+        self.cached_catalog = cached_catalog
+        self.session: Optional["ClientSession"] = None
+        self.started_at: Optional[float] = None  # time.monotonic() when the session became ready
+        self.server_version: Optional[str] = None  # Server name and version reported by initialize
+        self.used_cached_tools = False  # Whether the tools came from the cached catalog
+        self.dynamic_tools = False  # Whether the server's tool list can change while it runs
+        self._task: Optional[asyncio.Task] = None
+        self._stop_event = asyncio.Event()
+
+    @property
+    def running(self) -> bool:
+        """Whether the task owning the connection is alive"""
+        return self._task is not None and not self._task.done()
+
+    async def start(self, timeout: float) -> Optional[Tuple["ClientSession", List["Tool"]]]:
+        """Connect to the server and list its tools
+
+        Args:
+            timeout: Seconds allowed to open the transport, initialize and list tools
+
+        Returns:
+            Tuple of (session, tools), or None if the server configuration is invalid
+
+        Raises:
+            asyncio.TimeoutError: If the server did not become ready in time
+            Exception: Any error raised while connecting
+        """
+        ready = asyncio.get_running_loop().create_future()
+        self._stop_event = asyncio.Event()
+        self._task = asyncio.create_task(self._run(ready))
+
+        try:
+            result = await asyncio.wait_for(asyncio.shield(ready), timeout=timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            # Do not leave a half-opened connection behind
+            ready.cancel()
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            raise
+
+        if result is not None:
+            self.session = result[0]
+            self.started_at = time.monotonic()
+        return result
+
+    async def stop(self, timeout: Optional[float] = None) -> None:
+        """Close the session and transport and wait for the task to finish
+
+        Args:
+            timeout: Seconds to wait for a clean shutdown before cancelling the task, or None to wait
+        """
+        if self._task is None:
+            return
+        self._stop_event.set()
+        done, _ = await asyncio.wait([self._task], timeout=timeout)
+        if not done:
+            # A broken transport may never finish closing on its own
+            self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        self.session = None
+
+    async def wait_closed(self) -> None:
+        """Wait until the connection ends, whether stopped or broken"""
+        if self._task is not None:
+            await asyncio.wait([self._task])
+
+    async def _run(self, ready: asyncio.Future) -> None:
+        """Own the transport and session until asked to stop
+
+        Args:
+            ready: Future resolved with (session, tools), None, or the connection error
+        """
+        try:
+            async with AsyncExitStack() as stack:
+                session = await self.open_session(self.server, stack)
+                if session is None:
+                    ready.set_result(None)
+                    return
+
+                # Initialize the session and get tools from this server
+                init_result = await session.initialize()
+                server_info = getattr(init_result, "serverInfo", None)
+                if server_info is not None:
+                    self.server_version = f"{server_info.name} {server_info.version}"
+                tools_capability = getattr(getattr(init_result, "capabilities", None), "tools", None)
+                self.dynamic_tools = bool(tools_capability and tools_capability.listChanged)
+
+                if (self.cached_catalog is not None and self.server_version is not None
+                        and self.cached_catalog.get("server_version") == self.server_version
+                        and not self.cached_catalog.get("dynamic") and not self.dynamic_tools):
+                    tools = self.cached_catalog["tools"]
+                    self.used_cached_tools = True
+                else:
+                    tools = (await session.list_tools()).tools
+
+                ready.set_result((session, tools))
+                await self._stop_event.wait()
+        except asyncio.CancelledError:
+            if not ready.done():
+                ready.cancel()
+            raise
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
@@ -0,0 +1,117 @@
+"""Tool result caching for MCP Client for Ollama.
+
+Models often repeat a read-only call with the same arguments within a session,
+for example the same search or fetch. This module keeps recent tool results in
+memory so such calls are answered without another round trip to the server.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from ..utils.constants import DEFAULT_TOOL_CACHE_SIZE
+
+
+class ToolResultCache:
+    """LRU cache of tool results with a time-to-live per entry.
+
+    Entries are keyed by the qualified tool name and the canonical JSON of the
+    arguments, so argument order and formatting do not matter.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_TOOL_CACHE_SIZE):
+        """Initialize the ToolResultCache.
+
+        Args:
+            max_entries: Number of results kept before the least recently used is dropped
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()  # Key -> (expiry, result)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0  # Entries dropped to stay within max_entries
+
+    @staticmethod
+    def make_key(qualified_name: str, tool_args: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+        """Build the cache key of a tool call.
+
+        Args:
+            qualified_name: Tool name with server prefix (e.g. "server.tool")
+            tool_args: Arguments of the call
+
+        Returns:
+            Tuple of the qualified name and the canonical JSON of the arguments
+        """
+        canonical_args = json.dumps(tool_args or {}, sort_keys=True, separators=(",", ":"),
+                                    ensure_ascii=False, default=str)
+        return qualified_name, canonical_args
+
+    def get(self, key: Tuple[str, str]) -> Optional[Any]:
+        """Get a cached result, counting a hit or a miss.
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            The cached result, or None if there is none or it expired
+        """
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() >= entry[0]:
+            del self._entries[key]
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: Tuple[str, str], result: Any, ttl: float) -> None:
+        """Store a result.
+
+        Args:
+            key: Key from make_key
+            result: Result to cache
+            ttl: Seconds the result stays valid
+        """
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate_servers(self, server_names: Iterable[str]) -> None:
+        """Drop the cached results of some servers, e.g. after they were restarted.
+
+        Args:
+            server_names: Names of the servers
+        """
+        prefixes = tuple(f"{server_name}." for server_name in server_names)
+        if not prefixes:
+            return
+        for key in [key for key in self._entries if key[0].startswith(prefixes)]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the cache statistics.
+
+        Returns:
+            Dict with entries, hits, misses, evictions and hit_rate keys
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,261 @@
+"""Tool execution for MCP Client for Ollama.
+
+This module dispatches the tool calls requested by the model to their MCP
+servers, running calls that target different servers concurrently. Results of
+cacheable tools are answered from a ToolResultCache when possible. Calls that
+time out, outlast the query's deadline or are cancelled by the user are
+answered with a structured error result, so the model can carry on without
+the tool.
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .cache import ToolResultCache
+from ..utils.constants import DEFAULT_MAX_CALLS_PER_SERVER, DEFAULT_TOOL_CACHE_TTL, DEFAULT_TOOL_CALL_TIMEOUT
+
+
+def make_error_result(error: str, server_name: str, tool_name: str, message: str, **details: Any) -> Any:
+    """Build the result returned to the model for a call that did not complete
+
+    Args:
+        error: Kind of error, e.g. "timeout" or "cancelled"
+        server_name: Name of the server providing the tool
+        tool_name: Name of the tool on that server (without server prefix)
+        message: Explanation for the model
+        **details: Further fields to include, e.g. the timeout in seconds
+
+    Returns:
+        CallToolResult with isError set and the error as JSON text
+    """
+    from mcp import types
+
+    payload = {"error": error, "tool": f"{server_name}.{tool_name}", **details, "message": message}
+    return types.CallToolResult(content=[types.TextContent(type="text", text=json.dumps(payload))], isError=True)
+
+
+class ToolExecutor:
+    """Executes tool calls on connected MCP servers.
+
+    Calls are dispatched together with asyncio.gather. Each server has its own
+    concurrency limit, so independent calls to different servers overlap while
+    calls to the same server are throttled to what the server allows. Every
+    call has a timeout, and calls in flight can be cancelled with cancel_calls().
+    """
+
+    def __init__(self, server_connector, max_calls_per_server: int = DEFAULT_MAX_CALLS_PER_SERVER,
+                 result_cache: Optional[ToolResultCache] = None,
+                 call_timeout: Optional[float] = DEFAULT_TOOL_CALL_TIMEOUT):
+        """Initialize the ToolExecutor.
+
+        Args:
+            server_connector: Server connector holding the server sessions
+            max_calls_per_server: Default number of simultaneous calls per server
+            result_cache: Cache for tool results (a new one is created if not given)
+            call_timeout: Default seconds a call may take, or None (or 0) to wait indefinitely
+        """
+        self.server_connector = server_connector
+        self.max_calls_per_server = max_calls_per_server
+        self.result_cache = result_cache if result_cache is not None else ToolResultCache()
+        self.call_timeout = call_timeout
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._in_flight: Set[asyncio.Future] = set()  # Calls started by execute() that have not finished
+        self._cancelled: Set[asyncio.Future] = set()  # Calls cancelled with cancel_calls()
+
+    def _get_semaphore(self, server_name: str) -> asyncio.Semaphore:
+        """Get the semaphore limiting concurrent calls to a server.
+
+        Args:
+            server_name: Name of the server
+
+        Returns:
+            asyncio.Semaphore for the server
+        """
+        if server_name not in self._semaphores:
+            limit = self.server_connector.get_server_setting(
+                server_name, "maxConcurrentCalls", self.max_calls_per_server
+            )
+            self._semaphores[server_name] = asyncio.Semaphore(max(1, int(limit)))
+        return self._semaphores[server_name]
+
+    def get_cache_ttl(self, server_name: str, tool_name: str) -> float:
+        """Get how long results of a tool may be cached.
+
+        A TTL set for the tool in the server's "cacheTtl" setting wins; otherwise
+        tools annotated as read-only are cached for the default TTL and other
+        tools are not cached.
+
+        Args:
+            server_name: Name of the server providing the tool
+            tool_name: Name of the tool on that server (without server prefix)
+
+        Returns:
+            float: Seconds to cache results, 0 to not cache them
+        """
+        configured = self.server_connector.get_server_setting(server_name, "cacheTtl", {})
+        if tool_name in configured:
+            return float(configured[tool_name])
+        if self.server_connector.is_read_only(server_name, tool_name):
+            return DEFAULT_TOOL_CACHE_TTL
+        return 0.0
+
+    def get_call_timeout(self, server_name: str, tool_name: str) -> Optional[float]:
+        """Get how long a call to a tool may take.
+
+        A timeout set for the tool in the server's "toolTimeouts" setting wins
+        over the server's "toolTimeout", which wins over the default. Calls
+        have no timeout unless one of these is set.
+
+        Args:
+            server_name: Name of the server providing the tool
+            tool_name: Name of the tool on that server (without server prefix)
+
+        Returns:
+            Seconds to wait for the result, or None to wait indefinitely
+        """
+        configured = self.server_connector.get_server_setting(server_name, "toolTimeouts", {})
+        timeout = configured.get(tool_name) if tool_name in configured else self.server_connector.get_server_setting(
+            server_name, "toolTimeout", self.call_timeout
+        )
+        return float(timeout) if timeout else None
+
+    async def call_tool(self, server_name: str, tool_name: str, tool_args: Dict[str, Any],
+                        deadline: Optional[float] = None) -> Any:
+        """Call a single tool, respecting the server's concurrency limit.
+
+        Cacheable tools are answered from the result cache when possible. Lost
+        sessions are reconnected by the server connector. A call that does not
+        finish within its timeout, or before the deadline, is abandoned and
+        answered with an error result, as is a call whose connection was lost
+        and could not be retried.
+
+        Args:
+            server_name: Name of the server providing the tool
+            tool_name: Name of the tool on that server (without server prefix)
+            tool_args: Arguments for the tool
+            deadline: time.monotonic() value by which the query's tool calls must finish
+
+        Returns:
+            The CallToolResult returned by the server, or an error result
+        """
+        ttl = self.get_cache_ttl(server_name, tool_name)
+        if ttl > 0:
+            key = self.result_cache.make_key(f"{server_name}.{tool_name}", tool_args)
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                return cached
+
+        async with self._get_semaphore(server_name):
+            timeout = self.get_call_timeout(server_name, tool_name)
+            limited_by_deadline = False
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return make_error_result(
+                        "deadline_exceeded", server_name, tool_name,
+                        "The time budget for this query ran out before the tool could be called. "
+                        "Answer with the information you already have."
+                    )
+                if timeout is None or remaining < timeout:
+                    timeout, limited_by_deadline = remaining, True
+
+            try:
+                result = await asyncio.wait_for(
+                    self.server_connector.call_tool(server_name, tool_name, tool_args), timeout
+                )
+            except asyncio.TimeoutError:
+                if limited_by_deadline:
+                    return make_error_result(
+                        "deadline_exceeded", server_name, tool_name,
+                        "The time budget for this query ran out while the tool was running, so the call "
+                        "was abandoned. Answer with the information you already have."
+                    )
+                return make_error_result(
+                    "timeout", server_name, tool_name,
+                    f"The tool did not respond within {timeout:g} seconds, so the call was abandoned. "
+                    "Try again with a simpler request, or answer without this tool.",
+                    timeoutSeconds=timeout
+                )
+            except ConnectionError as e:
+                # The server connector already reconnected and retried what it safely could
+                return make_error_result(
+                    "connection_lost", server_name, tool_name,
+                    f"{e}. It is unknown whether the call had an effect, so check before calling "
+                    "the tool again."
+                )
+
+        # Errors may be transient, so only successful results are cached
+        if ttl > 0 and not getattr(result, "isError", False):
+            self.result_cache.put(key, result, ttl)
+        return result
+
+    async def execute(self, calls: List[Tuple[str, str, Dict[str, Any]]],
+                      deadline: Optional[float] = None) -> List[Any]:
+        """Execute several tool calls concurrently.
+
+        Every call is allowed to finish before an error is raised, so a failing
+        call never leaves other calls running in the background. Calls cancelled
+        with cancel_calls() are answered with an error result.
+
+        Args:
+            calls: List of (server_name, tool_name, tool_args) tuples
+            deadline: time.monotonic() value by which the calls must finish
+
+        Returns:
+            List of CallToolResult objects in the same order as the calls
+        """
+        tasks = [
+            asyncio.ensure_future(self.call_tool(server_name, tool_name, tool_args, deadline))
+            for server_name, tool_name, tool_args in calls
+        ]
+        self._in_flight.update(tasks)
+        try:
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            cancelled = [task in self._cancelled for task in tasks]
+        finally:
+            self._in_flight.difference_update(tasks)
+            self._cancelled.difference_update(tasks)
+
+        for index, (server_name, tool_name, _) in enumerate(calls):
+            if cancelled[index] and isinstance(results[index], asyncio.CancelledError):
+                results[index] = make_error_result(
+                    "cancelled", server_name, tool_name,
+                    "The user cancelled the call before it finished. Do not call the tool again "
+                    "unless the user asks for it."
+                )
+            elif isinstance(results[index], BaseException):
+                raise results[index]
+
+        return results
+
+    def cancel_calls(self) -> int:
+        """Cancel the calls started by execute() that are still running.
+
+        The calls are abandoned on the client and the servers are told to stop
+        them; their sessions stay connected.
+
+        Returns:
+            int: Number of calls cancelled
+        """
+        running = [task for task in self._in_flight if not task.done()]
+        for task in running:
+            self._cancelled.add(task)
+            task.cancel()
+        return len(running)
+
+    def reset(self, server_names: Optional[Iterable[str]] = None) -> None:
+        """Forget per-server limits and cached results, e.g. after the servers have been reloaded.
+
+        Args:
+            server_names: Servers whose limits and results to forget, or None for all servers
+        """
+        if server_names is None:
+            self._semaphores.clear()
+            self.result_cache.clear()
+            return
+        server_names = list(server_names)
+        for server_name in server_names:
+            self._semaphores.pop(server_name, None)
+        self.result_cache.invalidate_servers(server_names)
@@ -4,8 +4,7 @@ This module handles enabling, disabling, and selecting tools from MCP servers.
 """
 
 import json
-from typing import Dict, List, Optional, Tuple, Callable
-from mcp import Tool
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Callable
 from rich.console import Console
 from rich.columns import Columns
 from rich.panel import Panel
@@ -13,11 +12,20 @@ from rich.prompt import Prompt
 from rich.text import Text
 from rich.syntax import Syntax
 
+from ..utils.prompt_prefix import canonicalize_schema
+from .schema import estimate_tokens
+
+if TYPE_CHECKING:
+    from mcp import Tool
+
 class ToolManager:
     """Manages MCP tools.
 
     This class handles enabling and disabling tools, selecting tools through
-    an interactive interface, and organizing tools by server.
+    an interactive interface, and organizing tools by server. The enabled tools,
+    a name index and the Ollama tool definitions are computed once per version
+    of the tool state, which changes whenever tools or their status change here
+    or in the server connector.
     """
 
     def __init__(self, console: Optional[Console] = None, server_connector=None):
@@ -31,14 +39,19 @@ class ToolManager:
         self.available_tools = []
         self.enabled_tools = {}
         self.server_connector = server_connector
+        self._version = 0  # Incremented whenever the tools or their enabled status change here
+        self._cache: Dict[Any, Any] = {}  # Values derived from the tool state, valid for _cache_version
+        self._cache_version: Optional[Tuple[int, int]] = None
+        self._compiled: Dict[Tuple[str, bool], Tuple["Tool", Any, str]] = {}  # (name, canonical) -> (tool, definition, JSON)
 
-    def set_available_tools(self, tools: List[Tool]) -> None:
+    def set_available_tools(self, tools: List["Tool"]) -> None:
         """Set the available tools.
 
         Args:
             tools: List of available tools
         """
         self.available_tools = tools
+        self._invalidate()
 
     def set_enabled_tools(self, enabled_tools: Dict[str, bool]) -> None:
         """Set the enabled status of tools.
@@ -47,11 +60,37 @@ class ToolManager:
             enabled_tools: Dictionary mapping tool names to enabled status
         """
         self.enabled_tools = enabled_tools
+        self._invalidate()
 
         # Notify server connector of tool status changes
         self._notify_server_connector_batch(enabled_tools)
 
     # Helper methods for common operations
+    def _invalidate(self) -> None:
+        """Mark the derived tool state as outdated after a change."""
+        self._version += 1
+
+    @property
+    def version(self) -> Tuple[int, int]:
+        """Version of the tool state, changing whenever tools or their status change.
+
+        Returns:
+            Tuple of this manager's version and the server connector's tools version
+        """
+        return self._version, getattr(self.server_connector, "tools_version", 0)
+
+    def _get_cache(self) -> Dict[Any, Any]:
+        """Get the values derived from the current tool state, dropping outdated ones.
+
+        Returns:
+            Dict of memoized values for the current version
+        """
+        version = self.version
+        if version != self._cache_version:
+            self._cache = {}
+            self._cache_version = version
+        return self._cache
+
     def _notify_server_connector(self, tool_name: str, enabled: bool) -> None:
         """Notify the server connector of a tool status change.
 
@@ -93,7 +132,7 @@ class ToolManager:
         return "[green]✓[/green]" if enabled else "[red]✗[/red]"
 
     # Rest of the original methods with improvements
-    def get_available_tools(self) -> List[Tool]:
+    def get_available_tools(self) -> List["Tool"]:
         """Get the list of available tools.
 
         Returns:
@@ -113,6 +152,7 @@ class ToolManager:
         """Enable all available tools."""
         for tool in self.available_tools:
             self.enabled_tools[tool.name] = True
+        self._invalidate()
 
         # Also update the server connector if available
         if self.server_connector:
@@ -125,6 +165,7 @@ class ToolManager:
         for tool in self.available_tools:
             self.enabled_tools[tool.name] = False
             tool_status_updates[tool.name] = False
+        self._invalidate()
 
         # Notify server connector of all changes at once
         self._notify_server_connector_batch(tool_status_updates)
@@ -138,6 +179,7 @@ class ToolManager:
         """
         if tool_name in self.enabled_tools:
             self.enabled_tools[tool_name] = enabled
+            self._invalidate()
             self._notify_server_connector(tool_name, enabled)
 
     def display_available_tools(self) -> None:
@@ -168,8 +210,8 @@ class ToolManager:
         self.console.print(Panel("[bold]Available Servers and Tools[/bold]",
                                  border_style="blue", expand=False))
 
-    def _display_server_tools(self, server_name: str, server_idx: int, server_tools: List[Tool],
-                             show_descriptions: bool, index_to_tool: Dict[int, Tool],
+    def _display_server_tools(self, server_name: str, server_idx: int, server_tools: List["Tool"],
+                             show_descriptions: bool, index_to_tool: Dict[int, "Tool"],
                              tool_index: int) -> int:
         """Display tools for a specific server and update the tool index.
 
@@ -263,7 +305,7 @@ class ToolManager:
         self.console.print("• [bold]s[/bold] or [bold]save[/bold] - Save changes and return")
         self.console.print("• [bold]q[/bold] or [bold]quit[/bold] - Cancel and return")
 
-    def _process_server_toggle(self, selection: str, sorted_servers: List[Tuple[str, List[Tool]]],
+    def _process_server_toggle(self, selection: str, sorted_servers: List[Tuple[str, List["Tool"]]],
                               clear_console_func: Optional[Callable]) -> Tuple[Optional[str], str]:
         """Process a server toggle command.
 
@@ -288,6 +330,7 @@ class ToolManager:
             for tool in server_tools:
                 self.enabled_tools[tool.name] = new_state
                 tool_updates[tool.name] = new_state
+            self._invalidate()
 
             # Notify server connector of all changes
             self._notify_server_connector_batch(tool_updates)
@@ -303,7 +346,7 @@ class ToolManager:
             message = f"[red]Invalid server number: S{server_idx+1}. Must be between S1 and S{len(sorted_servers)}[/red]"
             return message, 'red'
 
-    def _process_tool_selection(self, selection: str, index_to_tool: Dict[int, Tool],
+    def _process_tool_selection(self, selection: str, index_to_tool: Dict[int, "Tool"],
                                clear_console_func: Optional[Callable]) -> Tuple[Optional[str], str]:
         """Process tool selection command.
 
@@ -352,6 +395,7 @@ class ToolManager:
                     toggled_tools_count += 1
                 else:
                     invalid_indices.append(idx)
+            self._invalidate()
 
             # Notify server connector of all changes
             self._notify_server_connector_batch(tool_updates)
@@ -387,7 +431,11 @@ class ToolManager:
         # Group tools by server
         servers = {}
         for tool in self.available_tools:
-            server_name, tool_name = tool.name.split('.', 1) if '.' in tool.name else ("default", tool.name)
+            route = self.server_connector.get_tool_route(tool.name) if self.server_connector else None
+            if route is not None:
+                server_name = route["server_name"]
+            else:
+                server_name = tool.name.split('.', 1)[0] if '.' in tool.name else "default"
             if server_name not in servers:
                 servers[server_name] = []
             servers[server_name].append(tool)
@@ -430,8 +478,11 @@ class ToolManager:
                 return
 
             if selection in ['q', 'quit']:
-                # Restore original tool states
-                self.enabled_tools = original_states.copy()
+                # Restore original tool states, in the dictionary shared with the server connector
+                self.enabled_tools.clear()
+                self.enabled_tools.update(original_states)
+                self._invalidate()
+                self._notify_server_connector_batch(original_states)
                 self._clear_console(clear_console_func)
                 return
 
@@ -474,13 +525,101 @@ class ToolManager:
                 selection, index_to_tool, clear_console_func
             )
 
-    def get_enabled_tool_objects(self) -> List[Tool]:
+    def get_enabled_tool_objects(self) -> List["Tool"]:
         """Get a list of the Tool objects that are enabled.
 
+        The list is shared until the tool state changes and must not be modified.
+
         Returns:
             List[Tool]: List of enabled tool objects
         """
-        return [tool for tool in self.available_tools if self.enabled_tools.get(tool.name, False)]
+        cache = self._get_cache()
+        if "enabled" not in cache:
+            cache["enabled"] = [tool for tool in self.available_tools if self.enabled_tools.get(tool.name, False)]
+        return cache["enabled"]
+
+    def _get_index(self) -> Dict[str, "Tool"]:
+        """Get the available tools by qualified name.
+
+        Returns:
+            Dict mapping qualified tool names to tools
+        """
+        cache = self._get_cache()
+        if "index" not in cache:
+            cache["index"] = {tool.name: tool for tool in self.available_tools}
+            # Forget compiled definitions of tools that are gone or were replaced
+            self._compiled = {
+                key: entry for key, entry in self._compiled.items() if cache["index"].get(key[0]) is entry[0]
+            }
+        return cache["index"]
+
+    def get_tool(self, tool_name: str) -> Optional["Tool"]:
+        """Look up an available tool by its qualified name.
+
+        Args:
+            tool_name: Tool name with server prefix (e.g. "server.tool")
+
+        Returns:
+            The tool, or None if no server provides it
+        """
+        return self._get_index().get(tool_name)
+
+    def _compile_tool(self, tool: "Tool", canonical: bool) -> Tuple[Any, str]:
+        """Get the Ollama definition of a tool and its JSON, compiling it on first use.
+
+        Args:
+            tool: Tool to compile
+            canonical: Whether the schema keys are sorted for a stable prompt prefix
+
+        Returns:
+            Tuple of the validated ollama.Tool and its serialized JSON
+        """
+        entry = self._compiled.get((tool.name, canonical))
+        if entry is None or entry[0] is not tool:
+            import ollama
+
+            definition = ollama.Tool.model_validate({
+                "type": "function",
+                "function": {
+                    "name": tool.name,
+                    "description": tool.description,
+                    "parameters": canonicalize_schema(tool.inputSchema) if canonical else tool.inputSchema
+                }
+            })
+            entry = (tool, definition, json.dumps(definition.model_dump(exclude_none=True), default=str))
+            self._compiled[(tool.name, canonical)] = entry
+        return entry[1], entry[2]
+
+    def get_tool_payload(self, canonical: bool = False,
+                         tools: Optional[List["Tool"]] = None) -> Tuple[List[Any], str]:
+        """Get the tool definitions sent to Ollama.
+
+        The payload of all enabled tools is built once per version of the tool
+        state; payloads of other tool lists reuse the compiled definitions.
+
+        Args:
+            canonical: Sort tools by name and schema keys so the serialized payload is stable
+            tools: Tools to include, or None for all enabled tools
+
+        Returns:
+            Tuple of the validated ollama.Tool objects and their serialized JSON ("" without tools)
+        """
+        cache = self._get_cache()
+        key = ("payload", canonical)
+        if tools is None and key in cache:
+            return cache[key]
+
+        self._get_index()  # Builds the index for this version, pruning outdated compiled definitions
+        selected = self.get_enabled_tool_objects() if tools is None else tools
+        if canonical:
+            selected = sorted(selected, key=lambda tool: tool.name)
+        compiled = [self._compile_tool(tool, canonical) for tool in selected]
+        # Joined like json.dumps joins list items, so the JSON matches serializing the whole list
+        payload = ([definition for definition, _ in compiled],
+                   f"[{', '.join(tool_json for _, tool_json in compiled)}]" if compiled else "")
+        if tools is None:
+            cache[key] = payload
+        return payload
 
     def set_server_connector(self, server_connector):
         """Set the server connector to notify of tool state changes.
@@ -500,10 +639,21 @@ class ToolManager:
 
         self.console.print(Panel("[bold]🔍 Tool Schema Debug Information[/bold]", border_style="cyan"))
 
+        # Schemas are compacted when servers connect; compare with the tools as the servers reported them
+        total_before = total_after = 0
+
         for tool in enabled_tools:
+            route = self.server_connector.get_tool_route(tool.name) if self.server_connector else None
+            original = route["tool"] if route else tool
+            tokens_before = estimate_tokens(original.description or "") + estimate_tokens(original.inputSchema)
+            tokens_after = estimate_tokens(tool.description or "") + estimate_tokens(tool.inputSchema)
+            total_before += tokens_before
+            total_after += tokens_after
+
             # Tool header
             tool_panel = Panel(
-                f"{tool.description or 'No description'}",
+                f"{tool.description or 'No description'}\n\n"
+                f"[dim]Estimated tokens: ~{tokens_before} as reported → ~{tokens_after} sent to the model[/dim]",
                 title=f"{tool.name} Info",
                 border_style="green",
                 padding=(1, 1)
@@ -529,3 +679,9 @@ class ToolManager:
                 self.console.print(error_panel)
 
             self.console.print()  # Add spacing between tools
+
+        saved = 1 - total_after / total_before if total_before else 0.0
+        self.console.print(
+            f"[cyan]Estimated tokens of {len(enabled_tools)} enabled tools: ~{total_before} as reported → "
+            f"~{total_after} sent to the model ({saved:.0%} saved)[/cyan]"
+        )
@@ -0,0 +1,165 @@
+"""Relevance-based tool selection for MCP Client for Ollama.
+
+With many servers connected, the definitions of all enabled tools can take up
+a large part of the prompt and make it harder for small models to pick the
+right tool. This module ranks the tools against the user's query with a local
+BM25 index over their names, descriptions and parameter names, so only the
+most relevant tools are offered to the model.
+
+Classes:
+    ToolRouter: Selects the tools offered to the model for a query.
+
+Functions:
+    tokenize: Split text into lowercase search terms.
+"""
+import math
+import re
+from collections import Counter
+from fnmatch import fnmatchcase
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from ..utils.constants import DEFAULT_TOOL_ROUTER_TOP_K
+
+if TYPE_CHECKING:
+    from mcp import Tool
+
+# Words too common to tell tools apart
+STOP_WORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "for", "from", "how", "i", "if", "in", "is",
+    "it", "me", "my", "of", "on", "or", "please", "that", "the", "this", "to", "use", "what", "with", "you",
+})
+
+# BM25 term frequency saturation and document length normalization
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase search terms
+
+    Identifiers are split on underscores, dashes, dots and camelCase, so
+    "readFile" and "read_file" both match a query for "read file".
+
+    Args:
+        text: Text to split
+
+    Returns:
+        List of terms, without stop words
+    """
+    if not text:
+        return []
+    terms = re.findall(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+", text)
+    return [term for term in (term.lower() for term in terms) if term not in STOP_WORDS]
+
+
+class ToolRouter:
+    """Ranks tools against a query with BM25 and picks the top matches
+
+    The index is rebuilt only when the set of tools changes. Tools matching an
+    always-include pattern are offered for every query.
+    """
+
+    def __init__(self, top_k: int = DEFAULT_TOOL_ROUTER_TOP_K, always_include: Optional[Iterable[str]] = None):
+        """Initialize the ToolRouter.
+
+        Args:
+            top_k: Number of best matching tools offered per query
+            always_include: Qualified tool names or patterns (e.g. "filesystem.*") always offered
+        """
+        self.top_k = top_k
+        self.always_include = list(always_include or [])
+        self._signature: Optional[Tuple[Any, ...]] = None  # Tools (or tool state version) the index was built for
+        self._term_frequencies: Dict[str, Counter] = {}  # Tool name -> term counts
+        self._lengths: Dict[str, int] = {}  # Tool name -> number of terms
+        self._document_frequencies: Counter = Counter()  # Term -> number of tools containing it
+        self._average_length = 0.0
+
+    @staticmethod
+    def _document_terms(tool: "Tool") -> List[str]:
+        """Get the indexed terms of a tool
+
+        Args:
+            tool: Tool to index
+
+        Returns:
+            List of terms from the name (counted twice), description and parameter names
+        """
+        name_terms = tokenize(tool.name)
+        properties = (tool.inputSchema or {}).get("properties") or {}
+        parameter_terms = [term for name in properties for term in tokenize(name)]
+        return name_terms * 2 + tokenize(tool.description) + parameter_terms
+
+    def index(self, tools: List["Tool"], version: Optional[Any] = None) -> None:
+        """Build the index for a set of tools, unless it was built for the same tools
+
+        Args:
+            tools: Tools to index
+            version: Version of the tool state the tools belong to; compared instead of the tools themselves
+        """
+        signature = ("version", version) if version is not None else tuple(
+            (tool.name, tool.description) for tool in tools
+        )
+        if signature == self._signature:
+            return
+
+        self._term_frequencies = {tool.name: Counter(self._document_terms(tool)) for tool in tools}
+        self._lengths = {name: sum(counts.values()) for name, counts in self._term_frequencies.items()}
+        self._document_frequencies = Counter(
+            term for counts in self._term_frequencies.values() for term in counts
+        )
+        self._average_length = sum(self._lengths.values()) / len(self._lengths) if self._lengths else 0.0
+        self._signature = signature
+
+    def score(self, query: str) -> Dict[str, float]:
+        """Score the indexed tools against a query
+
+        Args:
+            query: Text of the query
+
+        Returns:
+            Dict mapping tool names to their BM25 score
+        """
+        query_terms = set(tokenize(query))
+        tool_count = len(self._term_frequencies)
+        scores = {}
+        for name, counts in self._term_frequencies.items():
+            length_norm = 1 - BM25_B + BM25_B * self._lengths[name] / (self._average_length or 1)
+            score = 0.0
+            for term in query_terms:
+                frequency = counts.get(term)
+                if not frequency:
+                    continue
+                document_frequency = self._document_frequencies[term]
+                idf = math.log(1 + (tool_count - document_frequency + 0.5) / (document_frequency + 0.5))
+                score += idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * length_norm)
+            scores[name] = score
+        return scores
+
+    def is_always_included(self, tool_name: str) -> bool:
+        """Check whether a tool is offered regardless of the query
+
+        Args:
+            tool_name: Qualified tool name
+
+        Returns:
+            bool: True if the tool matches an always-include name or pattern
+        """
+        return any(fnmatchcase(tool_name, pattern) for pattern in self.always_include)
+
+    def select(self, query: str, tools: List["Tool"], version: Optional[Any] = None) -> List["Tool"]:
+        """Select the tools to offer for a query
+
+        Args:
+            query: Text of the query
+            tools: Enabled tools to choose from
+            version: Version of the tool state the tools belong to, if known
+
+        Returns:
+            The always-included tools and the top_k best matching tools, in their original order
+        """
+        self.index(tools, version)
+        scores = self.score(query)
+        ranked = sorted((tool for tool in tools if scores.get(tool.name, 0.0) > 0),
+                        key=lambda tool: scores[tool.name], reverse=True)
+        selected = {tool.name for tool in ranked[:max(0, self.top_k)]}
+        return [tool for tool in tools if tool.name in selected or self.is_always_included(tool.name)]
@@ -0,0 +1,140 @@
+"""Compaction of tool input schemas for MCP Client for Ollama.
+
+MCP servers often describe their tools with verbose JSON Schemas: titles,
+examples, `$defs` referenced through `$ref`, and long descriptions. All of it
+is sent to the model with every request. This module rewrites a schema into
+an equivalent, smaller one: local references are inlined, keys that do not
+change what arguments are valid are removed, and descriptions are shortened
+to a token budget.
+
+Functions:
+    compact_schema: Build the compact form of a tool input schema.
+    truncate_description: Shorten a description to a token budget.
+    estimate_tokens: Estimate the number of tokens of a JSON value.
+"""
+import json
+from typing import Any, Dict, List, Optional
+
+from ..utils.constants import DEFAULT_CHARS_PER_TOKEN
+
+# Keys that document a schema without constraining the arguments
+NON_SEMANTIC_KEYS = frozenset({"title", "examples", "example", "$schema", "$id", "$comment", "$defs", "definitions"})
+
+# Keys whose value maps names to subschemas, and keys holding a subschema or a list of them
+SCHEMA_MAP_KEYS = frozenset({"properties", "patternProperties", "dependentSchemas"})
+SCHEMA_KEYS = frozenset({
+    "items", "additionalItems", "additionalProperties", "unevaluatedItems", "unevaluatedProperties",
+    "contains", "propertyNames", "not", "if", "then", "else",
+})
+SCHEMA_LIST_KEYS = frozenset({"anyOf", "oneOf", "allOf", "prefixItems"})
+
+
+def estimate_tokens(value: Any) -> int:
+    """Estimate the number of tokens of a JSON value as sent to the model
+
+    Args:
+        value: JSON-compatible value, or a string
+
+    Returns:
+        int: Estimated token count
+    """
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    return int(len(text) / DEFAULT_CHARS_PER_TOKEN + 0.5)
+
+
+def truncate_description(text: Optional[str], max_tokens: int) -> Optional[str]:
+    """Shorten a description to a token budget, cutting at a word boundary
+
+    Args:
+        text: Description to shorten
+        max_tokens: Token budget, or 0 to keep the description as is
+
+    Returns:
+        The description, ending with "…" if it was shortened
+    """
+    max_chars = int(max_tokens * DEFAULT_CHARS_PER_TOKEN)
+    if not text or max_tokens <= 0 or len(text) <= max_chars:
+        return text
+    cut = text[:max_chars - 1]
+    if " " in cut:
+        cut = cut[:cut.rindex(" ")]
+    return cut.rstrip(" ,;:.-") + "…"
+
+
+def _resolve_pointer(root: Dict[str, Any], ref: str) -> Optional[Any]:
+    """Resolve a local JSON pointer reference such as "#/$defs/Item"
+
+    Args:
+        root: Schema the reference points into
+        ref: Value of the $ref
+
+    Returns:
+        The referenced value, or None if it cannot be resolved
+    """
+    if ref == "#":
+        return root
+    if not ref.startswith("#/"):
+        return None
+    target: Any = root
+    for part in ref[2:].split("/"):
+        part = part.replace("~1", "/").replace("~0", "~")
+        if isinstance(target, dict) and part in target:
+            target = target[part]
+        elif isinstance(target, list) and part.isdigit() and int(part) < len(target):
+            target = target[int(part)]
+        else:
+            return None
+    return target
+
+
+def compact_schema(schema: Any, description_tokens: int = 0) -> Any:
+    """Build the compact form of a tool input schema
+
+    Local `$ref`s are inlined, non-semantic keys are dropped and descriptions
+    are shortened to the token budget. A recursive reference is replaced by
+    the type of its target, since it cannot be inlined. References to other
+    documents are kept as they are.
+
+    Args:
+        schema: JSON Schema of the tool's arguments
+        description_tokens: Token budget for each description, or 0 to keep them whole
+
+    Returns:
+        The compacted schema; the original is not modified
+    """
+    if not isinstance(schema, dict):
+        return schema
+
+    def compact(node: Any, expanding: List[str]) -> Any:
+        if not isinstance(node, dict):
+            return node
+
+        ref = node.get("$ref")
+        if isinstance(ref, str):
+            target = _resolve_pointer(schema, ref)
+            if isinstance(target, dict):
+                siblings = {key: value for key, value in node.items() if key != "$ref"}
+                if ref in expanding:
+                    # Recursive structure: keep only what kind of value is expected
+                    recursive = {key: target[key] for key in ("type",) if key in target}
+                    return compact({**recursive, **siblings}, expanding)
+                return compact({**target, **siblings}, expanding + [ref])
+
+        compacted = {}
+        for key, value in node.items():
+            if key in NON_SEMANTIC_KEYS:
+                continue
+            if key in SCHEMA_MAP_KEYS and isinstance(value, dict):
+                compacted[key] = {name: compact(subschema, expanding) for name, subschema in value.items()}
+            elif key in SCHEMA_LIST_KEYS and isinstance(value, list):
+                compacted[key] = [compact(subschema, expanding) for subschema in value]
+            elif key in SCHEMA_KEYS and isinstance(value, (dict, list)):
+                compacted[key] = (compact(value, expanding) if isinstance(value, dict)
+                                  else [compact(subschema, expanding) for subschema in value])
+            elif key == "description" and isinstance(value, str):
+                compacted[key] = truncate_description(value, description_tokens)
+            else:
+                compacted[key] = value
+        return compacted
+
+    return compact(schema, [])
@@ -1,25 +1,119 @@
-"""Utility to test connectivity"""
-import urllib.request
-import urllib.error
+"""Utility to test connectivity of HTTP-based MCP servers.
 
-def check_url_connectivity(url):
+Servers are probed concurrently with a single lightweight request each, within
+one shared time budget, so unreachable servers delay startup by at most that
+budget instead of a fixed timeout per server. Results are cached per URL so
+later connection attempts and reloads can reuse them.
+"""
+import asyncio
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from .constants import DEFAULT_PROBE_TIMEOUT, PROBE_CACHE_TTL
+
+# httpx is imported when URLs are probed, so startup without HTTP servers skips it
+if TYPE_CHECKING:
+    import httpx
+
+# Probe results by URL: {"reachable": bool, "latency": float, "status": int or None, "checked_at": float}
+_probe_cache: Dict[str, Dict] = {}
+
+
+def get_probe_result(url: str, max_age: float = PROBE_CACHE_TTL) -> Optional[Dict]:
+    """Get the cached probe result for a URL
+
+    Args:
+        url: URL that was probed
+        max_age: Maximum age of the result in seconds
+
+    Returns:
+        Dict with 'reachable', 'latency', 'status' and 'checked_at' keys, or None if
+        the URL was not probed recently
     """
-    Check the connectivity of a URL by performing GET and POST requests.
+    result = _probe_cache.get(url)
+    if result is None or time.monotonic() - result["checked_at"] > max_age:
+        return None
+    return result
+
+
+def clear_probe_cache() -> None:
+    """Forget all cached probe results"""
+    _probe_cache.clear()
+
+
+async def _probe_url(client: "httpx.AsyncClient", url: str, deadline: float,
+                     headers: Optional[Dict[str, str]] = None) -> Dict:
+    """Probe a single URL with an OPTIONS request
+
+    OPTIONS has no side effects on MCP endpoints (a GET would open an SSE
+    stream), and any HTTP response, including an error status, shows that the
+    server is reachable.
+
+    Args:
+        client: HTTP client used for the request
+        url: URL to probe
+        deadline: Event loop time by which the probe must finish
+        headers: Extra headers to send, e.g. for authentication
+
+    Returns:
+        Probe result dictionary
     """
+    import httpx
+
+    start = time.perf_counter()
+    status = None
     try:
-        # Test GET
-        urllib.request.urlopen(url, timeout=2)
-
-        # Test POST (empty data)
-        req = urllib.request.Request(url, data=b'', method='POST')
-        urllib.request.urlopen(req, timeout=2)
-
-        return True
-
-    except urllib.error.HTTPError:
-        # Server responded with an HTTP error code (like 406, 404, 500, etc.)
-        # This means the server is reachable, so return True
-        return True
-    except (urllib.error.URLError, OSError):
-        # Skip URLs that are unreachable or timeout
-        return False
+        remaining = max(0.0, deadline - asyncio.get_running_loop().time())
+        response = await client.request("OPTIONS", url, headers=headers, timeout=remaining)
+        status = response.status_code
+        reachable = True
+    except (httpx.HTTPError, OSError, ValueError):
+        # Connection refused, DNS failure, timeout or an invalid URL
+        reachable = False
+
+    result = {
+        "reachable": reachable,
+        "latency": time.perf_counter() - start,
+        "status": status,
+        "checked_at": time.monotonic(),
+    }
+    _probe_cache[url] = result
+    return result
+
+
+async def probe_urls(urls: List[str], timeout: float = DEFAULT_PROBE_TIMEOUT,
+                     headers: Optional[Dict[str, Dict[str, str]]] = None,
+                     max_age: float = PROBE_CACHE_TTL) -> Dict[str, Dict]:
+    """Probe several URLs concurrently within a shared time budget
+
+    URLs with a cached result younger than max_age are not probed again.
+
+    Args:
+        urls: URLs to probe
+        timeout: Seconds allowed for all probes together
+        headers: Optional extra headers to send, by URL
+        max_age: Maximum age in seconds of a cached result that is reused
+
+    Returns:
+        Dict mapping each URL to its probe result
+    """
+    headers = headers or {}
+    results = {}
+    to_probe = []
+    for url in dict.fromkeys(urls):
+        cached = get_probe_result(url, max_age)
+        if cached is not None:
+            results[url] = cached
+        else:
+            to_probe.append(url)
+
+    if to_probe:
+        import httpx
+
+        deadline = asyncio.get_running_loop().time() + timeout
+        async with httpx.AsyncClient(follow_redirects=False) as client:
+            probed = await asyncio.gather(*(_probe_url(client, url, deadline, headers.get(url)) for url in to_probe))
+        results.update(zip(to_probe, probed))
+
+    return results
+
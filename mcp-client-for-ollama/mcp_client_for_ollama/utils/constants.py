@@ -6,9 +6,8 @@ import os
 DEFAULT_CLAUDE_CONFIG = os.path.expanduser("~/Library/Application Support/Claude/claude_desktop_config.json")
 
 # Default config directory and filename for MCP client for Ollama
+# (created when a file is first written to it)
 DEFAULT_CONFIG_DIR = os.path.expanduser("~/.config/ollmcp")
-if not os.path.exists(DEFAULT_CONFIG_DIR):
-    os.makedirs(DEFAULT_CONFIG_DIR)
 
 DEFAULT_CONFIG_FILE = "config.json"
 
@@ -22,9 +21,115 @@ DEFAULT_OLLAMA_HOST = "http://localhost:11434"
 # URL for checking package updates on PyPI
 PYPI_PACKAGE_URL = "https://pypi.org/pypi/mcp-client-for-ollama/json"
 
+# File caching the result of the last update check
+UPDATE_CHECK_CACHE_FILE = os.path.join(DEFAULT_CONFIG_DIR, "update_check.json")
+
+# Seconds before the cached update check result is refreshed in the background
+UPDATE_CHECK_TTL = 24 * 60 * 60
+
+# Seconds allowed for the background request to PyPI
+UPDATE_CHECK_TIMEOUT = 5.0
+
+# File caching the tool lists of MCP servers between runs
+TOOL_CATALOG_CACHE_FILE = os.path.join(DEFAULT_CONFIG_DIR, "tool_catalog.json")
+
 # MCP Protocol Version
 MCP_PROTOCOL_VERSION = "2025-06-18"
 
+# Maximum number of MCP servers connected to at the same time during startup
+DEFAULT_CONNECT_CONCURRENCY = 8
+
+# Seconds allowed for a single server to spawn, initialize and list its tools
+DEFAULT_CONNECT_TIMEOUT = 30.0
+
+# Seconds allowed for probing all HTTP/SSE server URLs together before connecting
+DEFAULT_PROBE_TIMEOUT = 2.0
+
+# Seconds a URL probe result is reused before the server is probed again
+PROBE_CACHE_TTL = 30.0
+
+# Reconnecting to a server whose session was lost: attempts, and the delay before
+# the second attempt, doubling after each failure up to the maximum delay
+RECONNECT_MAX_ATTEMPTS = 5
+RECONNECT_INITIAL_DELAY = 0.5
+RECONNECT_MAX_DELAY = 8.0
+
+# Seconds allowed for the connection of a lost session to shut down before it is cancelled
+SESSION_STOP_TIMEOUT = 5.0
+
+# Seconds a lazily started stdio server may stay unused before it is stopped (0
+# keeps it running); override per server with "idleTimeout" in the servers JSON
+DEFAULT_SERVER_IDLE_TIMEOUT = 600.0
+
+# Seconds between checks for lazily started servers that have become idle
+SERVER_IDLE_CHECK_INTERVAL = 15.0
+
+# Tokens each tool or parameter description may use in the schemas sent to the
+# model before it is shortened (0 keeps descriptions whole); override per server
+# with "descriptionTokens" in the servers JSON
+DEFAULT_DESCRIPTION_TOKENS = 200
+
+# Tool calls sent to the same server at once within a model turn (calls to
+# different servers always run in parallel); override per server with
+# "maxConcurrentCalls" in the servers JSON
+DEFAULT_MAX_CALLS_PER_SERVER = 1
+
+# Tool results kept in the result cache, least recently used dropped first
+DEFAULT_TOOL_CACHE_SIZE = 256
+
+# Seconds results of tools annotated as read-only are cached; override per tool
+# with "cacheTtl" in the servers JSON
+DEFAULT_TOOL_CACHE_TTL = 300.0
+
+# Number of best matching tools offered per query when tool routing is enabled
+DEFAULT_TOOL_ROUTER_TOP_K = 8
+
+# Tool offered alongside the routed tools so the model can ask for all enabled
+# tools when none of the offered ones fits; has no server prefix, so it never
+# clashes with a server's tool
+TOOL_ROUTER_FALLBACK_TOOL = "request_all_tools"
+
+# Maximum number of tool-calling rounds the model may chain within one query
+DEFAULT_MAX_TOOL_ROUNDS = 8
+
+# Seconds a query may spend in tool rounds before the model must answer
+DEFAULT_QUERY_TIME_BUDGET = 300.0
+
+# Seconds a tool call may take before it is abandoned and the model is told it
+# timed out; None waits indefinitely. Set per server with "toolTimeout" or per
+# tool with "toolTimeouts" in the servers JSON
+DEFAULT_TOOL_CALL_TIMEOUT = None
+
+# Seconds allowed for telling a server that a request was cancelled
+CANCEL_NOTIFICATION_TIMEOUT = 1.0
+
+# Fraction of the model's context window the prompt may fill before the oldest
+# turns are trimmed; the rest is left for the response
+DEFAULT_CONTEXT_BUDGET_RATIO = 0.8
+
+# Context window Ollama uses when num_ctx is not set
+DEFAULT_OLLAMA_NUM_CTX = 4096
+
+# Initial characters-per-token estimate, refined from Ollama's prompt_eval_count
+DEFAULT_CHARS_PER_TOKEN = 4.0
+
+# What happens to turns trimmed from the context: dropped or summarized
+CONTEXT_OVERFLOW_STRATEGIES = ("drop", "summarize")
+
+# In prefix-stability mode, trimming goes down to this fraction of the budget
+# so the cached prompt prefix is invalidated by trimming less often
+STABLE_PREFIX_TRIM_RATIO = 0.75
+
+# Maximum number of times per second the streamed response is redrawn; chunks
+# arriving in between are coalesced into the next frame
+STREAMING_FRAMES_PER_SECOND = 12
+
+# Non-interactive answers to tool call confirmations in batch mode
+HIL_POLICIES = ("approve", "deny")
+
+# Number of batch prompts run at the same time unless --concurrency is given
+DEFAULT_BATCH_CONCURRENCY = 1
+
 # Interactive commands and their descriptions for autocomplete
 INTERACTIVE_COMMANDS = {
     'tools': 'Configure available tools',
@@ -43,12 +148,24 @@ INTERACTIVE_COMMANDS = {
     'load-config': 'Load saved configuration',
     'reset-config': 'Reset to default config',
     'reload-servers': 'Reload MCP servers',
+    'servers': 'Show MCP server status',
+    'connect-server': 'Connect a single MCP server',
+    'disconnect-server': 'Disconnect a single MCP server',
+    'restart-server': 'Restart a single MCP server',
     'human-in-the-loop': 'Toggle HIL confirmations',
+    'tool-routing': 'Toggle relevance-based tool selection',
     'quit': 'Exit the application',
     'exit': 'Exit the application',
     'bye': 'Exit the application'
 }
 
+# Commands (and their short forms) that act on a single MCP server, mapped to the action
+SERVER_COMMANDS = {
+    'connect-server': 'connect', 'cns': 'connect',
+    'disconnect-server': 'disconnect', 'dcs': 'disconnect',
+    'restart-server': 'restart', 'rss': 'restart',
+}
+
 # Default completion menu style (used by prompt_toolkit in interactive mode)
 DEFAULT_COMPLETION_STYLE = {
     'prompt': 'ansibrightyellow bold',
@@ -0,0 +1,210 @@
+"""Context window management for the MCP Client for Ollama.
+
+This module keeps the prompt sent to Ollama under a token budget derived from
+the model's context size. Token counts are estimated from message sizes and
+calibrated against the prompt_eval_count Ollama reports after each request.
+
+Classes:
+    ContextWindowManager: Trims or summarizes the oldest turns of a conversation.
+"""
+import math
+import re
+from typing import Any, Dict, List, Optional
+
+from rich.console import Console
+
+from .constants import (
+    DEFAULT_CHARS_PER_TOKEN, DEFAULT_CONTEXT_BUDGET_RATIO, DEFAULT_OLLAMA_NUM_CTX,
+    CONTEXT_OVERFLOW_STRATEGIES
+)
+from .conversation import ConversationBuffer
+
+# Accepted range for a calibrated characters-per-token ratio; values outside it
+# come from partial prompt evaluation (e.g. KV cache reuse) and are ignored
+MIN_CHARS_PER_TOKEN = 1.5
+MAX_CHARS_PER_TOKEN = 8.0
+
+# Weight of a new measurement when updating the characters-per-token ratio
+CALIBRATION_WEIGHT = 0.3
+
+# Longest excerpt of a single message included in a summarization request
+SUMMARY_MESSAGE_CHARS = 2000
+
+SUMMARY_PROMPT = (
+    "You maintain a running summary of a conversation between a user and an assistant "
+    "that uses tools. Merge the previous summary with the new messages into one concise "
+    "summary. Keep facts, decisions, tool results and open questions the assistant may "
+    "need later. Reply with the summary only."
+)
+
+
+class ContextWindowManager:
+    """Keeps a conversation within a token budget of the model's context window
+
+    When the estimated prompt exceeds the budget, the oldest completed turns are
+    dropped, or replaced by a running summary when the 'summarize' strategy is
+    selected. The system prompt and the turn in progress are never removed.
+    """
+
+    def __init__(self, ollama: Optional[Any] = None, console: Optional[Console] = None,
+                 budget_ratio: float = DEFAULT_CONTEXT_BUDGET_RATIO, strategy: str = "drop"):
+        """Initialize the ContextWindowManager.
+
+        Args:
+            ollama: Ollama async client used to summarize trimmed turns
+            console: Rich console for output
+            budget_ratio: Fraction of the context size the prompt may use
+            strategy: 'drop' to discard old turns, 'summarize' to summarize them
+        """
+        self.ollama = ollama
+        self.console = console or Console()
+        self.budget_ratio = budget_ratio
+        self.strategy = strategy if strategy in CONTEXT_OVERFLOW_STRATEGIES else "drop"
+        self.chars_per_token = DEFAULT_CHARS_PER_TOKEN  # Calibrated from prompt_eval_count
+        self.last_prompt_tokens: Optional[int] = None  # prompt_eval_count of the last request
+        self.trimmed_turns = 0  # Turns removed from the context this session
+
+    def estimate_tokens(self, size: int) -> int:
+        """Estimate the number of tokens for a size in characters
+
+        Args:
+            size: Size in characters
+
+        Returns:
+            int: Estimated number of tokens
+        """
+        return math.ceil(size / self.chars_per_token)
+
+    def get_budget(self, num_ctx: Optional[int], context_length: Optional[int] = None) -> int:
+        """Get the token budget for the prompt
+
+        Args:
+            num_ctx: Configured context size, or None for the Ollama default
+            context_length: Context length the model supports, if known
+
+        Returns:
+            int: Maximum number of prompt tokens
+        """
+        window = num_ctx or DEFAULT_OLLAMA_NUM_CTX
+        if context_length:
+            window = min(window, context_length)
+        return int(window * self.budget_ratio)
+
+    def calibrate(self, prompt_size: int, prompt_eval_count: Optional[int]) -> None:
+        """Update the characters-per-token ratio from a completed request
+
+        Args:
+            prompt_size: Size in characters of the messages and tools sent
+            prompt_eval_count: Number of prompt tokens reported by Ollama
+        """
+        if not prompt_eval_count:
+            return
+        self.last_prompt_tokens = prompt_eval_count
+        if prompt_size <= 0:
+            return
+
+        ratio = prompt_size / prompt_eval_count
+        if MIN_CHARS_PER_TOKEN <= ratio <= MAX_CHARS_PER_TOKEN:
+            self.chars_per_token += CALIBRATION_WEIGHT * (ratio - self.chars_per_token)
+
+    def get_usage(self, conversation: ConversationBuffer, extra_size: int, budget: int) -> Dict[str, Any]:
+        """Get the estimated budget usage of a conversation
+
+        Args:
+            conversation: Conversation to measure
+            extra_size: Size in characters of content sent besides the messages (tools)
+            budget: Token budget for the prompt
+
+        Returns:
+            Dict with 'estimated_tokens', 'budget' and 'ratio' keys
+        """
+        estimated = self.estimate_tokens(conversation.total_size + extra_size)
+        return {
+            "estimated_tokens": estimated,
+            "budget": budget,
+            "ratio": estimated / budget if budget else 0.0,
+        }
+
+    def select_turns_to_trim(self, conversation: ConversationBuffer, extra_size: int, budget: int,
+                             target: Optional[int] = None) -> int:
+        """Count how many of the oldest turns must go to fit the budget
+
+        Args:
+            conversation: Conversation to fit
+            extra_size: Size in characters of content sent besides the messages (tools)
+            budget: Token budget for the prompt
+            target: Token count to trim down to once the budget is exceeded (defaults to the budget)
+
+        Returns:
+            int: Number of completed turns to remove, oldest first
+        """
+        size = conversation.total_size + extra_size
+        if self.estimate_tokens(size) <= budget:
+            return 0
+
+        excess = size - (budget if target is None else target) * self.chars_per_token
+        count = 0
+        for turn_size in conversation.turn_sizes():
+            if excess <= 0:
+                break
+            excess -= turn_size
+            count += 1
+        return count
+
+    async def fit(self, conversation: ConversationBuffer, extra_size: int, budget: int,
+                  model: Optional[str] = None, target: Optional[int] = None) -> int:
+        """Trim the oldest turns of a conversation until it fits the budget
+
+        Args:
+            conversation: Conversation to fit
+            extra_size: Size in characters of content sent besides the messages (tools)
+            budget: Token budget for the prompt
+            model: Model used to summarize trimmed turns with the 'summarize' strategy
+            target: Token count to trim down to once the budget is exceeded (defaults to the budget)
+
+        Returns:
+            int: Number of turns that were removed
+        """
+        count = self.select_turns_to_trim(conversation, extra_size, budget, target)
+        if count == 0:
+            return 0
+
+        removed = conversation.drop_oldest_turns(count)
+        self.trimmed_turns += count
+
+        if self.strategy == "summarize" and model and self.ollama is not None:
+            try:
+                summary = await self.summarize(model, conversation.summary, removed)
+            except Exception as e:
+                self.console.print(f"[yellow]Could not summarize earlier turns, dropping them instead: {str(e)}[/yellow]")
+            else:
+                # Keep the summary well within the budget so it cannot crowd out new turns
+                conversation.set_summary(summary[:int(budget * self.chars_per_token / 4)])
+
+        return count
+
+    async def summarize(self, model: str, previous_summary: str, messages: List[Dict[str, Any]]) -> str:
+        """Summarize trimmed messages together with the previous summary
+
+        Args:
+            model: Model used to write the summary
+            previous_summary: Summary of turns trimmed earlier, may be empty
+            messages: Messages being removed from the context
+
+        Returns:
+            str: The updated summary
+        """
+        transcript = "\n".join(
+            f"{message['role']}: {(message.get('content') or '')[:SUMMARY_MESSAGE_CHARS]}"
+            for message in messages if message.get("content")
+        )
+        response = await self.ollama.chat(
+            model=model,
+            messages=[
+                {"role": "system", "content": SUMMARY_PROMPT},
+                {"role": "user", "content": f"Previous summary:\n{previous_summary or '(none)'}\n\nNew messages:\n{transcript}"},
+            ],
+            stream=False,
+        )
+        # Reasoning models may put their thinking inline; keep the answer only
+        return re.sub(r"<think>.*?</think>", "", response.message.content or "", flags=re.DOTALL).strip()
@@ -0,0 +1,262 @@
+"""Conversation buffer for the MCP Client for Ollama.
+
+This module keeps the chat messages sent to Ollama across turns so each new
+turn only appends to the conversation instead of rebuilding it.
+
+Classes:
+    ConversationBuffer: Append-only store of messages and completed turns.
+"""
+import json
+from typing import Any, Dict, List, Optional
+
+# Characters added per message for the role and chat template markers
+MESSAGE_OVERHEAD_CHARS = 16
+
+
+def message_size(message: Dict[str, Any]) -> int:
+    """Estimate the size of a message in characters as the model will see it
+
+    Args:
+        message: Message dictionary in Ollama chat format
+
+    Returns:
+        int: Approximate number of characters, including template overhead
+    """
+    size = len(message.get("content") or "") + MESSAGE_OVERHEAD_CHARS
+    if message.get("tool_calls"):
+        size += len(json.dumps(message["tool_calls"], default=str))
+    return size
+
+
+class ConversationBuffer:
+    """Persistent list of chat messages shared by all turns of a session
+
+    The system prompt, when set, is always the first message, optionally
+    followed by a summary of turns that were trimmed from the context. Every
+    turn adds the user message, any assistant tool-call and tool result
+    messages, and the final assistant answer, exactly as they were sent to the
+    model. The size of every message is tracked alongside it.
+    """
+
+    def __init__(self):
+        """Initialize an empty conversation buffer"""
+        self.messages: List[Dict[str, Any]] = []  # Messages in the order they are sent to Ollama
+        self.message_sizes: List[int] = []  # Estimated size in characters of each message
+        self.total_size = 0  # Sum of message_sizes
+        self.history: List[Dict[str, str]] = []  # Completed turns as {"query", "response"} entries
+        self.summary = ""  # Summary of turns trimmed from the context, if any
+        self._turn_starts: List[int] = []  # Index in messages where each completed turn begins
+        self._current_turn_start: Optional[int] = None  # Index where the turn in progress begins
+        self._has_system_prompt = False
+
+    def __len__(self) -> int:
+        """Return the number of completed turns"""
+        return len(self.history)
+
+    @property
+    def system_offset(self) -> int:
+        """Number of pinned leading messages (system prompt and trimmed-turn summary)"""
+        return (1 if self._has_system_prompt else 0) + (1 if self.summary else 0)
+
+    @property
+    def turn_count(self) -> int:
+        """Number of completed turns still present in the messages"""
+        return len(self._turn_starts)
+
+    def _insert(self, index: int, message: Dict[str, Any]) -> None:
+        """Insert a message and its size at a position"""
+        size = message_size(message)
+        self.messages.insert(index, message)
+        self.message_sizes.insert(index, size)
+        self.total_size += size
+
+    def _replace(self, index: int, message: Dict[str, Any]) -> None:
+        """Replace the message at a position, keeping sizes in sync"""
+        size = message_size(message)
+        self.total_size += size - self.message_sizes[index]
+        self.messages[index] = message
+        self.message_sizes[index] = size
+
+    def _delete(self, start: int, end: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Delete messages[start:end] and return them, keeping sizes in sync"""
+        end = start + 1 if end is None else end
+        removed = self.messages[start:end]
+        self.total_size -= sum(self.message_sizes[start:end])
+        del self.messages[start:end]
+        del self.message_sizes[start:end]
+        return removed
+
+    def set_system_prompt(self, system_prompt: str) -> None:
+        """Set, replace or remove the system prompt at the start of the conversation
+
+        Args:
+            system_prompt: System prompt text, or an empty string for none
+        """
+        if system_prompt:
+            message = {"role": "system", "content": system_prompt}
+            if self._has_system_prompt:
+                if self.messages[0]["content"] != system_prompt:
+                    self._replace(0, message)
+                return
+            self._insert(0, message)
+            self._shift_turns(1)
+            self._has_system_prompt = True
+        elif self._has_system_prompt:
+            self._delete(0)
+            self._shift_turns(-1)
+            self._has_system_prompt = False
+
+    def set_summary(self, summary: str) -> None:
+        """Set, replace or remove the summary of trimmed turns after the system prompt
+
+        Args:
+            summary: Summary text, or an empty string for none
+        """
+        index = 1 if self._has_system_prompt else 0
+        message = {"role": "system", "content": f"Summary of the earlier conversation:\n{summary}"}
+        if summary and self.summary:
+            self._replace(index, message)
+        elif summary:
+            self._insert(index, message)
+            self._shift_turns(1)
+        elif self.summary:
+            self._delete(index)
+            self._shift_turns(-1)
+        self.summary = summary
+
+    def drop_oldest_turns(self, count: int) -> List[Dict[str, Any]]:
+        """Remove the oldest completed turns from the messages
+
+        The turns stay in the display history; only the messages sent to the
+        model are removed. Pinned messages and the turn in progress are kept.
+
+        Args:
+            count: Number of completed turns to remove
+
+        Returns:
+            List of the removed messages
+        """
+        count = min(count, len(self._turn_starts))
+        if count <= 0:
+            return []
+
+        start = self.system_offset
+        if count < len(self._turn_starts):
+            end = self._turn_starts[count]
+        elif self._current_turn_start is not None:
+            end = self._current_turn_start
+        else:
+            end = len(self.messages)
+
+        removed = self._delete(start, end)
+        self._turn_starts = self._turn_starts[count:]
+        self._shift_turns(-(end - start))
+        return removed
+
+    def turn_sizes(self) -> List[int]:
+        """Get the size in characters of each completed turn still in the messages
+
+        Returns:
+            List of sizes, oldest turn first
+        """
+        ends = self._turn_starts[1:] + [
+            self._current_turn_start if self._current_turn_start is not None else len(self.messages)
+        ]
+        return [sum(self.message_sizes[start:end]) for start, end in zip(self._turn_starts, ends)]
+
+    def _shift_turns(self, offset: int) -> None:
+        """Move recorded turn boundaries after inserting or removing leading messages
+
+        Args:
+            offset: Number of positions the turns moved by
+        """
+        self._turn_starts = [start + offset for start in self._turn_starts]
+        if self._current_turn_start is not None:
+            self._current_turn_start += offset
+
+    def begin_turn(self, query: str) -> None:
+        """Start a new turn with the user's query
+
+        Args:
+            query: The user's query
+        """
+        self._current_turn_start = len(self.messages)
+        self._insert(len(self.messages), {"role": "user", "content": query})
+
+    def append(self, message: Dict[str, Any]) -> None:
+        """Append a message (assistant tool calls or tool result) to the current turn
+
+        Args:
+            message: Message dictionary in Ollama chat format
+        """
+        self._insert(len(self.messages), message)
+
+    def extend(self, messages: List[Dict[str, Any]]) -> None:
+        """Append several messages to the current turn
+
+        Args:
+            messages: Message dictionaries in Ollama chat format
+        """
+        for message in messages:
+            self.append(message)
+
+    def end_turn(self, response: str) -> None:
+        """Finish the current turn with the assistant's final answer
+
+        Args:
+            response: Final response text of the assistant
+        """
+        if self._current_turn_start is None:
+            return
+        self.append({"role": "assistant", "content": response})
+        self._turn_starts.append(self._current_turn_start)
+        self.history.append({"query": self.messages[self._current_turn_start]["content"], "response": response})
+        self._current_turn_start = None
+
+    def rollback_turn(self) -> None:
+        """Discard the messages of a turn that failed before completing"""
+        if self._current_turn_start is None:
+            return
+        self._delete(self._current_turn_start, len(self.messages))
+        self._current_turn_start = None
+
+    def get_request_messages(self, retain_context: bool = True) -> List[Dict[str, Any]]:
+        """Get the messages to send to Ollama for the turn in progress
+
+        Args:
+            retain_context: Whether previous turns are included
+
+        Returns:
+            The buffer's own message list when retaining context, otherwise the
+            system prompt followed by the messages of the current turn only
+        """
+        if retain_context or self._current_turn_start is None:
+            return self.messages
+        return self.messages[:self.system_offset] + self.messages[self._current_turn_start:]
+
+    def get_request_size(self, retain_context: bool = True) -> int:
+        """Get the size in characters of the messages returned by get_request_messages
+
+        Args:
+            retain_context: Whether previous turns are included
+
+        Returns:
+            int: Total size of the messages sent for the turn in progress
+        """
+        if retain_context or self._current_turn_start is None:
+            return self.total_size
+        return sum(self.message_sizes[:self.system_offset]) + sum(self.message_sizes[self._current_turn_start:])
+
+    def clear(self) -> int:
+        """Remove all turns and the trimmed-turn summary, keeping the system prompt
+
+        Returns:
+            int: Number of completed turns that were removed
+        """
+        removed = len(self.history)
+        self.set_summary("")
+        self._delete(self.system_offset, len(self.messages))
+        self.history.clear()
+        self._turn_starts.clear()
+        self._current_turn_start = None
+        return removed
@@ -20,6 +20,7 @@ class HumanInTheLoopManager:
         self.console = console
         # Store HIL settings locally since there's no persistent config object
         self._hil_enabled = True  # Default to enabled
+        self._policy = None  # Non-interactive decision ('approve' or 'deny'), used in batch mode
 
     def is_enabled(self) -> bool:
         """Check if HIL confirmations are enabled"""
@@ -40,6 +41,15 @@ class HumanInTheLoopManager:
         """Set HIL enabled state (used when loading from config)"""
         self._hil_enabled = enabled
 
+    def set_policy(self, policy: str = None) -> None:
+        """Answer every confirmation without prompting (used in batch mode)
+
+        Args:
+            policy: 'approve' to execute all tool calls, 'deny' to skip them,
+                or None to prompt the user again
+        """
+        self._policy = policy
+
     async def request_tool_confirmation(self, tool_name: str, tool_args: dict) -> bool:
         """
         Request user confirmation for tool execution
@@ -52,6 +62,9 @@ class HumanInTheLoopManager:
         Returns:
             bool: should_execute
         """
+        if self._policy is not None:
+            return self._policy == "approve"
+
         if not self.is_enabled():
             return True, False  # Execute if HIL is disabled
 
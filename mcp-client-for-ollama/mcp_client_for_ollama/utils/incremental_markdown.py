@@ -0,0 +1,132 @@
+"""Incremental Markdown rendering for streamed responses.
+
+Rendering a growing response with a new Markdown object for every update costs
+time proportional to the whole text, so long answers get slower to display the
+longer they get. This module splits the text into completed blocks, which are
+parsed and rendered once, and the unfinished trailing block, which is the only
+part parsed again on each update.
+
+Classes:
+    IncrementalMarkdown: Rich renderable for Markdown text that grows over time.
+"""
+import re
+from typing import List
+
+from rich.console import Console, ConsoleOptions, RenderResult
+from rich.segment import Segment
+
+# Opening line of a fenced code block; blank lines inside it do not end a block
+FENCE_RE = re.compile(r"^\s*(`{3,}|~{3,})")
+
+
+class IncrementalMarkdown:
+    """Markdown renderable that only re-parses its unfinished trailing block
+
+    Text before the last blank line that is outside a code fence, and followed
+    by an unindented line, cannot change how it renders anymore. It is frozen
+    and its rendered lines are kept until the console width changes.
+    """
+
+    def __init__(self, text: str = ""):
+        """Initialize the renderable
+
+        Args:
+            text: Initial Markdown text
+        """
+        self._text = ""  # Full text received so far
+        self._blocks: List[str] = []  # Completed blocks of Markdown source
+        self._rendered: List[List[List[Segment]]] = []  # Rendered lines of each completed block
+        self._render_width = None  # Width the completed blocks were rendered at
+        self._tail = ""  # Unfinished trailing block
+        if text:
+            self.append(text)
+
+    @property
+    def text(self) -> str:
+        """The full Markdown text"""
+        return self._text
+
+    def reset(self) -> None:
+        """Discard all text and rendered blocks"""
+        self._text = ""
+        self._blocks = []
+        self._rendered = []
+        self._tail = ""
+
+    def set_text(self, text: str) -> None:
+        """Replace the text, only processing the new part when it extends the current text
+
+        Args:
+            text: The full Markdown text
+        """
+        if text.startswith(self._text):
+            self.append(text[len(self._text):])
+        else:
+            self.reset()
+            self.append(text)
+
+    def append(self, text: str) -> None:
+        """Append text and freeze any blocks it completes
+
+        Args:
+            text: Markdown text to add at the end
+        """
+        if not text:
+            return
+        self._text += text
+        self._tail += text
+        self._freeze_completed_blocks()
+
+    def _freeze_completed_blocks(self) -> None:
+        """Move completed blocks from the trailing text into the frozen blocks"""
+        lines = self._tail.split("\n")
+        fence = None
+        boundary = None
+        # The last element is a line still being written, so it is never a boundary
+        for index, line in enumerate(lines[:-1]):
+            if fence:
+                stripped = line.strip()
+                if stripped.startswith(fence) and not stripped.strip(fence[0]):
+                    fence = None
+                continue
+            match = FENCE_RE.match(line)
+            if match:
+                fence = match.group(1)
+                continue
+            next_line = lines[index + 1]
+            if not line.strip() and next_line and not next_line[0].isspace():
+                boundary = index
+
+        if boundary is None:
+            return
+
+        block = "\n".join(lines[:boundary])
+        if block.strip():
+            self._blocks.append(block)
+        self._tail = "\n".join(lines[boundary + 1:])
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        # rich.markdown pulls in markdown-it, so it is imported on the first render
+        # rather than at startup
+        from rich.markdown import Markdown
+
+        options = options.reset_height()
+        if options.max_width != self._render_width:
+            self._rendered = []
+            self._render_width = options.max_width
+
+        for block in self._blocks[len(self._rendered):]:
+            self._rendered.append(console.render_lines(Markdown(block), options, pad=False))
+
+        blocks = list(self._rendered)
+        if self._tail.strip():
+            blocks.append(console.render_lines(Markdown(self._tail), options, pad=False))
+
+        for index, lines in enumerate(blocks):
+            # Separate blocks by a blank line, unless the block starts with one
+            # itself (Rich renders lists and quotes with a leading blank line)
+            if index and lines and any(segment.text for segment in lines[0]):
+                yield Segment.line()
+            for line in lines:
+                yield from line
+                yield Segment.line()
@@ -0,0 +1,46 @@
+"""Ctrl-C handling for work that can be cancelled on its own.
+
+asyncio.run() turns Ctrl-C into a cancellation of the whole program. While
+tool calls run, the client instead wants Ctrl-C to cancel just those calls
+and return to the conversation, so the SIGINT handler is replaced for the
+duration of that work.
+
+Functions:
+    interrupt_handler: Run a callback on the event loop when Ctrl-C is pressed.
+"""
+import asyncio
+import signal
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+
+@contextmanager
+def interrupt_handler(callback: Callable[[], None]) -> Iterator[bool]:
+    """Run a callback on the event loop instead of interrupting the program on Ctrl-C
+
+    Must be entered from a coroutine. Signal handlers can only be installed
+    from the main thread; elsewhere Ctrl-C keeps its usual behavior.
+
+    Args:
+        callback: Function called on the event loop for every Ctrl-C
+
+    Yields:
+        bool: True if the handler was installed
+    """
+    loop = asyncio.get_running_loop()
+
+    def on_interrupt(signum, frame) -> None:
+        loop.call_soon_threadsafe(callback)
+
+    try:
+        previous = signal.signal(signal.SIGINT, on_interrupt)
+    except ValueError:
+        # Not the main thread
+        yield False
+        return
+
+    try:
+        yield True
+    finally:
+        # A handler installed outside Python cannot be restored, so fall back to the default
+        signal.signal(signal.SIGINT, previous if previous is not None else signal.default_int_handler)
@@ -4,6 +4,7 @@ Metrics display utilities for the MCP client for Ollama.
 This module provides functions for extracting and displaying performance metrics from Ollama responses.
 """
 from rich.panel import Panel
+from rich.text import Text
 
 def extract_metrics(chunk):
     """Extract metrics from an Ollama response chunk
@@ -26,6 +27,24 @@ def extract_metrics(chunk):
         'eval_duration': getattr(chunk, 'eval_duration', None)
     }
 
+def format_metrics_plain(metrics):
+    """Format performance metrics as a single plain text line
+
+    Args:
+        metrics: Dictionary containing metrics from Ollama response
+
+    Returns:
+        str: Delimited line with token counts, durations and generation rate
+    """
+    eval_count = metrics.get('eval_count') or 0
+    eval_duration = (metrics.get('eval_duration') or 0) / 1_000_000_000
+    total_duration = (metrics.get('total_duration') or 0) / 1_000_000_000
+    eval_rate = eval_count / eval_duration if eval_duration > 0 else 0
+    return (
+        f"--- metrics: prompt_eval_count={metrics.get('prompt_eval_count') or 0} "
+        f"eval_count={eval_count} total_duration={total_duration:.3f}s eval_rate={eval_rate:.2f} tokens/s ---"
+    )
+
 def display_metrics(console, metrics):
     """Display performance metrics in a formatted way
 
@@ -85,3 +104,40 @@ def display_metrics(console, metrics):
             expand=False
         ))
         console.print()  # Add spacing after panel
+
+def display_round_metrics(console, rounds, plain=False):
+    """Display latency and token counts for each round of a multi-round query
+
+    Args:
+        console: Rich console for output
+        rounds: List of round dictionaries with round, duration, tool_calls,
+            prompt_eval_count and eval_count keys
+        plain: Write delimited plain text lines instead of a panel
+    """
+    if not rounds:
+        return
+
+    metrics_lines = []
+    for round_stats in rounds:
+        prompt_tokens = round_stats.get('prompt_eval_count') or 0
+        eval_tokens = round_stats.get('eval_count') or 0
+        metrics_lines.append(
+            f"[cyan]round {round_stats['round']}:[/cyan] {round_stats.get('duration', 0):.2f}s, "
+            f"{round_stats.get('tool_calls', 0)} tool call(s), "
+            f"{prompt_tokens} prompt / {eval_tokens} eval token(s)"
+        )
+
+    total_duration = sum(round_stats.get('duration', 0) for round_stats in rounds)
+    metrics_lines.append(f"[green]total:[/green] {total_duration:.2f}s over {len(rounds)} round(s)")
+
+    if plain:
+        console.file.write("--- tool rounds ---\n" + "\n".join(Text.from_markup(line).plain for line in metrics_lines) + "\n")
+        return
+
+    console.print(Panel(
+        "\n".join(metrics_lines),
+        title="🔁 Tool Rounds",
+        border_style="violet",
+        expand=False
+    ))
+    console.print()
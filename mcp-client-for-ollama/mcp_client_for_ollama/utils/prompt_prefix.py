@@ -0,0 +1,131 @@
+"""Prompt prefix stability helpers for the MCP Client for Ollama.
+
+Ollama reuses its KV cache only for the part of a prompt that is identical to
+the previous request. This module canonicalizes the tool definitions so they
+serialize the same way on every request, and tracks request prefixes to detect
+changes that force Ollama to re-evaluate the whole prompt.
+
+Classes:
+    PromptPrefixTracker: Detects requests whose prefix differs from the previous one.
+"""
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+
+def canonicalize_schema(value: Any) -> Any:
+    """Return a copy of a JSON value with all object keys sorted recursively
+
+    List order is kept, since it can be meaningful (e.g. enum values).
+
+    Args:
+        value: JSON-compatible value such as a tool input schema
+
+    Returns:
+        The canonicalized copy
+    """
+    if isinstance(value, dict):
+        return {key: canonicalize_schema(value[key]) for key in sorted(value)}
+    if isinstance(value, list):
+        return [canonicalize_schema(item) for item in value]
+    return value
+
+
+def _fingerprint(value: Any) -> str:
+    """Hash a JSON-compatible value independently of dict key order"""
+    return hashlib.sha1(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class PromptPrefixTracker:
+    """Compares each request with the previous one to find prefix changes
+
+    A request keeps the cached prefix when the model, options and tools are
+    unchanged and the previous messages are an unmodified prefix of the new
+    ones. Any other change is counted as a cache bust.
+
+    Messages are expected to be replaced rather than modified in place, as
+    ConversationBuffer does, so the fingerprint of a message that is the same
+    object as in the previous request is reused. Only appended and replaced
+    messages are serialized and hashed, which keeps the cost of a request
+    proportional to what changed rather than to the whole history.
+    """
+
+    def __init__(self):
+        """Initialize the PromptPrefixTracker"""
+        self.cache_busts = 0  # Requests that invalidated the cached prefix
+        self.last_change: Optional[str] = None  # Reason of the most recent cache bust
+        self._settings_key: Optional[str] = None
+        self._tools_key: Optional[str] = None
+        self._tools_json: Optional[str] = None  # Tool definitions the tools key was computed for
+        self._messages: List[Dict[str, Any]] = []  # Messages of the previous request
+        self._message_keys: List[str] = []  # Fingerprints of those messages
+
+    def reset(self) -> None:
+        """Forget the previous request, e.g. after the context was cleared on purpose"""
+        self._settings_key = None
+        self._tools_key = None
+        self._tools_json = None
+        self._messages = []
+        self._message_keys = []
+
+    def observe(self, model: str, options: Dict[str, Any], tools_json: str,
+                messages: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Record a request and report whether it changed the prompt prefix
+
+        Args:
+            model: Model the request is sent to
+            options: Model options of the request
+            tools_json: Serialized tool definitions sent, or an empty string for none
+            messages: Messages of the request
+
+        Returns:
+            None if the cached prefix can be reused, otherwise a dict with the
+            'reason' for the change and the number of 'reused_messages'
+        """
+        settings_key = _fingerprint({"model": model, "options": options})
+        # The tool payload is memoized, so it is usually the same string as before
+        tools_key = (self._tools_key if tools_json is self._tools_json
+                     else hashlib.sha1(tools_json.encode("utf-8")).hexdigest())
+
+        # Messages that are the same objects as in the previous request keep
+        # their fingerprints; only appended or replaced messages are hashed
+        previous = self._messages
+        message_keys = [
+            self._message_keys[index] if index < len(previous) and message is previous[index]
+            else _fingerprint(message)
+            for index, message in enumerate(messages)
+        ]
+
+        reused = 0
+        for previous_key, current_key in zip(self._message_keys, message_keys):
+            if previous_key != current_key:
+                break
+            reused += 1
+
+        change = None
+        if self._settings_key is None:
+            pass
+        elif settings_key != self._settings_key:
+            change = "model or options changed"
+        elif tools_key != self._tools_key:
+            change = "tool definitions changed"
+            reused = 0
+        elif reused < len(self._message_keys):
+            role = messages[reused]["role"] if reused < len(messages) else None
+            if reused == 0 and role == "system":
+                change = "system prompt changed"
+            else:
+                change = f"earlier messages changed or were trimmed (kept {reused} of {len(self._message_keys)})"
+
+        self._settings_key = settings_key
+        self._tools_key = tools_key
+        self._tools_json = tools_json
+        # The buffer's own list grows in place, so keep a copy of the references
+        self._messages = list(messages)
+        self._message_keys = message_keys
+
+        if change is None:
+            return None
+        self.cache_busts += 1
+        self.last_change = change
+        return {"reason": change, "reused_messages": reused}
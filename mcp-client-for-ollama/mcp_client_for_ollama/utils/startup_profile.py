@@ -0,0 +1,73 @@
+"""Startup timing for the MCP Client for Ollama.
+
+The entry point imports this module before anything else, so the time spent
+importing the client is measured from here. Later startup phases are timed
+with StartupProfiler.phase() and reported when --profile-startup is given.
+
+Classes:
+    StartupProfiler: Records how long each startup phase takes.
+"""
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+class StartupProfiler:
+    """Records wall-clock durations of named startup phases"""
+
+    def __init__(self):
+        """Initialize the StartupProfiler, starting the clock"""
+        self.started_at = time.perf_counter()
+        self.phases: Dict[str, float] = {}  # Seconds spent in each phase, in the order they ran
+
+    def record(self, name: str, seconds: float) -> None:
+        """Add time to a phase
+
+        Args:
+            name: Name of the phase
+            seconds: Duration to add
+        """
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as a startup phase
+
+        Args:
+            name: Name of the phase
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def elapsed(self) -> float:
+        """Get the seconds since the profiler started
+
+        Returns:
+            float: Seconds elapsed
+        """
+        return time.perf_counter() - self.started_at
+
+    def display(self, console) -> None:
+        """Print a table of the recorded phases and the total time to this point
+
+        Args:
+            console: Rich console to print to
+        """
+        from rich.table import Table
+
+        total = self.elapsed()
+        table = Table(title="Startup Profile", title_justify="left", expand=False)
+        table.add_column("Phase", style="cyan")
+        table.add_column("Time", justify="right")
+        table.add_column("Share", justify="right", style="dim")
+        for name, seconds in self.phases.items():
+            table.add_row(name, f"{seconds * 1000:.0f} ms", f"{seconds / total:.0%}" if total else "-")
+        table.add_row("[bold]Total startup[/bold]", f"[bold]{total * 1000:.0f} ms[/bold]", "")
+        console.print(table)
+
+
+# Shared profiler, started when the entry point first imports this module
+startup_profiler = StartupProfiler()
@@ -4,23 +4,29 @@ This file implements streaming functionality for the MCP client for Ollama.
 Classes:
     StreamingManager: Handles streaming responses from Ollama.
 """
-from rich.markdown import Markdown
+import asyncio
+import time
+
 from rich.live import Live
 from rich.spinner import Spinner
 from rich.table import Table
 from rich.text import Text
-from .metrics import display_metrics, extract_metrics
+from .constants import STREAMING_FRAMES_PER_SECOND
+from .incremental_markdown import IncrementalMarkdown
+from .metrics import display_metrics, extract_metrics, format_metrics_plain
 
 class StreamingManager:
     """Manages streaming responses for Ollama API calls"""
 
-    def __init__(self, console):
+    def __init__(self, console, plain=False):
         """Initialize the streaming manager
 
         Args:
             console: Rich console for output
+            plain: Write raw tokens to the console's file instead of using Rich live rendering
         """
         self.console = console
+        self.plain = plain
 
     def _create_working_display(self):
         """Create a display showing working status with spinner"""
@@ -32,29 +38,38 @@ class StreamingManager:
         table.add_row(header)
         return table
 
-    def _create_content_display(self, content, thinking_content="", show_thinking=True, has_tool_calls=False):
-        """Create a display for content with optional thinking section"""
+    def _compose_content(self, content, thinking_content="", show_thinking=True, has_tool_calls=False):
+        """Compose the Markdown text for content with optional thinking section"""
         if thinking_content and show_thinking:
             # Only add separator and Answer label if there's actual content
             if content:
                 if has_tool_calls:
-                    combined_content = thinking_content + "\n\n---\n\n" + content
-                else:
-                    combined_content = thinking_content + "\n\n---\n\n**Answer:**\n\n" + content
-            else:
-                # No content, just show thinking
-                combined_content = thinking_content
-            return Markdown(combined_content)
-        else:
-            # Don't add "Answer:" label when tools are being called or when content is empty
-            if has_tool_calls or not content:
-                return Markdown(content)
-            else:
-                return Markdown("**Answer:**\n\n" + content)
+                    return thinking_content + "\n\n---\n\n" + content
+                return thinking_content + "\n\n---\n\n**Answer:**\n\n" + content
+            # No content, just show thinking
+            return thinking_content
+        # Don't add "Answer:" label when tools are being called or when content is empty
+        if has_tool_calls or not content:
+            return content
+        return "**Answer:**\n\n" + content
+
+    async def _refresh_frames(self, render_frame):
+        """Call render_frame once per frame until cancelled
+
+        Args:
+            render_frame: Function that renders pending changes to the live display
+        """
+        while True:
+            await asyncio.sleep(1 / STREAMING_FRAMES_PER_SECOND)
+            render_frame()
 
     async def process_streaming_response(self, stream, print_response=True, thinking_mode=False, show_thinking=True, show_metrics=False):
         """Process a streaming response from Ollama with status spinner and content updates
 
+        Chunks only update the accumulated text; the display is redrawn at most
+        STREAMING_FRAMES_PER_SECOND times per second, and only the unfinished
+        trailing Markdown block is parsed again on each redraw.
+
         Args:
             stream: Async iterator of response chunks
             print_response: Flag to control live updating of response text
@@ -67,6 +82,9 @@ class StreamingManager:
             list: Tool calls if any
             dict: Metrics if captured, None otherwise
         """
+        if print_response and self.plain:
+            return await self._process_plain_response(stream, thinking_mode, show_thinking, show_metrics)
+
         accumulated_text = ""
         thinking_content = ""
         tool_calls = []
@@ -74,67 +92,77 @@ class StreamingManager:
         metrics = None  # Store metrics from final chunk
 
         if print_response:
-            with Live(console=self.console, refresh_per_second=10, vertical_overflow='visible') as live:
+            display = IncrementalMarkdown()
+            display_thinking = True  # Thinking stays visible until the answer starts
+            dirty = False  # Whether the text changed since the last frame
+
+            # The display is only refreshed from this task, so it is never
+            # rendered while a chunk is being added to it
+            with Live(console=self.console, auto_refresh=False, vertical_overflow='visible') as live:
                 # Start with working display
-                live.update(self._create_working_display())
+                live.update(self._create_working_display(), refresh=True)
 
-                async for chunk in stream:
-                    # Capture metrics when chunk is done
-                    extracted_metrics = extract_metrics(chunk)
-                    if extracted_metrics:
-                        metrics = extracted_metrics
+                def render_frame():
+                    nonlocal dirty
+                    if showing_working:
+                        # Keep the spinner moving while waiting for the first chunk
+                        live.refresh()
+                        return
+                    if not dirty:
+                        return
+                    dirty = False
+                    display.set_text(self._compose_content(
+                        accumulated_text, thinking_content, display_thinking, has_tool_calls=bool(tool_calls)
+                    ))
+                    live.update(display, refresh=True)
 
-                    # Handle thinking content
-                    if (thinking_mode and hasattr(chunk, 'message') and
-                        hasattr(chunk.message, 'thinking') and chunk.message.thinking):
+                refresher = asyncio.create_task(self._refresh_frames(render_frame))
+                try:
+                    async for chunk in stream:
+                        # Capture metrics when chunk is done
+                        extracted_metrics = extract_metrics(chunk)
+                        if extracted_metrics:
+                            metrics = extracted_metrics
 
-                        if not thinking_content:
-                            thinking_content = "🤔 **Thinking:**\n\n"
-                        thinking_content += chunk.message.thinking
+                        # Handle thinking content
+                        if (thinking_mode and hasattr(chunk, 'message') and
+                            hasattr(chunk.message, 'thinking') and chunk.message.thinking):
 
-                        # Hide working display and show thinking content
-                        if showing_working:
+                            if not thinking_content:
+                                thinking_content = "🤔 **Thinking:**\n\n"
+                            thinking_content += chunk.message.thinking
+
+                            # Hide working display and show thinking content
                             showing_working = False
+                            dirty = True
 
-                        display = self._create_content_display(
-                            accumulated_text, thinking_content, show_thinking=True, has_tool_calls=False
-                        )
-                        live.update(display)
+                        # Handle regular content
+                        if (hasattr(chunk, 'message') and hasattr(chunk.message, 'content') and
+                            chunk.message.content):
 
-                    # Handle regular content
-                    if (hasattr(chunk, 'message') and hasattr(chunk.message, 'content') and
-                        chunk.message.content):
+                            accumulated_text += chunk.message.content
 
-                        accumulated_text += chunk.message.content
+                            # Hide working display and show content based on thinking visibility
+                            showing_working = False
+                            display_thinking = show_thinking
+                            dirty = True
 
-                        # Hide working display and show content
-                        if showing_working:
+                        # Handle tool calls
+                        if (hasattr(chunk, 'message') and hasattr(chunk.message, 'tool_calls') and
+                            chunk.message.tool_calls):
+                            # Hide working display and show final content if any before tool calls
                             showing_working = False
+                            display_thinking = show_thinking
+                            dirty = True
+
+                            for tool in chunk.message.tool_calls:
+                                tool_calls.append(tool)
+                finally:
+                    refresher.cancel()
+                    await asyncio.gather(refresher, return_exceptions=True)
 
-                        # Update display based on thinking mode
-                        display = self._create_content_display(
-                            accumulated_text, thinking_content, show_thinking, has_tool_calls=False
-                        )
-                        live.update(display)
-
-                    # Handle tool calls
-                    if (hasattr(chunk, 'message') and hasattr(chunk.message, 'tool_calls') and
-                        chunk.message.tool_calls):
-                        # Hide working display and show final content if any before tool calls
-                        showing_working = False
-
-                        for tool in chunk.message.tool_calls:
-                            tool_calls.append(tool)
-
-                        # Show final content display if we have any accumulated text
-                        if accumulated_text or thinking_content:
-                            display = self._create_content_display(
-                                accumulated_text, thinking_content, show_thinking, has_tool_calls=True
-                            )
-                            live.update(display)
-                        else:
-                            # Clear the working display by showing empty content
-                            live.update(Markdown(""))
+                # Draw whatever arrived since the last frame
+                render_frame()
 
             # Add spacing after streaming completes only if we showed content and no tool calls
             if not showing_working and not tool_calls:
@@ -165,3 +193,75 @@ class StreamingManager:
                         tool_calls.append(tool)
 
         return accumulated_text, tool_calls, metrics
+
+    async def _process_plain_response(self, stream, thinking_mode=False, show_thinking=True, show_metrics=False):
+        """Process a streaming response by writing raw tokens to the console's file
+
+        Tokens are buffered and flushed once per frame, so scripted and piped
+        runs skip Rich layout entirely. Thinking text, when shown, is written
+        between plain delimiter lines.
+
+        Args:
+            stream: Async iterator of response chunks
+            thinking_mode: Whether to handle thinking mode responses
+            show_thinking: Whether to write thinking text
+            show_metrics: Whether to write performance metrics when streaming completes
+
+        Returns:
+            str: Accumulated response text
+            list: Tool calls if any
+            dict: Metrics if captured, None otherwise
+        """
+        output = self.console.file
+        accumulated_text = ""
+        tool_calls = []
+        metrics = None
+        in_thinking = False
+        last_flush = time.monotonic()
+        wrote_text = False
+        ends_with_newline = True
+
+        def write(text):
+            nonlocal last_flush, wrote_text, ends_with_newline
+            output.write(text)
+            wrote_text = True
+            ends_with_newline = text.endswith("\n")
+            now = time.monotonic()
+            if now - last_flush >= 1 / STREAMING_FRAMES_PER_SECOND:
+                output.flush()
+                last_flush = now
+
+        async for chunk in stream:
+            extracted_metrics = extract_metrics(chunk)
+            if extracted_metrics:
+                metrics = extracted_metrics
+
+            message = getattr(chunk, 'message', None)
+            if message is None:
+                continue
+
+            if thinking_mode and show_thinking and getattr(message, 'thinking', None):
+                if not in_thinking:
+                    write("--- thinking ---\n")
+                    in_thinking = True
+                write(message.thinking)
+
+            if getattr(message, 'content', None):
+                if in_thinking:
+                    write("\n--- end thinking ---\n")
+                    in_thinking = False
+                accumulated_text += message.content
+                write(message.content)
+
+            if getattr(message, 'tool_calls', None):
+                tool_calls.extend(message.tool_calls)
+
+        if in_thinking:
+            write("\n--- end thinking ---\n")
+        if wrote_text and not ends_with_newline:
+            output.write("\n")
+        if show_metrics and metrics:
+            output.write(format_metrics_plain(metrics) + "\n")
+        output.flush()
+
+        return accumulated_text, tool_calls, metrics
@@ -10,14 +10,14 @@ from rich.panel import Panel
 from rich.syntax import Syntax
 from rich.text import Text
 from typing import Any
-from rich.markdown import Markdown
 
 
 class ToolDisplayManager:
     """Manages the display of tool calls and responses"""
 
-    def __init__(self, console: Console):
+    def __init__(self, console: Console, plain: bool = False):
         self.console = console
+        self.plain = plain  # Write delimited plain text instead of Rich panels
 
     def _format_json(self, data: Any) -> Syntax:
         """Format data as JSON with syntax highlighting
@@ -49,6 +49,10 @@ class ToolDisplayManager:
         if not show:
             return
 
+        if self.plain:
+            self.console.file.write(f"--- tool call: {tool_name} ---\n{json.dumps(tool_args)}\n")
+            return
+
         args_display = self._format_json(tool_args)
 
         # Create the tool execution panel with JSON syntax highlighting
@@ -76,6 +80,10 @@ class ToolDisplayManager:
         if not show:
             return
 
+        if self.plain:
+            self.console.file.write(f"--- tool result: {tool_name} ---\n{tool_response}\n--- end tool result ---\n")
+            return
+
         args_display = self._format_json(tool_args)
 
         # Try to format response as JSON if possible, otherwise check for markdown patterns
@@ -90,6 +98,9 @@ class ToolDisplayManager:
             # Response is not JSON - check if it has enough markdown patterns
             markdown_count = self._count_markdown_patterns(tool_response)
             if markdown_count > 7: # Arbitrary threshold for markdown patterns
+                # rich.markdown pulls in markdown-it, so it is imported only when needed
+                from rich.markdown import Markdown
+
                 response_display = Markdown(tool_response)
             else:
                 # Not enough markdown patterns - use plain text
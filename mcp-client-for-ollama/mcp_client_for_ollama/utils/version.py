@@ -1,35 +1,126 @@
-"""Version handling utilities for MCP Client for Ollama."""
+"""Version handling utilities for MCP Client for Ollama.
+
+The latest version on PyPI is fetched in the background and stored on disk,
+so startup only reads the cached result and never waits on the network.
+"""
 
 import re
 import json
-import urllib.request
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
 from mcp_client_for_ollama import __version__
-from .constants import PYPI_PACKAGE_URL
+from .constants import PYPI_PACKAGE_URL, UPDATE_CHECK_CACHE_FILE, UPDATE_CHECK_TTL, UPDATE_CHECK_TIMEOUT
+
 
-def check_for_updates():
-    """Check if a newer version of the package is available on PyPI.
+def parse_version(version_str: str) -> Tuple[int, ...]:
+    """Parse a version string into a tuple of integers for comparison
+
+    Args:
+        version_str: Version string such as 0.1.11
 
     Returns:
-        Tuple[bool, str, str]: (update_available, current_version, latest_version)
+        Tuple of the numbers in the version string
     """
-    current_version = __version__
+    return tuple(map(int, re.findall(r'\d+', version_str)))
+
+
+def read_update_cache(cache_path: str = UPDATE_CHECK_CACHE_FILE) -> Optional[Dict[str, Any]]:
+    """Read the result of the last update check
+
+    Args:
+        cache_path: Path of the cache file
+
+    Returns:
+        Dict with 'checked_at' and 'latest_version' (None if the check failed), or None if there is no valid cache
+    """
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cache, dict) or not isinstance(cache.get("checked_at"), (int, float)):
+        return None
+    return cache
+
+
+def is_update_check_due(cache_path: str = UPDATE_CHECK_CACHE_FILE, ttl: float = UPDATE_CHECK_TTL) -> bool:
+    """Check whether the cached update check result has expired
+
+    Args:
+        cache_path: Path of the cache file
+        ttl: Seconds a cached result stays valid
+
+    Returns:
+        bool: True if there is no cached result or it is older than the TTL
+    """
+    cache = read_update_cache(cache_path)
+    return cache is None or time.time() - cache["checked_at"] > ttl
 
+
+def _write_update_cache(cache_path: str, latest_version: Optional[str]) -> None:
+    """Store the time of an update check and the latest version it found
+
+    Args:
+        cache_path: Path of the cache file
+        latest_version: Latest version on PyPI, or None if unknown
+    """
     try:
-        with urllib.request.urlopen(PYPI_PACKAGE_URL, timeout=5) as response:
-            data = json.load(response)
-            latest_version = data.get("info", {}).get("version", current_version)
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump({"checked_at": time.time(), "latest_version": latest_version}, f)
+    except OSError:
+        pass
+
+
+async def refresh_update_cache(cache_path: str = UPDATE_CHECK_CACHE_FILE,
+                               timeout: float = UPDATE_CHECK_TIMEOUT) -> Optional[str]:
+    """Fetch the latest version from PyPI and store it in the cache
 
-            # Compare versions (treating them as tuples of integers)
-            def parse_version(version_str):
-                # Extract numbers from version string (handles formats like 0.1.11)
-                return tuple(map(int, re.findall(r'\d+', version_str)))
+    The attempt is recorded before the request is sent, so hosts without
+    internet access, and sessions that end (cancelling the check) before PyPI
+    answers, only try again once the TTL has expired. Until a check succeeds,
+    the previously found version is kept.
 
-            current_parsed = parse_version(current_version)
-            latest_parsed = parse_version(latest_version)
+    Args:
+        cache_path: Path of the cache file
+        timeout: Seconds allowed for the request
 
-            update_available = latest_parsed > current_parsed
-            return update_available, current_version, latest_version
+    Returns:
+        The latest version, or None if it could not be fetched
+    """
+    import httpx
+
+    _write_update_cache(cache_path, (read_update_cache(cache_path) or {}).get("latest_version"))
+
+    try:
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            response = await client.get(PYPI_PACKAGE_URL)
+            response.raise_for_status()
+            latest_version = response.json().get("info", {}).get("version")
+    except (httpx.HTTPError, ValueError, AttributeError):
+        return None
 
-    except Exception:
-        # Return no update available on error
+    if isinstance(latest_version, str):
+        _write_update_cache(cache_path, latest_version)
+    return latest_version
+
+
+def check_for_updates(cache_path: str = UPDATE_CHECK_CACHE_FILE):
+    """Check if a newer version of the package is available, using the cached PyPI result.
+
+    Args:
+        cache_path: Path of the cache file
+
+    Returns:
+        Tuple[bool, str, str]: (update_available, current_version, latest_version)
+    """
+    current_version = __version__
+    cache = read_update_cache(cache_path)
+    latest_version = (cache or {}).get("latest_version")
+    if not isinstance(latest_version, str):
         return False, current_version, current_version
+
+    update_available = parse_version(latest_version) > parse_version(current_version)
+    return update_available, current_version, latest_version
@@ -0,0 +1,172 @@
+"""Test the agent loop of MCPClient.process_query."""
+
+import asyncio
+from types import SimpleNamespace
+
+from mcp import Tool
+from ollama import ChatResponse, Message
+from rich.console import Console
+
+from mcp_client_for_ollama.client import MCPClient
+from mcp_client_for_ollama.utils.conversation import ConversationBuffer
+
+
+class FakeOllama:
+    """Ollama client answering chat requests from a script.
+
+    Each script item is either the text of an answer or a list of
+    (tool name, arguments) tool calls; the last item is repeated.
+    """
+
+    def __init__(self, script, delay=0):
+        self.script = list(script)
+        self.delay = delay
+        self.requests = []
+
+    async def show(self, model):
+        return {"capabilities": ["completion", "tools"],
+                "modelinfo": {"general.architecture": "qwen2", "qwen2.context_length": 32768}}
+
+    async def chat(self, **params):
+        self.requests.append(params)
+        await asyncio.sleep(self.delay)
+        item = self.script.pop(0) if len(self.script) > 1 else self.script[0]
+
+        async def stream():
+            if isinstance(item, str):
+                yield ChatResponse(model="m", message=Message(role="assistant", content=item), done=False)
+            else:
+                tool_calls = [Message.ToolCall(function=Message.ToolCall.Function(name=name, arguments=args))
+                              for name, args in item]
+                yield ChatResponse(model="m", message=Message(role="assistant", content="", tool_calls=tool_calls),
+                                   done=False)
+            yield ChatResponse(model="m", message=Message(role="assistant", content=""), done=True,
+                               prompt_eval_count=100 + len(self.requests), eval_count=10)
+
+        return stream()
+
+
+class FakeSession:
+    """MCP session with an echo tool, counting its calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def initialize(self):
+        return SimpleNamespace(serverInfo=SimpleNamespace(name="srv", version="1.0"))
+
+    async def list_tools(self):
+        tool = Tool(name="echo", description="Echo the text",
+                    inputSchema={"type": "object", "properties": {"text": {"type": "string"}}})
+        return SimpleNamespace(tools=[tool])
+
+    async def call_tool(self, tool_name, tool_args):
+        self.calls += 1
+        return SimpleNamespace(content=[SimpleNamespace(text=f"echo:{tool_args.get('text')}")], isError=False)
+
+
+def _run_query(script, delay=0, conversation=None, **settings):
+    """Run one query on a client connected to a fake server
+
+    The query is added to the given conversation, by default the
+    interactive one.
+
+    Returns:
+        Tuple of (response text, client, fake ollama, fake session, number of payload builds)
+    """
+    client = MCPClient(console=Console(quiet=True))
+    ollama = FakeOllama(script, delay)
+    client.ollama = client.model_manager.ollama = client.model_manager.capabilities.ollama = ollama
+    client.hil_manager.set_enabled(False)
+    client.stream_responses = False
+    for key, value in settings.items():
+        setattr(client, key, value)
+
+    connector = client.server_connector
+    connector.tool_catalog = None
+    session = FakeSession()
+
+    async def fake_open_session(server, exit_stack):
+        return session
+
+    connector._open_session = fake_open_session
+
+    builds = []
+    get_tool_payload = client.tool_manager.get_tool_payload
+
+    def counting_get_tool_payload(*args, **kwargs):
+        builds.append(1)
+        return get_tool_payload(*args, **kwargs)
+
+    client.tool_manager.get_tool_payload = counting_get_tool_payload
+
+    async def run():
+        servers = [{"name": "srv", "type": "config", "config": {}}]
+        connector.configured_servers = {server["name"]: server for server in servers}
+        await connector._connect_and_register(servers)
+        client.tool_manager.set_available_tools(connector.available_tools)
+        client.tool_manager.set_enabled_tools(connector.enabled_tools)
+        try:
+            return await client.process_query("echo hello", conversation)
+        finally:
+            await connector.exit_stack.aclose()
+
+    response = asyncio.run(run())
+    return response, client, ollama, session, len(builds)
+
+
+def test_loop_stops_at_the_round_limit_without_tools_in_the_final_round():
+    """A model that keeps calling tools gets a last request without tools and must answer."""
+    response, client, ollama, session, builds = _run_query(
+        [[("srv.echo", {"text": "hi"})]], max_tool_rounds=2
+    )
+
+    assert len(ollama.requests) == 3
+    assert ["tools" in request for request in ollama.requests] == [True, True, False]
+    assert ollama.requests[0]["tools"] is ollama.requests[1]["tools"]
+    assert builds == 1
+    # Tool calls in the final round are not executed
+    assert session.calls == 2
+    assert response == ""
+
+    rounds = client.last_query_rounds
+    assert [stats["round"] for stats in rounds] == [1, 2, 3]
+    assert [stats["tool_calls"] for stats in rounds] == [1, 1, 0]
+    assert [stats["prompt_eval_count"] for stats in rounds] == [101, 102, 103]
+    assert all(stats["eval_count"] == 10 and stats["duration"] >= 0 for stats in rounds)
+    tool_messages = [message for message in client.conversation.get_request_messages(True)
+                     if message["role"] == "tool"]
+    assert [message["content"] for message in tool_messages] == ["echo:hi", "echo:hi"]
+
+
+def test_loop_stops_offering_tools_when_the_time_budget_is_spent():
+    """Once the query's time budget has run out, the next request goes without tools."""
+    response, client, ollama, session, builds = _run_query(
+        [[("srv.echo", {"text": "hi"})], "Done"], delay=0.05, query_time_budget=0.03
+    )
+
+    assert ["tools" in request for request in ollama.requests] == [True, False]
+    assert response == "Done"
+    assert [stats["tool_calls"] for stats in client.last_query_rounds] == [1, 0]
+    assert builds == 1
+
+
+def test_loop_ends_when_the_model_answers():
+    """An answer without tool calls ends the loop before the limits are reached."""
+    response, client, ollama, session, builds = _run_query(
+        [[("srv.echo", {"text": "a"}), ("srv.echo", {"text": "b"})], "Both echoed"]
+    )
+
+    assert response == "Both echoed"
+    assert ["tools" in request for request in ollama.requests] == [True, True]
+    assert session.calls == 2
+    assert [stats["tool_calls"] for stats in client.last_query_rounds] == [2, 0]
+
+
+def test_tool_payload_size_is_published_for_the_interactive_conversation_only():
+    """Concurrent batch queries keep their payload size to themselves."""
+    _, client, _, _, _ = _run_query([[("srv.echo", {"text": "a"})], "Done"])
+    assert client.tools_payload_size > 0
+
+    _, client, _, _, _ = _run_query([[("srv.echo", {"text": "a"})], "Done"], conversation=ConversationBuffer())
+    assert client.tools_payload_size == 0
@@ -0,0 +1,93 @@
+"""Test the batch query mode."""
+
+import asyncio
+import io
+import json
+
+import pytest
+
+from mcp_client_for_ollama.batch import BatchRunner, load_prompts, percentile, read_checkpoint
+
+
+class FakeClient:
+    """Client answering prompts and recording one round per query."""
+
+    def __init__(self, delay=0):
+        self.conversations = []
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+
+    async def process_query(self, query, conversation=None, rounds=None):
+        self.conversations.append(conversation)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        if query == "fail":
+            raise RuntimeError("model error")
+        rounds.append({"round": 1, "tool_calls": 2, "prompt_eval_count": 10, "eval_count": 5})
+        return query.upper()
+
+
+def test_load_prompts(tmp_path):
+    """Strings and objects are accepted; blank lines are skipped."""
+    path = tmp_path / "prompts.jsonl"
+    path.write_text('"first"\n\n{"id": "b", "prompt": "second"}\n')
+
+    assert load_prompts(str(path)) == [{"id": 1, "prompt": "first"}, {"id": "b", "prompt": "second"}]
+
+    path.write_text('{"text": "no prompt"}\n')
+    with pytest.raises(ValueError):
+        load_prompts(str(path))
+
+
+def test_batch_results_are_json_lines():
+    """Each prompt gets its own conversation and a JSON result with metrics."""
+    client = FakeClient()
+    output = io.StringIO()
+    prompts = [{"id": 1, "prompt": "hello"}, {"id": 2, "prompt": "fail"}]
+
+    results = asyncio.run(BatchRunner(client, output).run(prompts))
+
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert lines == results
+    assert lines[0]["response"] == "HELLO"
+    assert lines[0]["metrics"]["tool_calls"] == 2
+    assert lines[1]["error"] == "RuntimeError: model error"
+    assert client.conversations[0] is not client.conversations[1]
+
+
+def test_worker_pool_bounds_concurrency():
+    """At most `concurrency` prompts run at once and every prompt is answered."""
+    client = FakeClient(delay=0.01)
+    prompts = [{"id": i, "prompt": f"p{i}"} for i in range(10)]
+
+    results = asyncio.run(BatchRunner(client, io.StringIO(), concurrency=3).run(prompts))
+
+    assert client.peak == 3
+    assert sorted(result["id"] for result in results) == list(range(10))
+
+
+def test_resume_skips_completed_prompts(tmp_path):
+    """Prompts that succeeded before are skipped; failed and cut-off ones run again."""
+    path = tmp_path / "results.jsonl"
+    path.write_text(
+        '{"id": 1, "error": null}\n{"id": 2, "error": "RuntimeError: boom"}\n{"id": 3, "err'
+    )
+    completed = read_checkpoint(str(path))
+    assert completed == {1}
+
+    runner = BatchRunner(FakeClient(), io.StringIO(), completed_ids=completed)
+    results = asyncio.run(runner.run([{"id": i, "prompt": f"p{i}"} for i in (1, 2, 3)]))
+
+    assert [result["id"] for result in results] == [2, 3]
+    assert runner.skipped == 1
+
+
+def test_percentile():
+    """Percentiles use the nearest-rank method."""
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 0.5) == 50.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([], 0.5) == 0.0
@@ -0,0 +1,78 @@
+"""Test concurrent URL connectivity probing."""
+
+import asyncio
+import socket
+import time
+
+from mcp_client_for_ollama.utils import connection
+
+
+async def _serve_once(status_line):
+    """Start a local HTTP server answering every request with the given status."""
+    async def handle(reader, writer):
+        await reader.readuntil(b"\r\n\r\n")
+        writer.write(f"HTTP/1.1 {status_line}\r\nContent-Length: 0\r\nConnection: close\r\n\r\n".encode())
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/mcp"
+
+
+async def _silent_server():
+    """Start a server that accepts connections but never answers."""
+    async def handle(reader, writer):
+        await asyncio.sleep(10)
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/sse"
+
+
+def _closed_port_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/mcp"
+
+
+def test_probes_share_one_timeout_budget():
+    """Any HTTP status counts as reachable; hung servers only cost the shared budget."""
+    async def run():
+        connection.clear_probe_cache()
+        ok_server, ok_url = await _serve_once("405 Method Not Allowed")
+        hung = [await _silent_server() for _ in range(3)]
+        refused_url = _closed_port_url()
+
+        start = time.perf_counter()
+        results = await connection.probe_urls([ok_url, refused_url] + [url for _, url in hung], timeout=0.5)
+        elapsed = time.perf_counter() - start
+
+        for server in [ok_server] + [server for server, _ in hung]:
+            server.close()
+        return results, ok_url, refused_url, hung, elapsed
+
+    results, ok_url, refused_url, hung, elapsed = asyncio.run(run())
+
+    assert results[ok_url]["reachable"] and results[ok_url]["status"] == 405
+    assert not results[refused_url]["reachable"]
+    assert not any(results[url]["reachable"] for _, url in hung)
+    assert elapsed < 1.5
+    assert connection.get_probe_result(ok_url) is results[ok_url]
+
+
+def test_cached_results_are_reused():
+    """A recent probe result is returned without probing the URL again."""
+    async def run():
+        connection.clear_probe_cache()
+        server, url = await _serve_once("200 OK")
+        first = await connection.probe_urls([url])
+        server.close()
+        await server.wait_closed()
+        second = await connection.probe_urls([url])
+        third = await connection.probe_urls([url], max_age=0)
+        return first[url], second[url], third[url]
+
+    first, second, third = asyncio.run(run())
+
+    assert second is first and second["reachable"]
+    assert not third["reachable"]
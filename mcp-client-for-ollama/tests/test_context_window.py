@@ -0,0 +1,69 @@
+"""Test the token-budgeted context window manager."""
+
+import asyncio
+from types import SimpleNamespace
+
+from mcp_client_for_ollama.utils.context_window import ContextWindowManager
+from mcp_client_for_ollama.utils.conversation import ConversationBuffer
+
+
+class FakeOllama:
+    """Ollama client returning a fixed summary."""
+
+    def __init__(self):
+        self.requests = []
+
+    async def chat(self, **kwargs):
+        self.requests.append(kwargs)
+        return SimpleNamespace(message=SimpleNamespace(content="<think>hmm</think>earlier summary"))
+
+
+def _build_conversation(turns, size=400):
+    buffer = ConversationBuffer()
+    buffer.set_system_prompt("be brief")
+    for i in range(turns):
+        buffer.begin_turn(f"q{i} " + "x" * size)
+        buffer.end_turn(f"a{i} " + "y" * size)
+    return buffer
+
+
+def test_oldest_turns_are_dropped_to_fit_budget():
+    """Only as many old turns as needed are dropped; the system prompt stays."""
+    buffer = _build_conversation(5)
+    manager = ContextWindowManager()
+    buffer.begin_turn("current")
+
+    removed = asyncio.run(manager.fit(buffer, extra_size=0, budget=600))
+
+    assert removed == 3
+    assert manager.estimate_tokens(buffer.total_size) <= 600
+    assert buffer.messages[0] == {"role": "system", "content": "be brief"}
+    assert buffer.messages[1]["content"].startswith("q3")
+    assert buffer.messages[-1]["content"] == "current"
+    assert len(buffer.history) == 5
+
+
+def test_summarize_strategy_pins_summary():
+    """Trimmed turns are replaced by a summary right after the system prompt."""
+    buffer = _build_conversation(5)
+    ollama = FakeOllama()
+    manager = ContextWindowManager(ollama=ollama, strategy="summarize")
+
+    asyncio.run(manager.fit(buffer, extra_size=0, budget=600, model="qwen3"))
+
+    assert buffer.summary == "earlier summary"
+    assert buffer.messages[1]["role"] == "system"
+    assert "earlier summary" in buffer.messages[1]["content"]
+    assert "q0" in ollama.requests[0]["messages"][1]["content"]
+
+
+def test_calibration_ignores_implausible_counts():
+    """prompt_eval_count refines the estimate unless it only covers part of the prompt."""
+    manager = ContextWindowManager()
+    manager.calibrate(3000, 1000)
+    assert 3.0 < manager.chars_per_token < 4.0
+
+    ratio = manager.chars_per_token
+    manager.calibrate(3000, 10)
+    assert manager.chars_per_token == ratio
+    assert manager.last_prompt_tokens == 10
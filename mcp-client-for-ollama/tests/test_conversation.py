@@ -0,0 +1,65 @@
+"""Test the conversation buffer."""
+
+from mcp_client_for_ollama.utils.conversation import ConversationBuffer
+
+
+def _complete_turn(buffer, query, response, tool_result=None):
+    buffer.begin_turn(query)
+    if tool_result is not None:
+        buffer.append({"role": "assistant", "content": "", "tool_calls": [{"function": {"name": "s.t", "arguments": {}}}]})
+        buffer.append({"role": "tool", "content": tool_result, "name": "s.t"})
+    buffer.end_turn(response)
+
+
+def test_turns_are_appended_with_tool_messages():
+    """Tool messages from earlier turns stay in the conversation."""
+    buffer = ConversationBuffer()
+    buffer.set_system_prompt("be brief")
+    _complete_turn(buffer, "first", "answer 1", tool_result="42")
+    _complete_turn(buffer, "second", "answer 2")
+
+    roles = [message["role"] for message in buffer.messages]
+    assert roles == ["system", "user", "assistant", "tool", "assistant", "user", "assistant"]
+    assert buffer.history == [
+        {"query": "first", "response": "answer 1"},
+        {"query": "second", "response": "answer 2"},
+    ]
+
+
+def test_request_messages_without_context():
+    """Without context retention only the system prompt and current turn are sent."""
+    buffer = ConversationBuffer()
+    buffer.set_system_prompt("be brief")
+    _complete_turn(buffer, "first", "answer 1")
+    buffer.begin_turn("second")
+
+    assert buffer.get_request_messages(retain_context=True) is buffer.messages
+    assert [m["content"] for m in buffer.get_request_messages(retain_context=False)] == ["be brief", "second"]
+
+
+def test_system_prompt_changes_and_rollback():
+    """The system prompt is replaced in place and failed turns are discarded."""
+    buffer = ConversationBuffer()
+    _complete_turn(buffer, "first", "answer 1")
+    buffer.set_system_prompt("new prompt")
+    assert buffer.messages[0] == {"role": "system", "content": "new prompt"}
+
+    buffer.begin_turn("failing")
+    buffer.append({"role": "tool", "content": "partial", "name": "s.t"})
+    buffer.rollback_turn()
+    assert len(buffer.messages) == 3
+
+    buffer.set_system_prompt("")
+    assert buffer.messages[0]["role"] == "user"
+
+
+def test_clear_keeps_system_prompt():
+    """Clearing removes all turns but keeps the system prompt."""
+    buffer = ConversationBuffer()
+    buffer.set_system_prompt("be brief")
+    _complete_turn(buffer, "first", "answer 1")
+    _complete_turn(buffer, "second", "answer 2")
+
+    assert buffer.clear() == 2
+    assert buffer.messages == [{"role": "system", "content": "be brief"}]
+    assert len(buffer) == 0
@@ -0,0 +1,61 @@
+"""Test incremental Markdown rendering of streamed text."""
+
+import io
+
+from rich.console import Console
+from rich.markdown import Markdown
+
+from mcp_client_for_ollama.utils.incremental_markdown import IncrementalMarkdown
+
+DOCUMENT = """**Answer:**
+
+# Title
+
+Some paragraph with *emphasis* and `code`.
+
+```python
+def f():
+
+    return 1
+```
+
+1. first
+2. second
+
+> quote
+
+Final paragraph."""
+
+
+def _render(renderable):
+    console = Console(file=io.StringIO(), width=60, record=True)
+    console.print(renderable)
+    return console.export_text()
+
+
+def test_streamed_output_matches_full_render():
+    """Appending chunk by chunk renders the same as parsing the whole text."""
+    display = IncrementalMarkdown()
+    for i in range(0, len(DOCUMENT), 7):
+        display.append(DOCUMENT[i:i + 7])
+        _render(display)
+
+    assert _render(display) == _render(Markdown(DOCUMENT))
+
+
+def test_blank_lines_in_code_fence_do_not_freeze():
+    """A blank line inside an open code fence does not complete a block."""
+    display = IncrementalMarkdown("intro\n\n```\nline\n\nmore")
+    assert display._blocks == ["intro"]
+    assert display._tail == "```\nline\n\nmore"
+
+
+def test_set_text_only_processes_new_text():
+    """Extending the text keeps frozen blocks; a different text starts over."""
+    display = IncrementalMarkdown("one\n\ntwo")
+    display.set_text("one\n\ntwo\n\nthree")
+    assert display._blocks == ["one", "two"]
+
+    display.set_text("other")
+    assert display._blocks == []
+    assert display.text == "other"
@@ -0,0 +1,65 @@
+"""Test the model capability cache."""
+
+import asyncio
+
+from mcp_client_for_ollama.models.capabilities import ModelCapabilityCache
+
+
+class FakeOllama:
+    """Ollama client counting show() calls."""
+
+    def __init__(self):
+        self.show_calls = 0
+
+    async def show(self, model):
+        self.show_calls += 1
+        return {
+            "capabilities": ["completion", "tools", "thinking"],
+            "modelinfo": {"general.architecture": "qwen3", "qwen3.context_length": 40960},
+        }
+
+
+def test_lookups_are_cached():
+    """Repeated lookups only query Ollama once."""
+    ollama = FakeOllama()
+    cache = ModelCapabilityCache(ollama)
+
+    async def run():
+        assert "thinking" in await cache.get_capabilities("qwen3")
+        assert await cache.get_context_length("qwen3:latest") == 40960
+        assert "tools" in await cache.get_capabilities("qwen3")
+
+    asyncio.run(run())
+    assert ollama.show_calls == 1
+
+
+def test_new_digest_invalidates_entry():
+    """A changed digest from ollama.list() forces a fresh lookup."""
+    ollama = FakeOllama()
+    cache = ModelCapabilityCache(ollama)
+    cache.update_digests([{"model": "qwen3:8b", "digest": "aaa"}])
+
+    asyncio.run(cache.get("qwen3:8b"))
+    cache.update_digests([{"model": "qwen3:8b", "digest": "aaa"}])
+    asyncio.run(cache.get("qwen3:8b"))
+    assert ollama.show_calls == 1
+
+    cache.update_digests([{"model": "qwen3:8b", "digest": "bbb"}])
+    asyncio.run(cache.get("qwen3:8b"))
+    assert ollama.show_calls == 2
+    assert cache.get_cached("qwen3:8b")["digest"] == "bbb"
+
+
+def test_invalidate():
+    """Explicit invalidation drops a single model or everything."""
+    ollama = FakeOllama()
+    cache = ModelCapabilityCache(ollama)
+
+    asyncio.run(cache.get("a:1"))
+    asyncio.run(cache.get("b:1"))
+    cache.invalidate("a:1")
+    assert cache.get_cached("a:1") is None
+    assert cache.get_cached("b:1") is not None
+
+    cache.invalidate()
+    assert cache.get_cached("b:1") is None
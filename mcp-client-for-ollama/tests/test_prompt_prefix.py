@@ -0,0 +1,60 @@
+"""Test prompt prefix canonicalization and change tracking."""
+
+import json
+
+from mcp_client_for_ollama.utils.prompt_prefix import PromptPrefixTracker, canonicalize_schema
+
+
+def test_canonicalize_schema_sorts_keys_recursively():
+    """Schemas with different key order serialize identically; lists keep their order."""
+    a = {"type": "object", "properties": {"b": {"type": "string"}, "a": {"enum": ["y", "x"], "type": "string"}}}
+    b = {"properties": {"a": {"type": "string", "enum": ["y", "x"]}, "b": {"type": "string"}}, "type": "object"}
+
+    assert json.dumps(canonicalize_schema(a)) == json.dumps(canonicalize_schema(b))
+    assert canonicalize_schema(a)["properties"]["a"]["enum"] == ["y", "x"]
+
+
+def test_appending_messages_keeps_prefix():
+    """Only appends keep the prefix; edits, trims and tool changes are reported."""
+    tracker = PromptPrefixTracker()
+    messages = [{"role": "system", "content": "s"}, {"role": "user", "content": "q1"}]
+
+    assert tracker.observe("m", {}, "[tools]", list(messages)) is None
+    messages += [{"role": "assistant", "content": "a1"}, {"role": "user", "content": "q2"}]
+    assert tracker.observe("m", {}, "[tools]", list(messages)) is None
+
+    trimmed = [messages[0], messages[3]]
+    change = tracker.observe("m", {}, "[tools]", trimmed)
+    assert change == {"reason": "earlier messages changed or were trimmed (kept 1 of 4)", "reused_messages": 1}
+
+    assert tracker.observe("m", {}, "[other tools]", trimmed)["reason"] == "tool definitions changed"
+    assert tracker.observe("m", {}, "[other tools]", [{"role": "system", "content": "new"}])["reason"] == "system prompt changed"
+    assert tracker.cache_busts == 3
+
+
+def test_only_new_messages_are_hashed(monkeypatch):
+    """Messages seen in the previous request keep their fingerprints; equal copies are not a change."""
+    from mcp_client_for_ollama.utils import prompt_prefix
+
+    hashed = []
+    fingerprint = prompt_prefix._fingerprint
+
+    def counting_fingerprint(value):
+        hashed.append(value)
+        return fingerprint(value)
+
+    monkeypatch.setattr(prompt_prefix, "_fingerprint", counting_fingerprint)
+    tracker = PromptPrefixTracker()
+    messages = [{"role": "system", "content": "s"}] + [{"role": "user", "content": f"q{n}"} for n in range(50)]
+
+    assert tracker.observe("m", {}, "[tools]", messages) is None
+    hashed.clear()
+    messages.append({"role": "assistant", "content": "a"})
+    assert tracker.observe("m", {}, "[tools]", messages) is None
+    # The model settings and the appended message
+    assert len(hashed) == 2
+
+    hashed.clear()
+    messages[0] = {"role": "system", "content": "s"}
+    assert tracker.observe("m", {}, "[tools]", messages) is None
+    assert len(hashed) == 2 and tracker.cache_busts == 0
@@ -0,0 +1,362 @@
+"""Test concurrent server connection in the ServerConnector."""
+
+import asyncio
+import json
+from contextlib import AsyncExitStack
+from types import SimpleNamespace
+
+import anyio
+import pytest
+from mcp import Tool
+from rich.console import Console
+
+from mcp_client_for_ollama.server.catalog import ToolCatalogCache
+from mcp_client_for_ollama.server.connector import ServerConnector
+from mcp_client_for_ollama.tools.executor import ToolExecutor
+
+
+class FakeSession:
+    """Minimal stand-in for an MCP ClientSession."""
+
+    def __init__(self, name, delay, tracker):
+        self.name = name
+        self.delay = delay
+        self.tracker = tracker
+        self.dead = False
+
+    async def initialize(self):
+        self.tracker["active"] += 1
+        self.tracker["peak"] = max(self.tracker["peak"], self.tracker["active"])
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.tracker["active"] -= 1
+        return SimpleNamespace(serverInfo=SimpleNamespace(name=self.name, version="1.0"))
+
+    async def list_tools(self):
+        self.tracker["listed"] += 1
+        if "list_gate" in self.tracker:
+            await self.tracker["list_gate"].wait()
+        tool = Tool(name="echo", description="Echo", inputSchema={"type": "object"})
+        return SimpleNamespace(tools=[tool])
+
+    async def call_tool(self, tool_name, tool_args):
+        self.tracker.setdefault("listed_at_first_call", self.tracker["listed"])
+        if self.dead:
+            raise anyio.ClosedResourceError()
+        return f"{self.name}:{tool_name}"
+
+
+def _make_connector(delays, max_concurrency, connect_timeout=5.0, **kwargs):
+    tracker = {"active": 0, "peak": 0, "listed": 0, "opened": 0}
+    connector = ServerConnector(AsyncExitStack(), Console(quiet=True), max_concurrency=max_concurrency,
+                                connect_timeout=connect_timeout, **kwargs)
+
+    async def fake_open_session(server, exit_stack):
+        tracker["opened"] += 1
+        return FakeSession(server["name"], delays[server["name"]], tracker)
+
+    connector._open_session = fake_open_session
+    return connector, tracker
+
+
+def test_tools_registered_in_config_order():
+    """Servers finishing out of order still register tools in the given order."""
+    delays = {"first": 0.05, "second": 0.01, "third": 0.03}
+    connector, tracker = _make_connector(delays, max_concurrency=8)
+    servers = [{"name": name, "type": "config"} for name in delays]
+
+    async def run():
+        results = await connector._connect_concurrently(servers)
+        for server, result in zip(servers, results):
+            connector._register_server(server, *result)
+        await connector.exit_stack.aclose()
+
+    asyncio.run(run())
+
+    assert [tool.name for tool in connector.available_tools] == ["first.echo", "second.echo", "third.echo"]
+    assert tracker["peak"] == 3
+    assert set(connector.connect_latencies) == {"first", "second", "third"}
+
+
+def test_concurrency_cap_and_timeout():
+    """The concurrency cap is respected and slow servers are dropped on timeout."""
+    delays = {"fast": 0.01, "slow": 1.0, "other": 0.01}
+    connector, tracker = _make_connector(delays, max_concurrency=1, connect_timeout=0.2)
+    servers = [{"name": name, "type": "config"} for name in delays]
+
+    async def run():
+        results = await connector._connect_concurrently(servers)
+        await connector.exit_stack.aclose()
+        return results
+
+    results = asyncio.run(run())
+
+    assert tracker["peak"] == 1
+    assert results[0] is not None
+    assert results[1] is None
+    assert results[2] is not None
+
+
+def test_reload_restarts_only_changed_servers(tmp_path):
+    """Unchanged servers keep their session and tool selection across a reload."""
+    delays = {"keep": 0.01, "edit": 0.01, "drop": 0.01, "new": 0.01}
+    connector, _ = _make_connector(delays, max_concurrency=8)
+    config_path = tmp_path / "servers.json"
+
+    def write_config(servers):
+        config_path.write_text(json.dumps({"mcpServers": servers}))
+
+    async def run():
+        write_config({"keep": {"command": "a"}, "edit": {"command": "b"}, "drop": {"command": "c"}})
+        await connector.connect_to_servers(config_path=str(config_path))
+        connector.set_tool_status("keep.echo", False)
+        sessions = {name: entry["session"] for name, entry in connector.sessions.items()}
+
+        write_config({"new": {"command": "d"}, "keep": {"command": "a"}, "edit": {"command": "b2"}})
+        changes = await connector.reload_servers(config_path=str(config_path))
+        kept = connector.sessions["keep"]["session"] is sessions["keep"]
+        edited = connector.sessions["edit"]["session"] is sessions["edit"]
+        await connector.exit_stack.aclose()
+        return changes, kept, edited
+
+    changes, kept, edited = asyncio.run(run())
+
+    assert changes == {"added": ["new"], "removed": ["drop"], "restarted": ["edit"], "unchanged": ["keep"]}
+    assert kept and not edited
+    assert [tool.name for tool in connector.available_tools] == ["new.echo", "keep.echo", "edit.echo"]
+    assert connector.enabled_tools == {"keep.echo": False, "edit.echo": True, "new.echo": True}
+    assert not connector.lifecycles
+
+
+def test_restart_single_server():
+    """Restarting one server replaces only its session and keeps its tool selection."""
+    delays = {"one": 0.01, "two": 0.01}
+    connector, _ = _make_connector(delays, max_concurrency=8)
+    servers = [{"name": name, "type": "config"} for name in delays]
+
+    async def run():
+        connector.configured_servers = {server["name"]: server for server in servers}
+        await connector._connect_and_register(servers)
+        connector.set_tool_status("one.echo", False)
+        sessions = {name: entry["session"] for name, entry in connector.sessions.items()}
+
+        restarted = await connector.restart_server("one")
+        replaced = connector.sessions["one"]["session"] is not sessions["one"]
+        untouched = connector.sessions["two"]["session"] is sessions["two"]
+        disconnected = await connector.disconnect_server("two")
+        await connector.exit_stack.aclose()
+        return restarted, replaced, untouched, disconnected
+
+    restarted, replaced, untouched, disconnected = asyncio.run(run())
+
+    assert restarted and replaced and untouched and disconnected
+    assert [tool.name for tool in connector.available_tools] == ["one.echo"]
+    assert connector.enabled_tools == {"one.echo": False}
+    assert not connector.lifecycles
+
+
+def test_lost_session_reconnects_and_retries_idempotent_tools():
+    """A dead session is replaced; only idempotent calls are retried."""
+    delays = {"safe": 0.01, "unsafe": 0.01}
+    connector, _ = _make_connector(delays, max_concurrency=8)
+    servers = [
+        {"name": "safe", "type": "config", "config": {"idempotentTools": ["echo"]}},
+        {"name": "unsafe", "type": "config", "config": {}},
+    ]
+
+    async def run():
+        connector.configured_servers = {server["name"]: server for server in servers}
+        await connector._connect_and_register(servers)
+        for entry in connector.sessions.values():
+            entry["session"].dead = True
+
+        result = await connector.call_tool("safe", "echo", {})
+        with pytest.raises(ConnectionError, match="not retried"):
+            await connector.call_tool("unsafe", "echo", {})
+        retried = await connector.call_tool("unsafe", "echo", {})
+        await connector.exit_stack.aclose()
+        return result, retried
+
+    result, retried = asyncio.run(run())
+
+    assert result == "safe:echo"
+    assert retried == "unsafe:echo"
+    assert connector.reconnect_stats["safe"]["reconnects"] == 1
+    assert connector.reconnect_stats["unsafe"]["reconnects"] == 1
+    assert connector.reconnect_stats["unsafe"]["failed_reconnects"] == 0
+
+
+def test_lost_connection_is_a_tool_error_and_other_calls_keep_their_results():
+    """A call that cannot be retried after a lost session gives an error result instead of failing the round."""
+    delays = {"safe": 0.01, "unsafe": 0.01, "other": 0.01}
+    connector, _ = _make_connector(delays, max_concurrency=8)
+    servers = [
+        {"name": "safe", "type": "config", "config": {"idempotentTools": ["echo"]}},
+        {"name": "unsafe", "type": "config", "config": {}},
+        {"name": "other", "type": "config", "config": {}},
+    ]
+    executor = ToolExecutor(connector)
+
+    async def run():
+        connector.configured_servers = {server["name"]: server for server in servers}
+        await connector._connect_and_register(servers)
+        connector.sessions["safe"]["session"].dead = True
+        connector.sessions["unsafe"]["session"].dead = True
+
+        results = await executor.execute([("safe", "echo", {}), ("unsafe", "echo", {}), ("other", "echo", {})])
+        await connector.exit_stack.aclose()
+        return results
+
+    safe, unsafe, other = asyncio.run(run())
+
+    assert (safe, other) == ("safe:echo", "other:echo")
+    assert unsafe.isError
+    error = json.loads(unsafe.content[0].text)
+    assert (error["error"], error["tool"]) == ("connection_lost", "unsafe.echo")
+    assert "not retried" in error["message"]
+    assert connector.reconnect_stats["unsafe"]["reconnects"] == 1
+
+
+def test_cached_tool_catalog_connects_in_background(tmp_path):
+    """A second run offers cached tools at once and lists them in the background before the first call."""
+    config_path = tmp_path / "servers.json"
+    config_path.write_text(json.dumps({"mcpServers": {"one": {"command": "a"}}}))
+    catalog_path = str(tmp_path / "catalog.json")
+
+    async def run(connector):
+        await connector.connect_to_servers(config_path=str(config_path))
+        connecting = connector.is_connecting("one")
+        tools = [tool.name for tool in connector.available_tools]
+        result = await connector.call_tool("one", "echo", {})
+        await connector.exit_stack.aclose()
+        return connecting, tools, result
+
+    first, first_tracker = _make_connector({"one": 0.01}, 8, tool_catalog=ToolCatalogCache(catalog_path))
+    second, second_tracker = _make_connector({"one": 0.01}, 8, tool_catalog=ToolCatalogCache(catalog_path))
+
+    assert asyncio.run(run(first)) == (False, ["one.echo"], "one:echo")
+    assert asyncio.run(run(second)) == (True, ["one.echo"], "one:echo")
+    assert (first_tracker["listed"], second_tracker["listed"]) == (1, 1)
+    assert second_tracker["listed_at_first_call"] == 1
+
+
+def test_disconnect_while_cached_tools_are_listed_again(tmp_path):
+    """Disconnecting a server whose background connection is still listing its tools cancels that connection."""
+    config_path = tmp_path / "servers.json"
+    config_path.write_text(json.dumps({"mcpServers": {"one": {"command": "a"}}}))
+    catalog_path = str(tmp_path / "catalog.json")
+    first, _ = _make_connector({"one": 0.01}, 8, tool_catalog=ToolCatalogCache(catalog_path))
+    second, tracker = _make_connector({"one": 0.01}, 8, tool_catalog=ToolCatalogCache(catalog_path))
+
+    async def run_first():
+        await first.connect_to_servers(config_path=str(config_path))
+        await first.exit_stack.aclose()
+
+    async def run_second():
+        tracker["list_gate"] = asyncio.Event()
+        await second.connect_to_servers(config_path=str(config_path))
+        while tracker["listed"] == 0:
+            await asyncio.sleep(0.01)
+        pending = second._pending_connections["one"]
+        connected = await second.disconnect_server("one")
+        tracker["list_gate"].set()
+        await asyncio.sleep(0.01)
+        state = (connected, pending.cancelled(), second.is_connecting("one"), "one" in second.sessions,
+                 [tool.name for tool in second.available_tools])
+        await second.exit_stack.aclose()
+        return state
+
+    asyncio.run(run_first())
+    assert asyncio.run(run_second()) == (True, True, False, False, [])
+
+
+def test_lazy_server_starts_on_first_call_and_stops_when_idle(tmp_path):
+    """A lazy server offers cached tools without starting and is stopped again when idle."""
+    config_path = tmp_path / "servers.json"
+    config_path.write_text(json.dumps({"mcpServers": {"one": {"command": "a", "idleTimeout": 0.05}}}))
+    catalog_path = str(tmp_path / "catalog.json")
+    eager, _ = _make_connector({"one": 0.01}, 8, tool_catalog=ToolCatalogCache(catalog_path))
+    lazy, tracker = _make_connector({"one": 0.01}, 8, tool_catalog=ToolCatalogCache(catalog_path), lazy_servers=True)
+
+    async def run_eager():
+        await eager.connect_to_servers(config_path=str(config_path))
+        await eager.exit_stack.aclose()
+
+    async def run_lazy():
+        await lazy.connect_to_servers(config_path=str(config_path))
+        idle_at_start = (lazy.is_idle("one"), tracker["opened"])
+        result = await lazy.call_tool("one", "echo", {})
+        busy = await lazy.stop_idle_servers()
+        await asyncio.sleep(0.06)
+        stopped = await lazy.stop_idle_servers()
+        idle_again = lazy.is_idle("one")
+        await lazy.exit_stack.aclose()
+        return idle_at_start, result, busy, stopped, idle_again
+
+    asyncio.run(run_eager())
+    idle_at_start, result, busy, stopped, idle_again = asyncio.run(run_lazy())
+
+    assert idle_at_start == (True, 0)
+    assert result == "one:echo" and tracker["opened"] == 1
+    assert busy == [] and stopped == ["one"] and idle_again
+    assert [tool.name for tool in lazy.available_tools] == ["one.echo"]
+
+
+def test_tool_routes_handle_dotted_server_names_and_validate_arguments():
+    """Tools of servers with dots in their name are routed, and bad arguments are reported before any call."""
+    connector, _ = _make_connector({}, max_concurrency=1)
+    tool = Tool(name="get.page", description="Get a page", inputSchema={
+        "type": "object", "properties": {"url": {"type": "string"}, "depth": {"type": "integer"}}, "required": ["url"]
+    })
+    connector._register_server({"name": "api.example.com", "type": "config"}, FakeSession("api", 0, {}), [tool])
+
+    route = connector.get_tool_route("api.example.com.get.page")
+    assert (route["server_name"], route["tool_name"], route["tool"]) == ("api.example.com", "get.page", tool)
+    assert connector.get_tool_route("api.get.page") is None
+
+    assert connector.validate_tool_arguments("api.example.com.get.page", {"url": "https://example.com"}) is None
+    assert connector.validate_tool_arguments("api.example.com.get.page", {}) == "'url' is a required property"
+    assert connector.validate_tool_arguments("api.example.com.get.page", {"url": "x", "depth": "2"}) == (
+        "'2' is not of type 'integer' (at 'depth')"
+    )
+
+    asyncio.run(connector.disconnect_server("api.example.com"))
+    assert connector.tool_routes == {}
+
+
+def test_abandoned_calls_send_cancelled_notifications_with_their_request_ids():
+    """The SDK's session numbers requests as the connector assumes, so timed out calls are cancelled on the server."""
+    from mcp import ClientSession
+
+    connector, _ = _make_connector({}, max_concurrency=1)
+
+    async def run():
+        client_to_server, sent = anyio.create_memory_object_stream(10)
+        received, server_to_client = anyio.create_memory_object_stream(10)
+        async with ClientSession(server_to_client, client_to_server) as session:
+            for _ in range(2):
+                with pytest.raises(asyncio.TimeoutError):
+                    await asyncio.wait_for(connector._call_session_tool("srv", session, "slow", {}), 0.05)
+        messages = []
+        while True:
+            try:
+                messages.append(sent.receive_nowait().message.root)
+            except (anyio.WouldBlock, anyio.EndOfStream):
+                break
+        for stream in (client_to_server, sent, received, server_to_client):
+            await stream.aclose()
+        return messages
+
+    messages = asyncio.run(run())
+
+    assert [message.method for message in messages] == [
+        "tools/call", "notifications/cancelled", "tools/call", "notifications/cancelled"
+    ]
+    assert messages[0].id != messages[2].id
+    assert [messages[1].params["requestId"], messages[3].params["requestId"]] == [messages[0].id, messages[2].id]
+    assert not connector._warned_no_request_id
+
+    # A session without the request counter is reported instead of failing silently
+    assert connector._next_request_id(SimpleNamespace()) is None
+    assert connector._warned_no_request_id
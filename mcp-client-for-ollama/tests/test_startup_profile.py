@@ -0,0 +1,41 @@
+"""Test the startup profiler behind --profile-startup."""
+
+import subprocess
+import sys
+import time
+
+from rich.console import Console
+
+from mcp_client_for_ollama.utils.startup_profile import StartupProfiler
+
+
+def test_phases_are_reported_in_order_with_the_total():
+    """Repeated phases add up, and the table lists each phase before the total startup time."""
+    profiler = StartupProfiler()
+    with profiler.phase("Client init"):
+        time.sleep(0.01)
+    with profiler.phase("Server connect"):
+        pass
+    with profiler.phase("Client init"):
+        time.sleep(0.01)
+
+    assert list(profiler.phases) == ["Client init", "Server connect"]
+    assert profiler.phases["Client init"] >= 0.02
+    assert profiler.elapsed() >= sum(profiler.phases.values())
+
+    console = Console(record=True, width=80)
+    profiler.display(console)
+    output = console.export_text()
+    assert output.index("Client init") < output.index("Server connect") < output.index("Total startup")
+
+
+def test_entry_point_records_the_import_phase():
+    """Importing the entry point times the import of the client as the first phase."""
+    script = (
+        "from mcp_client_for_ollama.utils.startup_profile import startup_profiler\n"
+        "import mcp_client_for_ollama.cli\n"
+        "print(list(startup_profiler.phases), startup_profiler.phases['Import'] > 0)\n"
+    )
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+
+    assert output.strip() == "['Import'] True"
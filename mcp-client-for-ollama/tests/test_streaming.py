@@ -0,0 +1,33 @@
+"""Test plain streaming output."""
+
+import asyncio
+import io
+from types import SimpleNamespace
+
+from rich.console import Console
+
+from mcp_client_for_ollama.utils.streaming import StreamingManager
+
+
+async def _stream(chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def _chunk(content="", thinking=None, done=False):
+    return SimpleNamespace(message=SimpleNamespace(content=content, thinking=thinking, tool_calls=None), done=done)
+
+
+def test_plain_mode_writes_raw_tokens():
+    """Plain mode writes thinking between delimiters and the answer as raw text."""
+    output = io.StringIO()
+    manager = StreamingManager(Console(file=output), plain=True)
+    chunks = [_chunk(thinking="hmm"), _chunk("Hello "), _chunk("**world**"), _chunk(done=True)]
+
+    text, tool_calls, _ = asyncio.run(manager.process_streaming_response(
+        _stream(chunks), thinking_mode=True, show_thinking=True
+    ))
+
+    assert text == "Hello **world**"
+    assert tool_calls == []
+    assert output.getvalue() == "--- thinking ---\nhmm\n--- end thinking ---\nHello **world**\n"
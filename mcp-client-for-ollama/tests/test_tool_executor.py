@@ -0,0 +1,153 @@
+"""Test parallel tool execution."""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from mcp_client_for_ollama.tools.cache import ToolResultCache
+from mcp_client_for_ollama.tools.executor import ToolExecutor
+
+
+class FakeSession:
+    """Session whose tools sleep and record how many calls overlap."""
+
+    def __init__(self, tracker):
+        self.tracker = tracker
+        self.active = 0
+
+    async def call_tool(self, tool_name, tool_args):
+        self.active += 1
+        self.tracker["peak"] = max(self.tracker["peak"], self.active)
+        try:
+            await asyncio.sleep(tool_args.get("delay", 0))
+            if tool_name == "fail":
+                raise RuntimeError("tool failed")
+            return f"{tool_name}:{tool_args.get('value')}"
+        finally:
+            self.active -= 1
+
+
+class FakeConnector:
+    """Connector exposing sessions and per-server settings."""
+
+    def __init__(self, server_names, settings=None):
+        self.tracker = {"peak": 0}
+        self.sessions = {name: {"session": FakeSession(self.tracker)} for name in server_names}
+        self.settings = settings or {}
+
+    def get_server_setting(self, server_name, key, default=None):
+        return self.settings.get(server_name, {}).get(key, default)
+
+    async def call_tool(self, server_name, tool_name, tool_args):
+        return await self.sessions[server_name]["session"].call_tool(tool_name, tool_args)
+
+    def is_read_only(self, server_name, tool_name):
+        return False
+
+
+def test_calls_to_different_servers_run_in_parallel():
+    """Independent servers overlap and results keep the call order."""
+    executor = ToolExecutor(FakeConnector(["a", "b", "c"]))
+    calls = [(name, "echo", {"delay": 0.1, "value": name}) for name in ["c", "a", "b"]]
+
+    start = time.perf_counter()
+    results = asyncio.run(executor.execute(calls))
+    elapsed = time.perf_counter() - start
+
+    assert results == ["echo:c", "echo:a", "echo:b"]
+    assert elapsed < 0.25
+
+
+def test_per_server_limit():
+    """Calls to the same server respect the configured limit."""
+    connector = FakeConnector(["a"], settings={"a": {"maxConcurrentCalls": 2}})
+    executor = ToolExecutor(connector)
+    calls = [("a", "echo", {"delay": 0.02, "value": i}) for i in range(5)]
+
+    results = asyncio.run(executor.execute(calls))
+
+    assert results == [f"echo:{i}" for i in range(5)]
+    assert connector.tracker["peak"] == 2
+
+
+def test_error_raised_after_all_calls_finish():
+    """A failing call does not abandon the other calls."""
+    connector = FakeConnector(["a", "b"])
+    executor = ToolExecutor(connector)
+    calls = [("a", "fail", {}), ("b", "echo", {"delay": 0.05, "value": 1})]
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(executor.execute(calls))
+
+    assert all(entry["session"].active == 0 for entry in connector.sessions.values())
+
+
+def test_result_cache_per_tool_ttl():
+    """Configured tools are answered from the cache regardless of argument order."""
+    connector = FakeConnector(["a"], settings={"a": {"cacheTtl": {"echo": 60, "fail": 0}}})
+    executor = ToolExecutor(connector)
+
+    async def run():
+        first = await executor.call_tool("a", "echo", {"value": 1, "delay": 0})
+        second = await executor.call_tool("a", "echo", {"delay": 0, "value": 1})
+        await executor.call_tool("a", "other", {"value": 1})
+        await executor.call_tool("a", "other", {"value": 1})
+        executor.reset(["a"])
+        await executor.call_tool("a", "echo", {"value": 1, "delay": 0})
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first == second == "echo:1"
+    stats = executor.result_cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 1)
+
+
+def test_result_cache_lru_bound_and_expiry():
+    """The least recently used entry is evicted and expired entries miss."""
+    cache = ToolResultCache(max_entries=2)
+    keys = [cache.make_key("s.t", {"n": n}) for n in range(4)]
+    cache.put(keys[0], "r0", ttl=60)
+    cache.put(keys[1], "r1", ttl=60)
+    assert cache.get(keys[0]) == "r0"
+    cache.put(keys[2], "r2", ttl=60)
+
+    assert cache.get(keys[1]) is None
+    assert (cache.get(keys[0]), cache.get(keys[2])) == ("r0", "r2")
+    assert cache.evictions == 1
+
+    cache.put(keys[3], "r3", ttl=1e-9)
+    assert cache.get(keys[3]) is None
+
+
+def test_timeouts_deadline_and_cancellation_return_error_results():
+    """Slow calls become error results for the model; other calls keep their results."""
+    settings = {"a": {"toolTimeout": 0.05, "toolTimeouts": {"quick": 0.01, "slow": 0}}}
+    connector = FakeConnector(["a", "b"], settings=settings)
+    executor = ToolExecutor(connector)
+    # Calls only time out when a timeout is configured
+    assert (executor.get_call_timeout("b", "echo"), executor.get_call_timeout("a", "slow")) == (None, None)
+
+    async def run():
+        timed_out = await executor.execute([("a", "echo", {"delay": 1}), ("b", "echo", {"value": 1})])
+        quick = await executor.call_tool("a", "quick", {"delay": 0.03})
+        late = await executor.call_tool("b", "echo", {"delay": 1}, deadline=time.monotonic() + 0.05)
+        expired = await executor.call_tool("b", "echo", {}, deadline=time.monotonic())
+
+        running = asyncio.ensure_future(executor.execute([("b", "echo", {"delay": 1}), ("a", "echo", {"value": 2})]))
+        await asyncio.sleep(0.02)
+        assert executor.cancel_calls() == 1
+        return timed_out, quick, late, expired, await running
+
+    timed_out, quick, late, expired, cancelled = asyncio.run(run())
+
+    assert timed_out[1] == "echo:1" and cancelled[1] == "echo:2"
+    errors = [json.loads(result.content[0].text) for result in (timed_out[0], quick, late, expired, cancelled[0])]
+    assert [error["error"] for error in errors] == [
+        "timeout", "timeout", "deadline_exceeded", "deadline_exceeded", "cancelled"
+    ]
+    assert (errors[0]["tool"], errors[0]["timeoutSeconds"], errors[1]["timeoutSeconds"]) == ("a.echo", 0.05, 0.01)
+    assert all(result.isError for result in (timed_out[0], quick, late, expired, cancelled[0]))
+    assert all(entry["session"].active == 0 for entry in connector.sessions.values())
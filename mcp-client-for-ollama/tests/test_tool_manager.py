@@ -0,0 +1,63 @@
+"""Test the memoized tool state of the ToolManager."""
+
+import json
+
+from mcp import Tool
+
+from mcp_client_for_ollama.tools.manager import ToolManager
+
+
+class FakeConnector:
+    """Connector sharing the tool state and counting its changes."""
+
+    def __init__(self, tools):
+        self.available_tools = tools
+        self.enabled_tools = {tool.name: True for tool in tools}
+        self.tools_version = 0
+
+    def set_tool_status(self, tool_name, enabled):
+        self.enabled_tools[tool_name] = enabled
+        self.tools_version += 1
+
+
+def _tool(name, properties):
+    return Tool(name=name, description=f"{name} tool",
+                inputSchema={"type": "object", "properties": {key: {"type": "string"} for key in properties}})
+
+
+def _manager():
+    connector = FakeConnector([_tool("b.second", ["z", "a"]), _tool("a.first", ["x"])])
+    manager = ToolManager(server_connector=connector)
+    manager.set_available_tools(connector.available_tools)
+    manager.set_enabled_tools(connector.enabled_tools)
+    return manager, connector
+
+
+def test_payload_is_memoized_until_tools_change():
+    """The payload is reused until a status change; its JSON matches serializing the whole list."""
+    manager, connector = _manager()
+
+    definitions, tools_json = manager.get_tool_payload(canonical=True)
+    assert [definition.function.name for definition in definitions] == ["a.first", "b.second"]
+    assert tools_json == json.dumps([definition.model_dump(exclude_none=True) for definition in definitions])
+    assert list(json.loads(tools_json)[1]["function"]["parameters"]["properties"]) == ["a", "z"]
+    assert manager.get_tool_payload(canonical=True)[0] is definitions
+
+    manager.set_tool_status("a.first", False)
+    assert [definition.function.name for definition in manager.get_tool_payload(canonical=True)[0]] == ["b.second"]
+    assert manager.get_tool("a.first").name == "a.first"
+
+
+def test_connector_changes_invalidate_the_payload():
+    """Tools changed in place by the server connector are picked up once it bumps its version."""
+    manager, connector = _manager()
+    assert len(manager.get_enabled_tool_objects()) == 2
+
+    connector.available_tools.append(_tool("c.third", []))
+    connector.enabled_tools["c.third"] = True
+    assert len(manager.get_enabled_tool_objects()) == 2
+
+    connector.tools_version += 1
+    assert [tool.name for tool in manager.get_enabled_tool_objects()] == ["b.second", "a.first", "c.third"]
+    assert manager.get_tool("c.third") is connector.available_tools[-1]
+    assert "c.third" in manager.get_tool_payload()[1]
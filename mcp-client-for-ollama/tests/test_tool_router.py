@@ -0,0 +1,49 @@
+"""Test relevance-based tool selection."""
+
+from mcp import Tool
+
+from mcp_client_for_ollama.tools.router import ToolRouter, tokenize
+
+
+def _tool(name, description, *parameters):
+    return Tool(name=name, description=description,
+                inputSchema={"type": "object", "properties": {parameter: {"type": "string"} for parameter in parameters}})
+
+
+TOOLS = [
+    _tool("fs.readFile", "Read the contents of a file", "path"),
+    _tool("fs.write_file", "Write text to a file", "path", "content"),
+    _tool("weather.get_forecast", "Get the weather forecast for a city", "city"),
+    _tool("git.commit", "Record changes to the repository", "message"),
+    _tool("clock.now", "Current date and time"),
+]
+
+
+def test_tokenize_splits_identifiers():
+    """Snake case, camelCase and dotted names split into the same lowercase terms."""
+    assert tokenize("fs.readFile") == ["fs", "read", "file"]
+    assert tokenize("read_file for the HTTPServer") == ["read", "file", "http", "server"]
+
+
+def test_select_ranks_tools_and_keeps_always_included():
+    """Only the best matches within top_k are offered, plus always-included tools, in their original order."""
+    router = ToolRouter(top_k=1, always_include=["clock.*"])
+
+    assert [tool.name for tool in router.select("What's the weather forecast in Paris?", TOOLS)] == [
+        "weather.get_forecast", "clock.now"
+    ]
+    assert [tool.name for tool in router.select("hello there", TOOLS)] == ["clock.now"]
+
+    router.top_k = 2
+    assert [tool.name for tool in router.select("please read the file notes.txt", TOOLS)] == [
+        "fs.readFile", "fs.write_file", "clock.now"
+    ]
+
+
+def test_index_is_rebuilt_when_tools_change():
+    """A new tool is found once the tool set changes."""
+    router = ToolRouter(top_k=3)
+    assert router.select("search the web", TOOLS) == []
+
+    tools = TOOLS + [_tool("web.search", "Search the web")]
+    assert [tool.name for tool in router.select("search the web", tools)] == ["web.search"]
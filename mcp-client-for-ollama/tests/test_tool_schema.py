@@ -0,0 +1,47 @@
+"""Test compaction of tool input schemas."""
+
+from mcp_client_for_ollama.tools.schema import compact_schema, estimate_tokens, truncate_description
+
+
+def test_compact_schema_inlines_refs_and_drops_annotations():
+    """Local refs are inlined, titles and examples dropped, and property names kept even if they look like keywords."""
+    schema = {
+        "$schema": "https://json-schema.org/draft/2020-12/schema",
+        "title": "CreateArgs",
+        "type": "object",
+        "$defs": {
+            "Item": {"title": "Item", "type": "object", "properties": {"title": {"type": "string", "title": "Title"}},
+                     "examples": [{"title": "x"}]},
+            "Node": {"type": "object", "properties": {"child": {"$ref": "#/$defs/Node"}}},
+        },
+        "properties": {
+            "items": {"type": "array", "items": {"$ref": "#/$defs/Item"}, "description": "Items to create"},
+            "tree": {"$ref": "#/$defs/Node", "description": "Root node"},
+            "remote": {"$ref": "https://example.com/schema.json"},
+        },
+        "required": ["items"],
+    }
+
+    assert compact_schema(schema) == {
+        "type": "object",
+        "properties": {
+            "items": {"type": "array", "items": {"type": "object", "properties": {"title": {"type": "string"}}},
+                      "description": "Items to create"},
+            "tree": {"type": "object", "properties": {"child": {"type": "object"}}, "description": "Root node"},
+            "remote": {"$ref": "https://example.com/schema.json"},
+        },
+        "required": ["items"],
+    }
+    assert "$defs" in schema
+    assert estimate_tokens(compact_schema(schema)) < estimate_tokens(schema)
+
+
+def test_descriptions_are_truncated_to_the_token_budget():
+    """Long descriptions are cut at a word boundary; a budget of 0 keeps them whole."""
+    text = "Search the documents of the knowledge base and return the best matching passages with their scores."
+
+    assert truncate_description(text, 8) == "Search the documents of the…"
+    assert truncate_description(text, 0) == text
+    assert truncate_description("Short.", 8) == "Short."
+    schema = {"type": "object", "properties": {"query": {"type": "string", "description": text}}}
+    assert compact_schema(schema, 8)["properties"]["query"]["description"] == "Search the documents of the…"
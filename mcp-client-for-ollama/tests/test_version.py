@@ -1,6 +1,11 @@
 """Test version consistency in the package."""
 
+import asyncio
+import json
+import time
+
 import mcp_client_for_ollama
+from mcp_client_for_ollama.utils.version import check_for_updates, is_update_check_due, refresh_update_cache
 
 
 def test_version_exists():
@@ -8,3 +13,55 @@ def test_version_exists():
     assert hasattr(mcp_client_for_ollama, "__version__")
     assert isinstance(mcp_client_for_ollama.__version__, str)
     assert mcp_client_for_ollama.__version__ != ""
+
+
+def _write_cache(path, latest_version, age=0):
+    path.write_text(json.dumps({"checked_at": time.time() - age, "latest_version": latest_version}))
+
+
+def test_update_is_reported_from_cache(tmp_path):
+    """The check only reads the cache, so it never waits on the network."""
+    cache = tmp_path / "update_check.json"
+    _write_cache(cache, "999.0.0")
+
+    assert check_for_updates(str(cache)) == (True, mcp_client_for_ollama.__version__, "999.0.0")
+    assert not is_update_check_due(str(cache), ttl=60)
+
+
+def test_missing_or_stale_cache_is_due(tmp_path):
+    """A missing, corrupt, failed or expired check reports no update and is refreshed."""
+    cache = tmp_path / "update_check.json"
+    assert is_update_check_due(str(cache))
+    assert check_for_updates(str(cache)) == (False, mcp_client_for_ollama.__version__, mcp_client_for_ollama.__version__)
+
+    cache.write_text("{not json")
+    assert is_update_check_due(str(cache))
+
+    _write_cache(cache, None)
+    assert check_for_updates(str(cache)) == (False, mcp_client_for_ollama.__version__, mcp_client_for_ollama.__version__)
+
+    _write_cache(cache, "999.0.0", age=120)
+    assert is_update_check_due(str(cache), ttl=60)
+
+
+def test_interrupted_check_still_records_the_attempt(tmp_path, monkeypatch):
+    """A check cancelled before PyPI answers is not retried until the TTL expires, and keeps the known version."""
+    import httpx
+
+    async def hanging_get(self, url):
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(httpx.AsyncClient, "get", hanging_get)
+    cache = tmp_path / "update_check.json"
+    _write_cache(cache, "999.0.0", age=120)
+
+    async def run():
+        task = asyncio.create_task(refresh_update_cache(str(cache)))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(run())
+
+    assert not is_update_check_due(str(cache), ttl=60)
+    assert check_for_updates(str(cache))[2] == "999.0.0"